@@ -0,0 +1,4 @@
+# python -m backend.benchmarks runs the mixed-workload load test (see load.py)
+from backend.benchmarks.load import main
+
+main()
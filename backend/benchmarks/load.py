@@ -0,0 +1,249 @@
+# Load test: seed a synthetic restaurant and drive the real app in-process with a concurrent
+# mix of requests, reporting latency percentiles and throughput per endpoint as JSON.
+#
+#   python -m backend.benchmarks.load --requests 5000 --concurrency 32 --output run.json
+#   python -m backend.benchmarks.load --mix menu=50,create_order=50 --orders 100000
+#
+# The workload is generated from the same seed as the data, so two runs with the same
+# arguments send the same requests in the same order. Latencies only cover successful
+# requests; the run exits with status 1 when any endpoint returned errors.
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from backend.benchmarks.seed import RestaurantSize, add_size_arguments, size_from_args, BASE_DATE
+
+# Relative weight of each operation in the default mix
+DEFAULT_MIX = {
+    "menu": 30,
+    "list_dishes": 5,
+    "order_with_relations": 15,
+    "dish_with_relations": 10,
+    "reservation_with_relations": 5,
+    "availability": 5,
+    "kitchen_queue": 5,
+    "create_order": 10,
+    "update_order_status": 15,
+}
+
+NEXT_STATUS = {"placed": "new", "new": "ready", "ready": "to_be_paid", "to_be_paid": "paid", "paid": "completed"}
+
+
+# Generates the requests of the workload; each operation returns (endpoint, method, url, json body)
+class Workload:
+    def __init__(self, size: RestaurantSize, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.created = 0
+        self.statuses = {}
+
+    def menu(self):
+        return "GET /menu/", "GET", "/menu/", None
+
+    def list_dishes(self):
+        after = self.rng.randint(0, max(self.size.dishes - 50, 0))
+        return "GET /dish/", "GET", f"/dish/?limit=50&after={after}", None
+
+    def order_with_relations(self):
+        order_id = self.rng.randint(1, self.size.orders)
+        return "GET /order/{order_id}/with-relations", "GET", f"/order/{order_id}/with-relations", None
+
+    def dish_with_relations(self):
+        dish_id = self.rng.randint(1, self.size.dishes)
+        return "GET /dish/{dish_id}/with-relations", "GET", f"/dish/{dish_id}/with-relations", None
+
+    def reservation_with_relations(self):
+        reservation_id = self.rng.randint(1, max(min(self.size.reservations, self.size.tables), 1))
+        return (
+            "GET /reservation/{reservation_id}/with-relations", "GET",
+            f"/reservation/{reservation_id}/with-relations", None,
+        )
+
+    def availability(self):
+        day = BASE_DATE.toordinal() + self.rng.randint(0, 30)
+        url = (
+            f"/reservation/availability?reservation_date={BASE_DATE.fromordinal(day).isoformat()}"
+            f"&start={self.rng.randint(12, 21)}:00&number_of_people={self.rng.randint(1, 8)}"
+        )
+        return "GET /reservation/availability", "GET", url, None
+
+    def kitchen_queue(self):
+        return "GET /order/kitchen", "GET", "/order/kitchen", None
+
+    def create_order(self):
+        self.created += 1
+        client_id = self.rng.randint(1, self.size.clients)
+        body = {
+            "status": "placed",
+            "number": f"L{self.size.seed}-{self.created:08d}",
+            "hour": f"{self.rng.randint(11, 22)}:00",
+            "payment": self.rng.choice(("cash", "card", "online")),
+            "takeaway_or_onsite": self.rng.choice(("takeaway", "onsite")),
+            "client_id": client_id,
+            "address_history_id": client_id,
+            "dish_ids": self.rng.sample(range(1, self.size.dishes + 1), min(2, self.size.dishes)),
+            "restaurant_employee_ids": self.rng.sample(range(1, self.size.employees + 1), 2),
+        }
+        return "POST /order/", "POST", "/order/", body
+
+    def update_order_status(self):
+        order_id = self.rng.randint(1, self.size.orders)
+        status = NEXT_STATUS.get(self.statuses.get(order_id, "placed"), "new")
+        self.statuses[order_id] = status
+        return "PUT /order/{order_id}", "PUT", f"/order/{order_id}", {"status": status}
+
+    def generate(self, mix: dict, count: int) -> list:
+        operations = [getattr(self, name) for name in mix]
+        weights = list(mix.values())
+        return [self.rng.choices(operations, weights)[0]() for _ in range(count)]
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}', expected one of: {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a mixed workload against the app and report per-endpoint latency")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests to send")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=100, help="Requests sent before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Operation weights, e.g. menu=30,create_order=10")
+    parser.add_argument("--async-routes", action="store_true", help="Serve CRUD routes from the async database path")
+    parser.add_argument("--database", default=None, help="Scratch SQLite file (default: a temp file)")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    add_size_arguments(parser)
+    return parser.parse_args()
+
+
+async def run_workload(app, requests: list, concurrency: int) -> tuple:
+    import httpx
+
+    results = []  # (endpoint, seconds, status code or None when the request raised)
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        async def call(endpoint, method, url, body):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    status_code = (await client.request(method, url, json=body)).status_code
+                except Exception:
+                    status_code = None
+                results.append((endpoint, time.perf_counter() - started, status_code))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call(*request) for request in requests))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def failed(status_code) -> bool:
+    return status_code is None or status_code >= 400
+
+
+# Latency of the successful requests plus the error rate and failing statuses, per endpoint.
+# Endpoints with errors are listed under "failing_endpoints".
+def build_report(results, elapsed) -> dict:
+    from backend.benchmarks.report import latency_summary
+
+    by_endpoint = {}
+    for endpoint, seconds, status_code in results:
+        by_endpoint.setdefault(endpoint, []).append((seconds, status_code))
+
+    def summary(calls) -> dict:
+        errors = {}
+        for _, status_code in calls:
+            if failed(status_code):
+                key = str(status_code or "exception")
+                errors[key] = errors.get(key, 0) + 1
+        latencies = [seconds for seconds, status_code in calls if not failed(status_code)]
+        result = latency_summary(latencies, elapsed, errors=sum(errors.values()))
+        result["requests"] = len(calls)
+        if not latencies:
+            # No successful request to time
+            result.update(p50_ms=None, p95_ms=None, p99_ms=None, max_ms=None)
+        result["error_rate"] = round(result["errors"] / len(calls), 4) if calls else 0.0
+        if errors:
+            result["error_statuses"] = errors
+        return result
+
+    endpoints = {}
+    for endpoint, calls in sorted(by_endpoint.items()):
+        endpoints[endpoint] = summary(calls)
+        # Endpoints share the run, so their throughput is their share of it
+        endpoints[endpoint]["requests_per_second"] = round(len(calls) / elapsed, 1)
+    return {
+        "total": summary([(seconds, status_code) for _, seconds, status_code in results]),
+        "endpoints": endpoints,
+        "failing_endpoints": [endpoint for endpoint, result in endpoints.items() if result["errors"]],
+    }
+
+
+def main():
+    args = parse_args()
+    size = size_from_args(args)
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="restaurant-load-"), "load.db")
+    # Settings are read at import time, so point the app at the scratch database first
+    os.environ["RESTAURANT_DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("RESTAURANT_PROFILE", "bench")
+
+    from backend.core.config import settings
+    from backend.core.database import engine, init_async_engine
+    from backend.benchmarks.seed import seed_restaurant
+    from backend.main import create_app
+
+    seed_started = time.perf_counter()
+    rows = seed_restaurant(engine, size)
+    seed_seconds = time.perf_counter() - seed_started
+    if args.async_routes:
+        init_async_engine()
+
+    workload = Workload(size, random.Random(size.seed))
+    warmup = workload.generate(args.mix, args.warmup)
+    requests = workload.generate(args.mix, args.requests)
+    app = create_app(async_routes=args.async_routes)
+
+    async def run():
+        await run_workload(app, warmup, args.concurrency)
+        return await run_workload(app, requests, args.concurrency)
+
+    results, elapsed = asyncio.run(run())
+    report = {
+        "config": {
+            "database": database,
+            "profile": settings.profile.name,
+            "async_routes": args.async_routes,
+            "fast_responses": settings.fast_responses,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "mix": args.mix,
+            "size": vars(size),
+        },
+        "seed": {"seconds": round(seed_seconds, 3), "rows": rows},
+        **build_report(results, elapsed),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    print(output)
+    if report["failing_endpoints"]:
+        print(f"Endpoints with errors: {', '.join(report['failing_endpoints'])}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# Seed a scratch SQLite database with a synthetic restaurant for benchmarks and load tests.
+#
+#   python -m backend.benchmarks.seed --database /tmp/bench.db --orders 50000
+#
+# Rows are generated from a fixed random seed and inserted with executemany, and they follow
+# the model constraints:
+#   - every person has a single role (client or employee)
+#   - every client has an address
+#   - dishes have at least two ingredients
+#   - orders have at least one dish and two employees
+#   - reservations hold at least one table
+# A table belongs to one reservation at a time, so at most one reservation per table is
+# created.
+import argparse
+import json
+import os
+import random
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta
+
+
+# Size of the synthetic restaurant
+@dataclass
+class RestaurantSize:
+    people: int = 2000
+    clients: int = 1500
+    employees: int = 40
+    ingredients: int = 200
+    dishes: int = 120
+    tables: int = 60
+    orders: int = 20000
+    reservations: int = 60
+    seed: int = 42
+
+
+ORDER_STATUSES = ("placed", "new", "ready", "paid", "to_be_paid", "during_delivery", "completed")
+PAYMENT_TYPES = ("cash", "card", "online")
+ORDER_TYPES = ("takeaway", "onsite")
+ROLES = ("waiter", "cook", "manager", "driver")
+METRICS = ("grams", "milliliters")
+
+# Dates are generated relative to a fixed day so two runs with the same seed are identical
+BASE_DATE = date(2026, 1, 5)
+
+
+def add_size_arguments(parser):
+    defaults = RestaurantSize()
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name}", type=int, default=value, help=f"(default: {value})")
+
+
+def size_from_args(args) -> RestaurantSize:
+    return RestaurantSize(**{name: getattr(args, name) for name in asdict(RestaurantSize())})
+
+
+# Create the schema and insert the synthetic restaurant; returns the number of rows per table
+def seed_restaurant(engine, size: RestaurantSize) -> dict:
+    from sqlalchemy import insert
+    from backend.core.database import initialize_database
+    from backend.models.address_history import AddressHistory
+    from backend.models.client import Client
+    from backend.models.dish import Dish, dish_ingredient
+    from backend.models.ingredient import Ingredient
+    from backend.models.order import Order, order_dish
+    from backend.models.person import Person
+    from backend.models.reservation import Reservation, reservation_table
+    from backend.models.restaurant_employee import RestaurantEmployee, restaurant_employee_order
+    from backend.models.table import Table
+
+    if size.clients + size.employees > size.people:
+        raise ValueError("people must be at least clients + employees")
+    if size.employees < 2 or size.ingredients < 2 or size.dishes < 1:
+        raise ValueError("orders need two employees and dishes need two ingredients")
+
+    rng = random.Random(size.seed)
+    counts = {}
+    initialize_database(engine)
+
+    with engine.begin() as connection:
+        def insert_rows(target, rows):
+            if rows:
+                connection.execute(insert(target), rows)
+            counts[getattr(target, "__tablename__", getattr(target, "name", None))] = len(rows)
+
+        insert_rows(Person, [
+            {
+                "name": f"Name{i}",
+                "surname": f"Surname{i}",
+                "email": f"person{i}@example.com",
+                "phone_number": f"600{i:06d}",
+            }
+            for i in range(1, size.people + 1)
+        ])
+        # People 1..clients are clients, the next `employees` people are employees
+        insert_rows(Client, [
+            {"person_id": i, "registration_date": datetime.combine(BASE_DATE, time(12)) - timedelta(days=rng.randint(0, 900))}
+            for i in range(1, size.clients + 1)
+        ])
+        insert_rows(AddressHistory, [
+            {
+                "street": f"Street {rng.randint(1, 300)}",
+                "city": rng.choice(("Warszawa", "Krakow", "Gdansk", "Poznan")),
+                "post_code": f"{rng.randint(0, 99):02d}-{rng.randint(0, 999):03d}",
+                "building_number": str(rng.randint(1, 120)),
+                "client_id": i,
+            }
+            for i in range(1, size.clients + 1)
+        ])
+        insert_rows(RestaurantEmployee, [
+            {
+                "employee_identificator": f"EMP{i:05d}",
+                "role": ROLES[i % len(ROLES)],
+                "person_id": size.clients + i,
+            }
+            for i in range(1, size.employees + 1)
+        ])
+        insert_rows(Ingredient, [
+            {"name": f"Ingredient {i}", "amount": rng.randint(100, 10000), "metric": rng.choice(METRICS)}
+            for i in range(1, size.ingredients + 1)
+        ])
+        insert_rows(Dish, [
+            {
+                "name": f"Dish {i}",
+                "description": f"Description of dish {i}",
+                "price": round(rng.uniform(12, 90), 2),
+                "discount": rng.choice((None, None, None, 0.1, 0.2)),
+            }
+            for i in range(1, size.dishes + 1)
+        ])
+        insert_rows(dish_ingredient, [
+            {"dish_id": dish_id, "ingredient_id": ingredient_id}
+            for dish_id in range(1, size.dishes + 1)
+            for ingredient_id in rng.sample(range(1, size.ingredients + 1), min(rng.randint(2, 6), size.ingredients))
+        ])
+
+        if size.clients:
+            orders = []
+            for i in range(1, size.orders + 1):
+                # Each client's address has the same id as the client
+                client_id = rng.randint(1, size.clients)
+                orders.append({
+                    "status": rng.choice(ORDER_STATUSES),
+                    "number": f"S{i:08d}",
+                    "hour": f"{rng.randint(11, 22)}:{rng.choice(('00', '15', '30', '45'))}",
+                    "payment": rng.choice(PAYMENT_TYPES),
+                    "takeaway_or_onsite": rng.choice(ORDER_TYPES),
+                    "note": None if rng.random() < 0.8 else f"Note {i}",
+                    "delay": rng.random() < 0.05,
+                    "client_id": client_id,
+                    "address_history_id": client_id,
+                })
+            insert_rows(Order, orders)
+            insert_rows(order_dish, [
+                {"order_id": order_id, "dish_id": dish_id}
+                for order_id in range(1, size.orders + 1)
+                for dish_id in rng.sample(range(1, size.dishes + 1), min(rng.randint(1, 4), size.dishes))
+            ])
+            insert_rows(restaurant_employee_order, [
+                {"order_id": order_id, "employee_id": employee_id}
+                for order_id in range(1, size.orders + 1)
+                for employee_id in rng.sample(range(1, size.employees + 1), 2)
+            ])
+
+        reservations = min(size.reservations, size.tables) if size.clients else 0
+        insert_rows(Reservation, [
+            {
+                "date": BASE_DATE + timedelta(days=rng.randint(0, 30)),
+                "hour": f"{rng.randint(12, 21)}:{rng.choice(('00', '30'))}",
+                "number_of_people": rng.randint(1, 8),
+                "status": "placed" if rng.random() < 0.9 else "canceled",
+                "client_id": rng.randint(1, size.clients),
+            }
+            for _ in range(reservations)
+        ])
+        insert_rows(Table, [
+            {
+                "number": f"T{i:03d}",
+                "number_of_seats": rng.choice((2, 2, 4, 4, 4, 6, 8)),
+                "reservation_id": i if i <= reservations else None,
+            }
+            for i in range(1, size.tables + 1)
+        ])
+        insert_rows(reservation_table, [
+            {"reservation_id": i, "table_id": i} for i in range(1, reservations + 1)
+        ])
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a scratch database with a synthetic restaurant")
+    parser.add_argument("--database", default=None, help="SQLite file to create (default: a temp file)")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="restaurant-bench-"), "bench.db")
+    # Settings are read at import time, so point the app at the scratch database first
+    os.environ["RESTAURANT_DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("RESTAURANT_PROFILE", "bench")
+
+    from backend.core.database import engine
+
+    counts = seed_restaurant(engine, size_from_args(args))
+    print(json.dumps({"database": database, "rows": counts}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
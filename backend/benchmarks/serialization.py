@@ -0,0 +1,113 @@
+# Compare GET /order/ throughput with validated ORM responses and with the fast serialization
+# path (column projection + compiled row serializers + orjson).
+#
+#   python -m backend.benchmarks.serialization --orders 20000 --requests 200 --limit 1000
+#
+# Requests are sent one at a time through httpx's ASGI transport, so the numbers measure the
+# per-request CPU cost of loading and encoding a page.
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare validated and fast collection responses")
+    parser.add_argument("--orders", type=int, default=20000, help="Order rows to seed")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    parser.add_argument("--limit", type=int, default=1000, help="Page size requested")
+    parser.add_argument("--database", default=None, help="Scratch SQLite file (default: a temp file)")
+    return parser.parse_args()
+
+
+def seed_orders(count):
+    from datetime import datetime
+    from sqlalchemy import insert
+    from backend.core.database import engine, initialize_database
+    from backend.models.address_history import AddressHistory
+    from backend.models.client import Client
+    from backend.models.order import Order
+    from backend.models.person import Person
+
+    initialize_database()
+    with engine.begin() as connection:
+        connection.execute(insert(Person), [
+            {"name": "Bench", "surname": "Client", "email": "bench@example.com", "phone_number": "600000000"}
+        ])
+        connection.execute(insert(Client), [{"person_id": 1, "registration_date": datetime.now()}])
+        connection.execute(insert(AddressHistory), [
+            {"street": "Bench", "city": "Bench", "post_code": "00-000", "building_number": "1", "client_id": 1}
+        ])
+        connection.execute(insert(Order), [
+            {
+                "status": ("placed", "new", "ready", "paid", "completed")[i % 5],
+                "number": f"B{i:07d}",
+                "hour": f"{12 + i % 10}:{i % 60:02d}",
+                "payment": ("cash", "card", "online")[i % 3],
+                "takeaway_or_onsite": ("takeaway", "onsite")[i % 2],
+                "note": None if i % 4 else f"Note {i}",
+                "delay": i % 7 == 0,
+                "client_id": 1,
+                "address_history_id": 1,
+            }
+            for i in range(count)
+        ])
+
+
+async def run_mode(fast, args):
+    import httpx
+    from backend.benchmarks.report import latency_summary
+    from backend.core.config import settings
+    from backend.main import create_app
+
+    settings.fast_responses = fast
+    app = create_app(async_routes=False)
+    rng = random.Random(42)
+    urls = [
+        f"/order/?limit={args.limit}&after={rng.randint(0, max(args.orders - args.limit, 0))}"
+        for _ in range(args.requests)
+    ]
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        for url in urls:
+            request_started = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+
+    return {
+        **latency_summary(latencies, elapsed),
+        "bytes_per_response": len(response.content),
+        "rows_per_second": round(len(urls) * args.limit / elapsed),
+    }
+
+
+def main():
+    args = parse_args()
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="restaurant-bench-"), "bench.db")
+    # Settings are read at import time, so point the app at the scratch database first
+    os.environ["RESTAURANT_DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("RESTAURANT_PROFILE", "bench")
+
+    from backend.core.serialization import orjson
+
+    seed_orders(args.orders)
+    results = {
+        "database": database,
+        "limit": args.limit,
+        "orjson": orjson is not None,
+        "validated": asyncio.run(run_mode(False, args)),
+        "fast": asyncio.run(run_mode(True, args)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
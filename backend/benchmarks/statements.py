@@ -0,0 +1,63 @@
+# Count the SQL statements a trivial field update costs for each validated model.
+#
+#   python -m backend.benchmarks.statements
+#
+# Each update loads one row, changes a plain column and commits; everything executed from the
+# change to the end of the commit is counted, so extra statements come from flush-time work
+# such as validation.
+import argparse
+import json
+import os
+import tempfile
+from backend.benchmarks.seed import RestaurantSize, BASE_DATE
+
+# Model, row ID and a plain column change
+UPDATES = [
+    ("Order", 1, "note", "Ring the bell"),
+    ("Person", 1, "surname", "Nowak"),
+    ("Client", 1, "registration_date", None),
+    ("RestaurantEmployee", 1, "employee_identificator", "EMP-CHANGED"),
+    ("Dish", 1, "price", 42.0),
+    ("Reservation", 1, "hour", "19:30"),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Count statements per trivial update")
+    parser.add_argument("--database", default=None, help="Scratch SQLite file (default: a temp file)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="restaurant-bench-"), "bench.db")
+    # Settings are read at import time, so point the app at the scratch database first
+    os.environ["RESTAURANT_DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("RESTAURANT_PROFILE", "bench")
+
+    from datetime import datetime, time
+    import backend.models as models
+    from backend.benchmarks.seed import seed_restaurant
+    from backend.core.database import SessionLocal, engine
+    from backend.core.profiling import count_queries
+
+    seed_restaurant(engine, RestaurantSize(people=200, clients=100, employees=10, ingredients=20,
+                                           dishes=10, tables=10, orders=100, reservations=10))
+    results = {}
+    for name, record_id, attribute, value in UPDATES:
+        if value is None:
+            value = datetime.combine(BASE_DATE, time(9))
+        db = SessionLocal()
+        try:
+            record = db.get(getattr(models, name), record_id)
+            with count_queries(engine) as counter:
+                setattr(record, attribute, value)
+                db.commit()
+            results[f"{name}.{attribute}"] = {"statements": counter.count, "sql": counter.statements}
+        finally:
+            db.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Compare request throughput of the sync (threadpool) and async (aiosqlite) route sets.
+#
+#   python -m backend.benchmarks.sync_vs_async --requests 5000 --concurrency 200
+#
+# Both apps are driven in-process through httpx's ASGI transport against the same scratch
+# database, so the numbers measure the application and driver, not the network.
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare sync and async route throughput")
+    parser.add_argument("--people", type=int, default=5000, help="Person rows to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight at once")
+    parser.add_argument("--database", default=None, help="Scratch SQLite file (default: a temp file)")
+    return parser.parse_args()
+
+
+def seed_people(count):
+    from sqlalchemy import insert
+    from backend.core.database import engine, initialize_database
+    from backend.models.person import Person
+
+    initialize_database()
+    with engine.begin() as connection:
+        connection.execute(insert(Person), [
+            {
+                "name": f"Name{i}",
+                "surname": f"Surname{i}",
+                "email": f"person{i}@example.com",
+                "phone_number": f"600{i:06d}",
+            }
+            for i in range(count)
+        ])
+
+
+async def run_mode(async_routes, args):
+    import httpx
+    from backend.benchmarks.report import latency_summary
+    from backend.main import create_app
+
+    app = create_app(async_routes=async_routes)
+    rng = random.Random(42)
+    urls = [
+        f"/person/{rng.randint(1, args.people)}" if rng.random() < 0.8
+        else f"/person/?limit=50&after={rng.randint(0, args.people)}"
+        for _ in range(args.requests)
+    ]
+    latencies = []
+    errors = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call(url):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                except Exception as exc:
+                    # Sync routes can exhaust the threadpool and time out on the connection pool
+                    errors.append(type(exc).__name__)
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call(url) for url in urls))
+        elapsed = time.perf_counter() - started
+
+    return latency_summary(latencies, elapsed, errors=len(errors))
+
+
+def main():
+    args = parse_args()
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="restaurant-bench-"), "bench.db")
+    # Settings are read at import time, so point the app at the scratch database first
+    os.environ["RESTAURANT_DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("RESTAURANT_PROFILE", "bench")
+
+    from backend.core.database import init_async_engine
+
+    seed_people(args.people)
+    init_async_engine()
+    results = {
+        "database": database,
+        "concurrency": args.concurrency,
+        "sync": asyncio.run(run_mode(False, args)),
+        "async": asyncio.run(run_mode(True, args)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
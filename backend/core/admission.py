@@ -0,0 +1,191 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+from backend.core.config import settings
+from backend.core.database import current_location
+from backend.core.tenancy import error_response
+
+# Methods that write; reads are never queued, so they keep running while writes back up
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Admission priorities, lowest first: order status changes move orders already in the kitchen,
+# so they go ahead of other writes, and new orders wait the longest
+STATUS_UPDATE, WRITE, NEW_ORDER = 0, 1, 2
+PRIORITY_NAMES = {STATUS_UPDATE: "status_update", WRITE: "write", NEW_ORDER: "new_order"}
+
+
+def write_priority(method: str, path: str) -> int:
+    if path.startswith("/order/"):
+        if method == "POST" and path == "/order/":
+            return NEW_ORDER
+        if method in ("PUT", "PATCH"):
+            return STATUS_UPDATE
+    return WRITE
+
+
+# Bounded concurrency for the writes to one database. Up to `limit` writes run at once; the
+# rest wait in a priority queue of at most `queue_size` entries for at most `timeout` seconds.
+# A write that finds the queue full, or that runs out of time in it, is shed with a 503 rather
+# than left to pile up behind SQLite's single writer until the client gives up.
+#
+# Only used from the event loop thread, so the counters need no lock.
+class AdmissionController:
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.queued = {priority: 0 for priority in PRIORITY_NAMES}
+        self.admitted = {priority: 0 for priority in PRIORITY_NAMES}
+        self.rejected = {(priority, reason): 0 for priority in PRIORITY_NAMES for reason in ("queue_full", "timeout")}
+        self.wait_seconds = 0.0
+        self._waiters = []  # heap of (priority, arrival, future); futures of timed out waiters are cancelled
+        self._arrivals = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(self.queued.values())
+
+    # Wait for a write slot. Returns False when the write is to be shed.
+    async def acquire(self, priority: int) -> bool:
+        if self.active < self.limit and not self.queue_depth:
+            self.active += 1
+            self.admitted[priority] += 1
+            return True
+        if self.queue_depth >= self.queue_size:
+            self.rejected[(priority, "queue_full")] += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        self.queued[priority] += 1
+        started = loop.time()
+        try:
+            await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the deadline passed
+            if not future.done() or future.cancelled():
+                self.queued[priority] -= 1
+                self.rejected[(priority, "timeout")] += 1
+                return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self.queued[priority] -= 1
+            raise
+        finally:
+            self.wait_seconds += loop.time() - started
+        self.admitted[priority] += 1
+        return True
+
+    # Hand the slot to the first live waiter, or free it
+    def release(self):
+        while self._waiters:
+            priority, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.queued[priority] -= 1
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.timeout))
+
+
+# Admission controllers of the process, one per database (the main one and each location's)
+class AdmissionControl:
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._controllers = {}
+        self._lock = threading.Lock()
+
+    def current(self) -> AdmissionController:
+        location = current_location.get() or ""
+        controller = self._controllers.get(location)
+        if controller is None:
+            with self._lock:
+                controller = self._controllers.setdefault(
+                    location, AdmissionController(self.limit, self.queue_size, self.timeout)
+                )
+        return controller
+
+    # Queue depth and rejections in the Prometheus text exposition format, appended to /metrics
+    def render(self) -> str:
+        with self._lock:
+            controllers = sorted(self._controllers.items())
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        def by_priority(select):
+            return [
+                (f'location="{location}",priority="{name}"', select(controller, priority))
+                for location, controller in controllers
+                for priority, name in PRIORITY_NAMES.items()
+            ]
+
+        metric(
+            "admission_writes_in_flight", "gauge", "Writes currently running",
+            [(f'location="{location}"', controller.active) for location, controller in controllers],
+        )
+        metric(
+            "admission_queue_depth", "gauge", "Writes waiting for a slot",
+            by_priority(lambda controller, priority: controller.queued[priority]),
+        )
+        metric(
+            "admission_admitted_total", "counter", "Writes admitted",
+            by_priority(lambda controller, priority: controller.admitted[priority]),
+        )
+        metric(
+            "admission_rejected_total", "counter", "Writes shed with a 503, because the queue was full or the wait timed out",
+            [
+                (f'location="{location}",priority="{PRIORITY_NAMES[priority]}",reason="{reason}"', count)
+                for location, controller in controllers
+                for (priority, reason), count in sorted(controller.rejected.items())
+            ],
+        )
+        metric(
+            "admission_queue_wait_seconds_total", "counter", "Time writes spent waiting in the queue",
+            [(f'location="{location}"', controller.wait_seconds) for location, controller in controllers],
+        )
+        return "\n".join(lines) + "\n"
+
+
+admission = AdmissionControl(settings.write_concurrency, settings.write_queue_size, settings.write_queue_timeout)
+
+
+# Pure ASGI middleware admitting the writes of each database through its controller. Must run
+# inside LocationMiddleware, so every location's writer gets its own limit.
+class AdmissionMiddleware:
+    def __init__(self, app, control: AdmissionControl = admission):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        controller = self.control.current()
+        if not await controller.acquire(write_priority(scope["method"], path)):
+            response = error_response(503, "The restaurant is busy, retry shortly")
+            response.headers["Retry-After"] = str(controller.retry_after())
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
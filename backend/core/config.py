@@ -0,0 +1,164 @@
+import os
+from typing import Union
+from pydantic import BaseModel, Field
+
+# Environment variables read by the settings
+PROFILE_ENV_VAR = "RESTAURANT_PROFILE"
+DATABASE_URL_ENV_VAR = "RESTAURANT_DATABASE_URL"
+ASYNC_ROUTES_ENV_VAR = "RESTAURANT_ASYNC_ROUTES"
+FAST_RESPONSES_ENV_VAR = "RESTAURANT_FAST_RESPONSES"
+METRICS_ENV_VAR = "RESTAURANT_METRICS"
+LOCATIONS_ENV_VAR = "RESTAURANT_LOCATIONS"
+LOCATION_DATABASE_URL_ENV_VAR = "RESTAURANT_LOCATION_DATABASE_URL"
+MAX_OPEN_LOCATIONS_ENV_VAR = "RESTAURANT_MAX_OPEN_LOCATIONS"
+WRITE_CONCURRENCY_ENV_VAR = "RESTAURANT_WRITE_CONCURRENCY"
+WRITE_QUEUE_SIZE_ENV_VAR = "RESTAURANT_WRITE_QUEUE_SIZE"
+WRITE_QUEUE_TIMEOUT_ENV_VAR = "RESTAURANT_WRITE_QUEUE_TIMEOUT"
+JOB_WORKERS_ENV_VAR = "RESTAURANT_JOB_WORKERS"
+
+DEFAULT_DATABASE_URL = "sqlite:///./database.db"
+DEFAULT_LOCATION_DATABASE_URL = "sqlite:///./locations/{location}.db"
+
+
+# Named engine configuration: connection pool sizing plus the PRAGMAs applied to every new connection.
+# pool_size/max_overflow size the read-write engine, read_pool_size/read_max_overflow the
+# read-only engine used by the GET routes.
+class EngineProfile(BaseModel):
+    name: str = Field(..., title="Profile Name")
+    pool_size: int = Field(5, title="Pool Size")
+    max_overflow: int = Field(10, title="Pool Overflow")
+    read_pool_size: int = Field(5, title="Read Pool Size")
+    read_max_overflow: int = Field(10, title="Read Pool Overflow")
+    pool_timeout: float = Field(30.0, title="Pool Checkout Timeout (seconds)")
+    echo: bool = Field(False, title="Log SQL Statements")
+    pragmas: dict[str, Union[str, int]] = Field(default_factory=dict, title="SQLite PRAGMAs")
+
+
+# Local development: default rollback journal, but with enforced foreign keys and a busy timeout
+DEV_PROFILE = EngineProfile(
+    name="dev",
+    pool_size=5,
+    max_overflow=10,
+    pragmas={
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+)
+
+# Production: WAL lets readers run alongside the single writer, synchronous=NORMAL is durable
+# across application crashes in WAL mode, and a larger page cache and mmap keep the hot set in memory.
+# SQLite runs one write transaction at a time, so writes queue for a single connection instead
+# of contending for the database lock, while reads get a pool of their own.
+PROD_PROFILE = EngineProfile(
+    name="prod",
+    pool_size=1,
+    max_overflow=0,
+    read_pool_size=10,
+    read_max_overflow=20,
+    pool_timeout=10.0,
+    pragmas={
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+        "cache_size": -64000,  # Negative values are KiB, i.e. 64 MiB
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "MEMORY",
+    },
+)
+
+# Benchmarks: production settings, minus fsyncs, so runs measure the application rather than the disk
+BENCH_PROFILE = EngineProfile(
+    name="bench",
+    pool_size=1,
+    max_overflow=0,
+    read_pool_size=20,
+    read_max_overflow=20,
+    pool_timeout=10.0,
+    pragmas={
+        **PROD_PROFILE.pragmas,
+        "synchronous": "OFF",
+    },
+)
+
+PROFILES = {profile.name: profile for profile in (DEV_PROFILE, PROD_PROFILE, BENCH_PROFILE)}
+
+
+# Read a boolean environment variable ("1", "true", "yes", "on")
+def env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Read a comma-separated list environment variable
+def env_list(name: str) -> tuple:
+    return tuple(item.strip() for item in os.getenv(name, "").split(",") if item.strip())
+
+
+def is_memory_url(url: str) -> bool:
+    return url.startswith("sqlite") and (
+        ":memory:" in url or url.rstrip("/") in ("sqlite:", "sqlite+pysqlite:")
+    )
+
+
+# Application settings, resolved from the environment
+class Settings(BaseModel):
+    database_url: str = Field(DEFAULT_DATABASE_URL, title="Database URL")
+    profile: EngineProfile = Field(DEV_PROFILE, title="Engine Profile")
+    async_routes: bool = Field(False, title="Serve CRUD routes from the async database path")
+    fast_responses: bool = Field(False, title="Encode collection responses from projected rows with orjson")
+    metrics: bool = Field(True, title="Collect per-route metrics and serve them on /metrics")
+    locations: tuple[str, ...] = Field((), title="Restaurant locations served from their own databases")
+    location_database_url: str = Field(DEFAULT_LOCATION_DATABASE_URL, title="Database URL template of a location")
+    max_open_locations: int = Field(8, title="Location databases kept open at once")
+    write_concurrency: int = Field(4, title="Writes run at once per database; 0 disables admission control")
+    write_queue_size: int = Field(64, title="Writes waiting for a slot before new ones are shed")
+    write_queue_timeout: float = Field(5.0, title="Seconds a write waits for a slot before it is shed")
+    job_workers: int = Field(2, title="Background job worker threads; 0 leaves the jobs to a separate runner")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        profile_name = os.getenv(PROFILE_ENV_VAR, DEV_PROFILE.name)
+        if profile_name not in PROFILES:
+            raise ValueError(
+                f"Unknown {PROFILE_ENV_VAR} '{profile_name}', expected one of: {', '.join(PROFILES)}"
+            )
+        return cls(
+            database_url=os.getenv(DATABASE_URL_ENV_VAR, DEFAULT_DATABASE_URL),
+            profile=PROFILES[profile_name],
+            async_routes=env_flag(ASYNC_ROUTES_ENV_VAR),
+            fast_responses=env_flag(FAST_RESPONSES_ENV_VAR),
+            metrics=env_flag(METRICS_ENV_VAR, default=True),
+            locations=env_list(LOCATIONS_ENV_VAR),
+            location_database_url=os.getenv(LOCATION_DATABASE_URL_ENV_VAR, DEFAULT_LOCATION_DATABASE_URL),
+            max_open_locations=int(os.getenv(MAX_OPEN_LOCATIONS_ENV_VAR, "8")),
+            write_concurrency=int(os.getenv(WRITE_CONCURRENCY_ENV_VAR, "4")),
+            write_queue_size=int(os.getenv(WRITE_QUEUE_SIZE_ENV_VAR, "64")),
+            write_queue_timeout=float(os.getenv(WRITE_QUEUE_TIMEOUT_ENV_VAR, "5")),
+            job_workers=int(os.getenv(JOB_WORKERS_ENV_VAR, "2")),
+        )
+
+    @property
+    def is_memory_database(self) -> bool:
+        return is_memory_url(self.database_url)
+
+    # Keyword arguments for create_engine(), for the main database or a location's, read-write
+    # or read-only
+    def engine_options(self, url: str = None, read: bool = False) -> dict:
+        options = {
+            "connect_args": {"check_same_thread": False},
+            "echo": self.profile.echo,
+        }
+        # In-memory databases live on a single connection, so pool sizing does not apply
+        if not is_memory_url(url or self.database_url):
+            options.update(
+                pool_size=self.profile.read_pool_size if read else self.profile.pool_size,
+                max_overflow=self.profile.read_max_overflow if read else self.profile.max_overflow,
+                pool_timeout=self.profile.pool_timeout,
+            )
+        return options
+
+
+settings = Settings.from_env()
@@ -1,27 +1,250 @@
-from sqlalchemy import create_engine
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
+from backend.core.config import settings, is_memory_url
 
 # Database configuration
-DATABASE_URL = "sqlite:///./database.db"
+DATABASE_URL = settings.database_url
 
 # Create database engine
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_engine(DATABASE_URL, **settings.engine_options())
 
-# Session factory
+# Apply the profile's PRAGMAs to an engine on every new DBAPI connection. Foreign keys are
+# always enforced: deletes rely on the schema's ON DELETE actions for the dependent rows.
+def apply_pragmas(target_engine, pragmas):
+    pragmas = {**pragmas, "foreign_keys": "ON"}
+
+    @event.listens_for(target_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+apply_pragmas(engine, settings.profile.pragmas)
+
+# PRAGMAs that a read-only connection cannot or need not set
+READ_ONLY_SKIPPED_PRAGMAS = {"journal_mode", "synchronous"}
+
+# URL opening the same SQLite file read-only (mode=ro): such a connection cannot write, take
+# write locks or create the file
+def read_only_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(
+        database=f"file:{parsed.database}",
+        query={**parsed.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
+# Read-only engine for the GET routes, with its own pool and query_only on every connection.
+# An in-memory database exists on a single connection, so it is read through the main engine.
+def create_read_engine(url: str, write_engine, create=create_engine):
+    if is_memory_url(url):
+        return write_engine
+    read_engine = create(read_only_url(url), **settings.engine_options(url, read=True))
+    pragmas = {
+        name: value for name, value in settings.profile.pragmas.items()
+        if name not in READ_ONLY_SKIPPED_PRAGMAS
+    }
+    apply_pragmas(getattr(read_engine, "sync_engine", read_engine), {**pragmas, "query_only": "ON"})
+    return read_engine
+
+read_engine = create_read_engine(DATABASE_URL, engine)
+
+# Session factories: read-write, and read-only for the GET routes
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Restaurant location of the request being served (set by LocationMiddleware); None selects
+# the main database
+current_location: ContextVar[Optional[str]] = ContextVar("current_location", default=None)
+
+# Engines and session factories of one location's database. Opening it creates and migrates
+# the schema; the async engine is only created when an async route needs it.
+class LocationDatabase:
+    def __init__(self, url: str):
+        self.url = url
+        path = make_url(url).database
+        if path and not is_memory_url(url):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.engine = create_engine(url, **settings.engine_options(url))
+        apply_pragmas(self.engine, settings.profile.pragmas)
+        self.read_engine = create_read_engine(url, self.engine)
+        self.sessions = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.read_sessions = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
+        self.async_engine = None
+        self.async_read_engine = None
+        self.async_sessions = None
+        self.async_read_sessions = None
+        initialize_database(self.engine)
+
+    def init_async(self):
+        if self.async_engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+            url = self.url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+            self.async_engine = create_async_engine(url, **settings.engine_options(url))
+            apply_pragmas(self.async_engine.sync_engine, settings.profile.pragmas)
+            self.async_read_engine = create_read_engine(url, self.async_engine, create_async_engine)
+            self.async_sessions = async_sessionmaker(
+                bind=self.async_engine, autoflush=False, expire_on_commit=False
+            )
+            self.async_read_sessions = async_sessionmaker(
+                bind=self.async_read_engine, autoflush=False, expire_on_commit=False
+            )
+
+    def dispose(self):
+        self.engine.dispose()
+        if self.read_engine is not self.engine:
+            self.read_engine.dispose()
+
+    # Async engines, to be disposed on the event loop
+    def async_engines(self) -> list:
+        return [async_engine for async_engine in {self.async_engine, self.async_read_engine} if async_engine is not None]
+
+# Location databases open in this process, at most `capacity` at a time.
+#
+# A location is opened by its first request and the least recently used one is closed once
+# the limit is reached, so open files and pooled connections grow with the limit rather than
+# with the number of locations. Sessions still using a closed engine keep their connection
+# until they finish. Async engines can only be disposed on the event loop, so they are parked
+# until the next async request. on_close callbacks receive the name of every closed location.
+class LocationDatabases:
+    def __init__(self, url_template: str, capacity: int):
+        self.url_template = url_template
+        self.capacity = max(capacity, 1)
+        self.on_close = []
+        self._lock = threading.Lock()
+        self._open = OrderedDict()
+        self._opening = {}
+        self._retired_async = []
+
+    # The database of a location if it is open, without opening it. With touch=False it does
+    # not count as a use either, so background pollers leave the LRU order to the requests.
+    def peek(self, location: str, touch: bool = True) -> Optional[LocationDatabase]:
+        with self._lock:
+            database = self._open.get(location)
+            if database is not None and touch:
+                self._open.move_to_end(location)
+            return database
+
+    def get(self, location: str) -> LocationDatabase:
+        database = self.peek(location)
+        if database is not None:
+            return database
+        # One thread opens a location while requests for other locations go on
+        with self._lock:
+            opening = self._opening.setdefault(location, threading.Lock())
+        with opening:
+            database = self.peek(location)
+            if database is None:
+                database = LocationDatabase(self.url_template.format(location=location))
+                self._add(location, database)
+        return database
+
+    def _add(self, location: str, database: LocationDatabase):
+        with self._lock:
+            self._open[location] = database
+            self._opening.pop(location, None)
+            closed = []
+            while len(self._open) > self.capacity:
+                closed.append(self._open.popitem(last=False))
+        for name, old in closed:
+            old.dispose()
+            with self._lock:
+                self._retired_async.extend(old.async_engines())
+            for callback in self.on_close:
+                callback(name)
+
+    async def dispose_retired(self):
+        with self._lock:
+            retired, self._retired_async = self._retired_async, []
+        for async_engine in retired:
+            await async_engine.dispose()
+
+location_databases = LocationDatabases(settings.location_database_url, settings.max_open_locations)
+
+# Session factory of the request's location (the main database if it names none)
+def session_factory(read: bool = False):
+    location = current_location.get()
+    if location is None:
+        return ReadSessionLocal if read else SessionLocal
+    database = location_databases.get(location)
+    return database.read_sessions if read else database.sessions
 
 # Dependency to get the database session
 def get_db():
-    db = SessionLocal()
+    db = session_factory()()
     try:
         yield db
     finally:
         db.close()
 
+# Dependency to get a read-only session, used by the GET routes
+def get_read_db():
+    db = session_factory(read=True)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Async engine and session factory (aiosqlite), created on first use so the sync-only
+# deployment does not need the aiosqlite driver installed
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+
+def init_async_engine():
+    global async_engine, async_read_engine, AsyncSessionLocal, AsyncReadSessionLocal
+    if async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, **settings.engine_options())
+        apply_pragmas(async_engine.sync_engine, settings.profile.pragmas)
+        async_read_engine = create_read_engine(ASYNC_DATABASE_URL, async_engine, create_async_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+        AsyncReadSessionLocal = async_sessionmaker(
+            bind=async_read_engine, autoflush=False, expire_on_commit=False
+        )
+    return async_engine
+
+# Async session factory of the request's location (the main database if it names none)
+async def async_session_factory(read: bool = False):
+    location = current_location.get()
+    if location is None:
+        init_async_engine()
+        return AsyncReadSessionLocal if read else AsyncSessionLocal
+    database = location_databases.peek(location)
+    if database is None:
+        # Opening runs the schema migrations: keep them off the event loop
+        database = await asyncio.to_thread(location_databases.get, location)
+    await location_databases.dispose_retired()
+    database.init_async()
+    return database.async_read_sessions if read else database.async_sessions
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with (await async_session_factory())() as db:
+        yield db
+
+# Dependency to get a read-only async session, used by the async GET routes
+async def get_async_read_db():
+    async with (await async_session_factory(read=True))() as db:
+        yield db
+
 # Base model
 @as_declarative()
 class Base:
@@ -32,8 +255,8 @@ class Base:
     def __tablename__(cls) -> str:
         return cls.__name__.lower()
 
-# Function to initialize the database
-def initialize_database():
+# Function to initialize the database: create missing tables, then migrate existing ones
+def initialize_database(bind=None):
     from backend.models import (
         person,
         restaurant_employee,
@@ -47,5 +270,13 @@ def initialize_database():
         order,
         reservation,
         table,
+        stock,
+        sales,
+        idempotency,
+        job,
     )
-    Base.metadata.create_all(bind=engine)
+    from backend.core.migrations import run_migrations
+
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    run_migrations(bind)
@@ -0,0 +1,151 @@
+import hashlib
+import re
+import threading
+import time
+import uuid
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from backend.core.database import current_location
+
+# Tags also change every this many seconds. Versions are counted per process, so a worker does
+# not see writes made by another one; the bucket bounds how long it can answer 304 for them.
+ETAG_TTL_SECONDS = 60
+
+# Foreign key actions that make the database rewrite rows of the referencing table
+CASCADING_ACTIONS = {"CASCADE", "SET NULL", "SET DEFAULT"}
+
+WRITE_PATTERN = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+# Name of the table written by an INSERT/UPDATE/DELETE statement, None for anything else
+def written_table(statement: str):
+    match = WRITE_PATTERN.match(statement)
+    return match.group(1) if match else None
+
+
+# Per-table version counters used to build ETags for read endpoints.
+#
+# Every INSERT/UPDATE/DELETE seen on any engine marks its table as pending on the connection;
+# the pending tables are bumped when the transaction commits and dropped when it rolls back.
+# Tables rewritten by the database through ON DELETE/UPDATE actions are bumped along with the
+# table they reference.
+class TableVersions:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._dependents = None
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def _cascades(self):
+        if self._dependents is None:
+            from backend.core.database import Base
+
+            direct = {}
+            for table in Base.metadata.tables.values():
+                for key in table.foreign_keys:
+                    actions = {(key.ondelete or "").upper(), (key.onupdate or "").upper()}
+                    if actions & CASCADING_ACTIONS:
+                        direct.setdefault(key.column.table.name, set()).add(table.name)
+            dependents = {}
+            for name in direct:
+                reached, stack = set(), [name]
+                while stack:
+                    for dependent in direct.get(stack.pop(), ()):
+                        if dependent not in reached:
+                            reached.add(dependent)
+                            stack.append(dependent)
+                dependents[name] = reached
+            self._dependents = dependents
+        return self._dependents
+
+    def bump(self, *tables):
+        cascades = self._cascades()
+        with self._lock:
+            for table in set(tables).union(*(cascades.get(table, ()) for table in tables)):
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def version(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    # Weak ETag for a resource built from the given tables
+    def etag(self, tables, resource: str) -> str:
+        state = ",".join(f"{table}:{self._versions.get(table, 0)}" for table in tables)
+        bucket = int(time.time() // ETAG_TTL_SECONDS)
+        digest = hashlib.blake2b(f"{resource}|{state}|{bucket}".encode(), digest_size=8).hexdigest()
+        return f'W/"{self.epoch}-{digest}"'
+
+
+table_versions = TableVersions()
+
+# Tables committed by the current thread, bumped again once the session has finished committing
+_committed = threading.local()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def track_write(connection, cursor, statement, parameters, context, executemany):
+    table = written_table(statement)
+    if table:
+        connection.info.setdefault("etag_pending", set()).add(table)
+
+
+@event.listens_for(Engine, "commit")
+def bump_on_commit(connection):
+    tables = connection.info.pop("etag_pending", None)
+    if tables:
+        table_versions.bump(*tables)
+        _committed.tables = getattr(_committed, "tables", set()) | tables
+
+
+@event.listens_for(Engine, "rollback")
+def discard_on_rollback(connection):
+    connection.info.pop("etag_pending", None)
+
+
+# The engine commit event fires before COMMIT runs, so a read in between could pair the new tag
+# with the old rows; bumping again after the session commit invalidates such a tag.
+@event.listens_for(Session, "after_commit")
+def bump_after_commit(session):
+    tables = getattr(_committed, "tables", None)
+    if tables:
+        _committed.tables = set()
+        table_versions.bump(*tables)
+
+
+# Table names a read depends on: the model's table plus those loaded by the schema's loading plan
+def tables_for(model, schema=None) -> tuple:
+    tables = {model.__table__.name}
+    for name in getattr(schema, "loading_plan", {}):
+        relationship = model.__mapper__.relationships[name]
+        tables.add(relationship.target.name)
+        if relationship.secondary is not None:
+            tables.add(relationship.secondary.name)
+    return tuple(sorted(tables))
+
+
+def if_none_match(header: str, tag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or tag in candidates or tag[2:] in candidates
+
+
+# Dependency for GET routes: answer 304 before the endpoint runs when the client's copy is
+# current, otherwise set the ETag header on the response.
+#   @router.get("/", dependencies=[Depends(conditional_get(TableModel))])
+def conditional_get(*models, schema=None, tables=()):
+    names = tuple(sorted(set(tables).union(*(tables_for(model, schema) for model in models))))
+
+    def check_etag(request: Request, response: Response):
+        # Versions are shared by all locations, so the location is part of the resource
+        resource = f"{current_location.get() or ''}|{request.url.path}" + ("?" + request.url.query if request.url.query else "")
+        tag = table_versions.etag(names, resource)
+        if if_none_match(request.headers.get("if-none-match"), tag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
+        response.headers["ETag"] = tag
+
+    return check_etag
@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import time
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from backend.core.database import session_factory
+from backend.services.idempotency import (
+    PENDING,
+    PENDING_SECONDS,
+    StoredResponse,
+    claim_key,
+    complete_key,
+    idempotency_store,
+    release_key,
+)
+
+# Creation routes a client may retry with an Idempotency-Key header
+IDEMPOTENT_ROUTES = {("POST", "/order/"), ("POST", "/reservation/")}
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+# How often a request waits for a key served by another worker process
+POLL_SECONDS = 0.05
+
+
+def error_response(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+
+# Run a key operation in a worker thread on a session of the request's location
+def run_on_session(operation, *args):
+    def run():
+        db = session_factory()()
+        try:
+            return operation(db, *args)
+        finally:
+            db.close()
+
+    return run_in_threadpool(run)
+
+
+# Pure ASGI middleware making the IDEMPOTENT_ROUTES safe to retry. The first request with a
+# key runs and its response (anything but a server error) is stored; a retry with the same key
+# and body gets that response again, with an Idempotent-Replayed header, without running the
+# route. A retry arriving while the first request is still being served waits for it. Reusing
+# a key for a different request is rejected with 422.
+#
+# Must run inside LocationMiddleware, so the keys go to the database of the request's location.
+class IdempotencyMiddleware:
+    def __init__(self, app, routes=IDEMPOTENT_ROUTES):
+        self.app = app
+        self.routes = set(routes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        key = dict(scope["headers"]).get(IDEMPOTENCY_HEADER)
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        if key is None or (scope["method"], path) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        key = key.decode("latin-1")
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await error_response(400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")(scope, receive, send)
+            return
+
+        body = await read_body(receive)
+        fingerprint = hashlib.sha256(f"{scope['method']} {path}\n".encode() + body).hexdigest()
+        store = idempotency_store.current()
+        deadline = time.monotonic() + PENDING_SECONDS
+
+        while True:
+            stored = store.get(key)
+            if stored is None:
+                waiting = store.in_flight.get(key)
+                if waiting is not None:
+                    await waiting.wait()
+                    continue
+                finished = store.in_flight[key] = asyncio.Event()
+                try:
+                    stored = await run_on_session(claim_key, key, fingerprint)
+                    if stored is None:
+                        await self.serve(scope, receive, send, body, store, key, fingerprint)
+                        return
+                finally:
+                    del store.in_flight[key]
+                    finished.set()
+                if stored is PENDING:
+                    if time.monotonic() > deadline:
+                        await error_response(409, "A request with this Idempotency-Key is still in progress")(scope, receive, send)
+                        return
+                    await asyncio.sleep(POLL_SECONDS)
+                    continue
+                store.put(key, stored)
+
+            if stored.fingerprint != fingerprint:
+                await error_response(422, "Idempotency-Key was already used for a different request")(scope, receive, send)
+                return
+            await replay(stored, send)
+            return
+
+    # Run the route for a claimed key, passing the response through while recording it
+    async def serve(self, scope, receive, send, body, store, key, fingerprint):
+        response = StoredResponse(fingerprint, 500, None, b"")
+        chunks = []
+        pending_body = [{"type": "http.request", "body": body, "more_body": False}]
+
+        # The body was already read; later calls wait for the client to disconnect
+        async def receive_body():
+            return pending_body.pop() if pending_body else await receive()
+
+        async def record(message):
+            if message["type"] == "http.response.start":
+                response.status_code = message["status"]
+                response.content_type = dict(message.get("headers", [])).get(b"content-type", b"").decode("latin-1") or None
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, record)
+        except BaseException:
+            await run_on_session(release_key, key)
+            raise
+        if response.status_code >= 500:
+            await run_on_session(release_key, key)
+            return
+        response.body = b"".join(chunks)
+        await run_on_session(complete_key, key, response)
+        store.put(key, response)
+
+
+async def read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def replay(stored: StoredResponse, send):
+    headers = [(b"content-length", str(len(stored.body)).encode()), (REPLAYED_HEADER, b"true")]
+    if stored.content_type:
+        headers.append((b"content-type", stored.content_type.encode("latin-1")))
+    await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body})
@@ -0,0 +1,32 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+# Loader strategies a response schema can request for its relationships:
+# "joined" for many-to-one references (one LEFT OUTER JOIN on the root query),
+# "selectin" for collections (one extra SELECT ... WHERE id IN (...) per relationship)
+LOADER_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+}
+
+
+# Build loader options from the `loading_plan` declared on a response schema
+def loader_options(model, schema):
+    options = []
+    for attribute, strategy in getattr(schema, "loading_plan", {}).items():
+        if strategy not in LOADER_STRATEGIES:
+            raise ValueError(f"Unknown loading strategy '{strategy}' for {schema.__name__}.{attribute}")
+        options.append(LOADER_STRATEGIES[strategy](getattr(model, attribute)))
+    return options
+
+
+# Apply a schema's loading plan to a query, so serializing the result issues no lazy loads
+def apply_loading_plan(query, schema):
+    model = query.column_descriptions[0]["entity"]
+    return query.options(*loader_options(model, schema))
+
+
+# Number of statements a with-relations lookup is expected to run under its loading plan:
+# the root query (carrying the joined loads) plus one per selectin-loaded relationship
+def query_budget(schema) -> int:
+    plan = getattr(schema, "loading_plan", {})
+    return 1 + sum(1 for strategy in plan.values() if strategy == "selectin")
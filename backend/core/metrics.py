@@ -0,0 +1,211 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from backend.core.database import Base
+
+# Histogram buckets (upper bounds) for request latency in seconds and statements per request
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Route label for requests that matched no route, so unknown paths cannot grow the label set
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# Database work done while serving one request, filled in by the engine and ORM hooks
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "rows")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+
+
+# Stats of the request being served. Sync endpoints run in a worker thread with a copy of the
+# context, which still points at the same RequestStats object.
+current_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement_timer(connection, cursor, statement, parameters, context, executemany):
+    if current_stats.get() is not None and context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement(connection, cursor, statement, parameters, context, executemany):
+    stats = current_stats.get()
+    if stats is None or context is None:
+        return
+    stats.queries += 1
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        stats.db_seconds += time.perf_counter() - started
+
+
+# Rows returned are counted as ORM instances loaded, plus rows reported by record_rows()
+@event.listens_for(Base, "load", propagate=True)
+def record_loaded_instance(target, context):
+    stats = current_stats.get()
+    if stats is not None:
+        stats.rows += 1
+
+
+# Count rows read without building ORM instances (column projections, raw selects)
+def record_rows(count: int):
+    stats = current_stats.get()
+    if stats is not None:
+        stats.rows += count
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+
+# Aggregated metrics of one (method, route template) pair
+class RouteMetrics:
+    __slots__ = ("latency", "queries", "db_seconds", "rows", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.statuses = {}
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_bound(bound) -> str:
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+# Process-wide metrics store, rendered in the Prometheus text exposition format
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(seconds)
+            metrics.queries.observe(stats.queries)
+            metrics.db_seconds += stats.db_seconds
+            metrics.rows += stats.rows
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+
+            def histogram(name, help_text, select):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), metrics in routes:
+                    labels = f'method="{method}",route="{escape_label(route)}"'
+                    values = select(metrics)
+                    cumulative = 0
+                    for bound, count in zip(values.bounds, values.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{format_bound(bound)}"}} {cumulative}')
+                    cumulative += values.counts[-1]
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{labels}}} {values.total}")
+                    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+            def counter(name, help_text, select):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, route), metrics in routes:
+                    labels = f'method="{method}",route="{escape_label(route)}"'
+                    lines.append(f"{name}{{{labels}}} {select(metrics)}")
+
+            lines.append("# HELP http_requests_total Requests served, by route template and status code")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route), metrics in routes:
+                for status_code, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'http_requests_total{{method="{method}",route="{escape_label(route)}",'
+                        f'status="{status_code}"}} {count}'
+                    )
+            histogram(
+                "http_request_duration_seconds", "Request latency by route template",
+                lambda metrics: metrics.latency,
+            )
+            histogram(
+                "http_request_db_queries", "SQL statements executed per request",
+                lambda metrics: metrics.queries,
+            )
+            counter(
+                "http_request_db_seconds_total", "Time spent executing SQL statements",
+                lambda metrics: metrics.db_seconds,
+            )
+            counter(
+                "http_request_db_rows_total", "Rows loaded from the database",
+                lambda metrics: metrics.rows,
+            )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# Pure ASGI middleware timing every HTTP request and collecting its database work.
+# The route label is the matched route template (e.g. /order/{order_id}), which FastAPI
+# stores in the request scope while routing.
+class MetricsMiddleware:
+    def __init__(self, app, metrics: MetricsRegistry = registry):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_stats.reset(token)
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - started,
+                stats,
+            )
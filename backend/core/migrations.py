@@ -0,0 +1,148 @@
+from datetime import datetime
+from sqlalchemy import text
+
+# Versioned schema migrations for existing databases.
+#
+# create_all() only creates missing tables, so any change to an existing table (new index,
+# new column, trigger, ...) is shipped as a migration here. Migrations run in version order at
+# startup and each applied version is recorded in the `schema_migration` table. Every migration
+# must be idempotent (IF NOT EXISTS, column checks, ...): on a fresh database create_all() has
+# already built the current schema, and several worker processes may start at the same time.
+MIGRATIONS = []
+
+
+# Register a migration function taking a SQLAlchemy connection
+def migration(version: int, description: str):
+    def register(upgrade):
+        if any(existing[0] == version for existing in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append((version, description, upgrade))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return upgrade
+    return register
+
+
+# Column names of a table, used by migrations that add columns
+def column_names(connection, table: str) -> set:
+    return {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")')}
+
+
+def add_column_if_missing(connection, table: str, column: str, ddl: str):
+    if column not in column_names(connection, table):
+        connection.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}')
+
+
+def applied_versions(connection) -> set:
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migration"))}
+
+
+# Apply every migration that has not been recorded yet
+def run_migrations(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_migration ("
+            "version INTEGER PRIMARY KEY, "
+            "description VARCHAR NOT NULL, "
+            "applied_at DATETIME NOT NULL)"
+        )
+        applied = applied_versions(connection)
+
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            upgrade(connection)
+            connection.execute(
+                text(
+                    "INSERT OR IGNORE INTO schema_migration (version, description, applied_at) "
+                    "VALUES (:version, :description, :applied_at)"
+                ),
+                {"version": version, "description": description, "applied_at": datetime.now()},
+            )
+
+
+@migration(1, "Index foreign key and filter columns")
+def add_foreign_key_indexes(connection):
+    indexes = [
+        ("ix_address_history_client_id", "address_history", "client_id"),
+        ("ix_client_person_id", "client", "person_id"),
+        ("ix_deliver_person_id", "deliver", "person_id"),
+        ("ix_delivery_deliver_id", "delivery", "deliver_id"),
+        ("ix_delivery_ingredient_ingredient_id", "delivery_ingredient", "ingredient_id"),
+        ("ix_dish_ingredient_ingredient_id", "dish_ingredient", "ingredient_id"),
+        ("ix_employment_contract_employee_id", "employment_contract", "employee_id"),
+        ("ix_order_status", "order", "status"),
+        ("ix_order_client_id", "order", "client_id"),
+        ("ix_order_address_history_id", "order", "address_history_id"),
+        ("ix_order_dish_dish_id", "order_dish", "dish_id"),
+        ("ix_reservation_date", "reservation", "date"),
+        ("ix_reservation_client_id", "reservation", "client_id"),
+        ("ix_restaurant_employee_person_id", "restaurant_employee", "person_id"),
+        ("ix_restaurant_employee_order_order_id", "restaurant_employee_order", "order_id"),
+        ("ix_table_reservation_id", "table", "reservation_id"),
+    ]
+    for name, table, column in indexes:
+        connection.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS {name} ON "{table}" ({column})')
+
+
+@migration(2, "Stock quantities on delivery and dish ingredients")
+def add_stock_quantities(connection):
+    add_column_if_missing(connection, "delivery_ingredient", "quantity", "INTEGER")
+    add_column_if_missing(connection, "dish_ingredient", "quantity", "INTEGER")
+
+
+@migration(3, "Payment time on orders")
+def add_order_paid_at(connection):
+    add_column_if_missing(connection, "order", "paid_at", "DATETIME")
+
+
+# External-content FTS5 index over some columns of a table, kept in sync by triggers
+def create_search_index(connection, index: str, table: str, columns: list):
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON "{table}" BEGIN '
+        f"INSERT INTO {index} (rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON "{table}" BEGIN '
+        f"INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE ON "{table}" BEGIN '
+        f"INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {index} (rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+    # Index the rows that existed before the triggers
+    connection.exec_driver_sql(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+
+
+@migration(4, "Full-text search over people and dishes")
+def add_search_indexes(connection):
+    create_search_index(connection, "person_search", "person", ["name", "surname", "email", "phone_number"])
+    create_search_index(connection, "dish_search", "dish", ["name", "description"])
+
+
+# Reservations used to reach their tables through table.reservation_id, one reservation per
+# table; the links move to the reservation_table association table
+@migration(5, "Reservation and table association table")
+def add_reservation_tables(connection):
+    connection.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS reservation_table ("
+        "reservation_id INTEGER NOT NULL REFERENCES reservation (id) ON DELETE CASCADE, "
+        'table_id INTEGER NOT NULL REFERENCES "table" (id) ON DELETE CASCADE, '
+        "PRIMARY KEY (reservation_id, table_id))"
+    )
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_reservation_table_table_id ON reservation_table (table_id)"
+    )
+    connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO reservation_table (reservation_id, table_id) "
+        'SELECT reservation_id, id FROM "table" WHERE reservation_id IS NOT NULL'
+    )
@@ -0,0 +1,155 @@
+from typing import Optional
+from fastapi import Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from backend.core.config import settings
+from backend.core.metrics import record_rows
+from backend.core.serialization import FastJSONResponse, compile_serializer, dumps
+
+# Page size limits for collection endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Number of rows pulled from the database per round trip when streaming
+STREAM_CHUNK_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+# Query parameters shared by every collection endpoint
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, title="Page Size"),
+        after: Optional[int] = Query(None, ge=0, title="Return records with an ID greater than this cursor"),
+        stream: bool = Query(False, title="Stream every record as NDJSON"),
+    ):
+        self.limit = limit
+        self.after = after
+        self.stream = stream
+
+
+# Apply the keyset condition to a query: records ordered by id, strictly after the cursor
+def keyset(query, model, after: Optional[int], limit: int):
+    if after is not None:
+        query = query.filter(model.id > after)
+    return query.order_by(model.id).limit(limit)
+
+
+# Row serializer for the fast response path, or None to return validated ORM objects.
+# `fast` turns the path on for one route; None follows the global setting.
+def fast_serializer(model, schema, fast: Optional[bool] = None):
+    if fast is None:
+        fast = settings.fast_responses
+    return compile_serializer(model, schema) if fast else None
+
+
+# Return one page of records (or an NDJSON stream of all of them) for a collection query.
+# Headers set on `response` by dependencies (e.g. ETag) are carried over to the stream.
+# On the fast path only the schema's columns are selected and the rows are encoded directly.
+def paginate(query, model, schema, page: PageParams, response: Response, fast: Optional[bool] = None):
+    serializer = fast_serializer(model, schema, fast)
+    if page.stream:
+        stream = stream_ndjson(query, model, schema, after=page.after, serializer=serializer)
+        stream.headers.update(response.headers)
+        return stream
+
+    if serializer is not None:
+        rows = keyset(query.with_entities(*serializer.columns), model, page.after, page.limit).all()
+        return fast_page(serializer, rows, page, response)
+
+    records = keyset(query, model, page.after, page.limit).all()
+    if len(records) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(records[-1].id)
+    return records
+
+
+def fast_page(serializer, rows, page: PageParams, response: Response):
+    record_rows(len(rows))
+    if len(rows) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(rows[-1].id)
+    return FastJSONResponse(serializer.to_dicts(rows), headers=response.headers)
+
+
+# Stream records as newline-delimited JSON, reading them from the database in keyset chunks.
+# The stream runs after the request dependencies are closed, so it works on its own session
+# bound to the same engine; each chunk is expunged once serialized to keep memory flat.
+def stream_ndjson(query, model, schema, after: Optional[int] = None, chunk_size: int = STREAM_CHUNK_SIZE,
+                  serializer=None):
+    bind = query.session.get_bind()
+    criteria = query.whereclause
+
+    def generate():
+        session = Session(bind=bind)
+        try:
+            cursor = after
+            while True:
+                chunk_query = session.query(*serializer.columns) if serializer else session.query(model)
+                if criteria is not None:
+                    chunk_query = chunk_query.filter(criteria)
+                records = keyset(chunk_query, model, cursor, chunk_size).all()
+                if not records:
+                    break
+                yield encode_lines(schema, serializer, records)
+                cursor = records[-1].id
+                session.expunge_all()
+                if len(records) < chunk_size:
+                    break
+        finally:
+            session.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# Encode a chunk of records (or projected rows) as NDJSON
+def encode_lines(schema, serializer, records) -> bytes:
+    if serializer is not None:
+        record_rows(len(records))
+        return b"".join(dumps(serializer.to_dict(row)) + b"\n" for row in records)
+    return "".join(schema.model_validate(record).model_dump_json() + "\n" for record in records).encode()
+
+
+# Async counterpart of paginate() for AsyncSession-backed routes
+async def paginate_async(db, model, schema, page: PageParams, response: Response, fast: Optional[bool] = None):
+    serializer = fast_serializer(model, schema, fast)
+    if page.stream:
+        stream = stream_ndjson_async(db, model, schema, after=page.after, serializer=serializer)
+        stream.headers.update(response.headers)
+        return stream
+
+    if serializer is not None:
+        rows = (await db.execute(keyset(select(*serializer.columns), model, page.after, page.limit))).all()
+        return fast_page(serializer, rows, page, response)
+
+    records = (await db.scalars(keyset(select(model), model, page.after, page.limit))).all()
+    if len(records) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(records[-1].id)
+    return records
+
+
+# Async counterpart of stream_ndjson(), reading keyset chunks on its own AsyncSession
+def stream_ndjson_async(db, model, schema, after: Optional[int] = None, chunk_size: int = STREAM_CHUNK_SIZE,
+                        serializer=None):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    bind = db.bind
+
+    async def generate():
+        async with AsyncSession(bind=bind) as session:
+            cursor = after
+            while True:
+                if serializer is not None:
+                    statement = keyset(select(*serializer.columns), model, cursor, chunk_size)
+                    records = (await session.execute(statement)).all()
+                else:
+                    records = (await session.scalars(keyset(select(model), model, cursor, chunk_size))).all()
+                if not records:
+                    break
+                yield encode_lines(schema, serializer, records)
+                cursor = records[-1].id
+                session.expunge_all()
+                if len(records) < chunk_size:
+                    break
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
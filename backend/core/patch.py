@@ -0,0 +1,157 @@
+from fastapi import HTTPException, status
+from sqlalchemy import Enum, inspect as sa_inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from backend.core.serialization import FastJSONResponse, compile_serializer, field_column
+
+# Scalar-only partial updates (PATCH) in one round trip.
+#
+# The change is sent as a single UPDATE ... RETURNING of the read schema's columns: no load,
+# no ORM instance, no refresh. A missing record is detected from the statement returning no
+# row, and the returned row is encoded directly. Relationship changes still go through PUT;
+# the flush-time validators do not run here, which is safe because only scalar columns change.
+# Before the statement runs, nulls on required columns are rejected (422) and foreign keys
+# are checked to point at existing records (400), as PUT does.
+#
+# Schemas with fields that are not columns cannot be returned by the statement; their records
+# are loaded and changed through the ORM instead.
+
+
+# UPDATE (or, for an empty patch, SELECT) of one record returning the schema's columns
+def patch_statement(model, schema, record_id: int, values: dict):
+    serializer = compile_serializer(model, schema)
+    if serializer is None:
+        raise TypeError(f"{schema.__name__} has fields that are not columns of {model.__name__}")
+    mapper = sa_inspect(model)
+    table = model.__table__
+    if not values:
+        return select(*serializer.columns).where(table.c.id == record_id)
+    columns = {field_column(mapper, name).key: value for name, value in values.items()}
+    return update(table).where(table.c.id == record_id).values(columns).returning(*serializer.columns)
+
+
+# Enum columns reject unknown values only when the statement is compiled, so check them first
+# and answer like a request validation error
+def check_enum_values(model, values: dict) -> dict:
+    mapper = sa_inspect(model)
+    checked = dict(values)
+    for name, value in values.items():
+        column = field_column(mapper, name)
+        if value is None or column is None or not isinstance(column.type, Enum):
+            continue
+        enum_class = column.type.enum_class
+        if enum_class is not None:
+            allowed = [member.value for member in enum_class]
+            if getattr(value, "value", value) in allowed:
+                checked[name] = enum_class(getattr(value, "value", value))
+                continue
+        else:
+            allowed = column.type.enums
+            if value in allowed:
+                continue
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=[{
+                "type": "enum",
+                "loc": ["body", name],
+                "msg": f"Input should be one of: {', '.join(map(repr, allowed))}",
+                "input": value,
+            }],
+        )
+    return checked
+
+
+# An explicit null on a NOT NULL column, answered like a request validation error
+def check_required_values(model, values: dict):
+    mapper = sa_inspect(model)
+    for name, value in values.items():
+        column = field_column(mapper, name)
+        if value is None and column is not None and not column.nullable:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=[{"type": "null", "loc": ["body", name], "msg": "Input should not be null", "input": None}],
+            )
+
+
+# Existence queries for the foreign keys set by a patch, with the 400 detail of each
+def reference_checks(model, values: dict) -> list:
+    mapper = sa_inspect(model)
+    checks = []
+    for name, value in values.items():
+        column = field_column(mapper, name)
+        if value is None or column is None:
+            continue
+        for key in column.foreign_keys:
+            target = key.column
+            detail = f"Invalid {target.table.name.replace('_', ' ')} ID"
+            checks.append((select(target).where(target == value), detail))
+    return checks
+
+
+def invalid_reference_error(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def not_found_error(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+def conflict_error() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Write violates a database constraint")
+
+
+# Apply a patch in the caller's transaction and return the updated row (the caller commits).
+# Without a compiled serializer the updated ORM instance is returned instead.
+def patch_record(db, model, schema, record_id: int, values: dict, not_found: str):
+    values = check_enum_values(model, values)
+    check_required_values(model, values)
+    for statement, detail in reference_checks(model, values):
+        if db.execute(statement).first() is None:
+            raise invalid_reference_error(detail)
+    try:
+        if compile_serializer(model, schema) is None:
+            row = db.get(model, record_id)
+            if row is not None:
+                for name, value in values.items():
+                    setattr(row, name, value)
+                db.flush()
+        else:
+            row = db.execute(patch_statement(model, schema, record_id, values)).first()
+    except IntegrityError:
+        db.rollback()
+        raise conflict_error()
+    if row is None:
+        raise not_found_error(not_found)
+    return row
+
+
+async def patch_record_async(db, model, schema, record_id: int, values: dict, not_found: str):
+    values = check_enum_values(model, values)
+    check_required_values(model, values)
+    for statement, detail in reference_checks(model, values):
+        if (await db.execute(statement)).first() is None:
+            raise invalid_reference_error(detail)
+    try:
+        if compile_serializer(model, schema) is None:
+            row = await db.get(model, record_id)
+            if row is not None:
+                for name, value in values.items():
+                    setattr(row, name, value)
+                await db.flush()
+                await db.refresh(row)
+        else:
+            row = (await db.execute(patch_statement(model, schema, record_id, values))).first()
+    except IntegrityError:
+        await db.rollback()
+        raise conflict_error()
+    if row is None:
+        raise not_found_error(not_found)
+    return row
+
+
+# Encode a row returned by a patch without response_model validation (an ORM instance from
+# the fallback path goes through the schema)
+def row_response(model, schema, row) -> FastJSONResponse:
+    serializer = compile_serializer(model, schema)
+    if serializer is None:
+        return FastJSONResponse(schema.model_validate(row).model_dump(mode="json"))
+    return FastJSONResponse(serializer.to_dict(row))
@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+# Collects the SQL statements executed on an engine while active
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+# Count the statements executed on an engine inside the block
+@contextmanager
+def count_queries(engine):
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+# Fail when the block executes more statements than expected (used to guard against N+1 regressions)
+@contextmanager
+def assert_max_queries(engine, expected: int):
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > expected:
+        executed = "\n".join(counter.statements)
+        raise AssertionError(f"Expected at most {expected} queries, {counter.count} were executed:\n{executed}")
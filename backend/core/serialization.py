@@ -0,0 +1,86 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional
+from fastapi.responses import Response
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import ColumnProperty, SynonymProperty
+
+# orjson is optional; without it the fast path still skips per-record validation and
+# falls back to the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Encode plain data (dicts, lists, rows converted to dicts) to JSON bytes
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+# JSON response rendered with orjson; content is returned as-is, without response_model validation
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Projection of a model onto a read schema: the columns to select and the row -> dict converter.
+#
+# Every schema field must map to a column (or a synonym of one) on the model; the rows then
+# carry exactly the values the schema exposes and are encoded without building ORM objects or
+# running pydantic validation. Enum columns are emitted as their values.
+class RowSerializer:
+    def __init__(self, model, schema, columns, keys):
+        self.model = model
+        self.schema = schema
+        self.columns = columns
+        self.keys = keys
+
+    # Convert one result row (in the order of self.columns) to a dict
+    def to_dict(self, row) -> dict:
+        return dict(zip(self.keys, row))
+
+    def to_dicts(self, rows) -> list:
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+
+_serializers = {}
+
+
+# Column backing a schema field: a mapped column or a synonym of one, else None
+def field_column(mapper, name: str):
+    prop = mapper.get_property(name) if mapper.has_property(name) else None
+    if isinstance(prop, SynonymProperty):
+        prop = mapper.get_property(prop.name)
+    if not isinstance(prop, ColumnProperty):
+        return None
+    return prop.columns[0]
+
+
+# Compile (once) the row serializer of a schema; None when a field has no matching column,
+# in which case callers keep using the validating path
+def compile_serializer(model, schema) -> Optional[RowSerializer]:
+    key = (model, schema)
+    if key not in _serializers:
+        mapper = sa_inspect(model)
+        columns = [field_column(mapper, name) for name in schema.model_fields]
+        if any(column is None for column in columns):
+            _serializers[key] = None
+        else:
+            labeled = [column.label(name) for column, name in zip(columns, schema.model_fields)]
+            _serializers[key] = RowSerializer(model, schema, labeled, tuple(schema.model_fields))
+    return _serializers[key]
@@ -0,0 +1,85 @@
+import threading
+from fastapi.responses import JSONResponse
+from backend.core.config import settings
+from backend.core.database import current_location, location_databases
+
+# Several restaurant locations served by one process, each from its own SQLite database.
+#
+# A request names its location with the X-Location header or a /locations/{location} path
+# prefix, which works in front of every route (/locations/krakow/order/1). Only locations
+# listed in RESTAURANT_LOCATIONS are accepted; their databases are created from the
+# RESTAURANT_LOCATION_DATABASE_URL template and opened on demand by location_databases.
+# Requests that name no location keep using the main database.
+LOCATION_HEADER = b"x-location"
+LOCATION_PREFIX = "/locations/"
+
+
+def error_response(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+
+# Pure ASGI middleware selecting the location of each request. The path prefix is moved into
+# root_path, so routing sees the same paths as without it. The scope is changed in place: outer
+# middleware (metrics) reads the matched route from it after the request.
+class LocationMiddleware:
+    def __init__(self, app, locations=settings.locations):
+        self.app = app
+        self.locations = set(locations)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        location = None
+        path = scope["path"]
+        if path.startswith(LOCATION_PREFIX):
+            location = path[len(LOCATION_PREFIX):].split("/", 1)[0]
+            scope["root_path"] = scope.get("root_path", "") + LOCATION_PREFIX + location
+        header = dict(scope["headers"]).get(LOCATION_HEADER)
+        if header is not None:
+            header = header.decode("latin-1")
+            if location is not None and header != location:
+                await error_response(400, "X-Location does not match the location in the path")(scope, receive, send)
+                return
+            location = header
+        if location is not None and location not in self.locations:
+            await error_response(404, "Unknown location")(scope, receive, send)
+            return
+
+        token = current_location.set(location)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_location.reset(token)
+
+
+# One instance of an in-memory service per location (kitchen queue, availability index, menu
+# snapshot). Attribute access is forwarded to the instance of the request's location, so the
+# call sites keep using the module-level object. Instances of a closed location are dropped
+# with its database; kitchen displays still streaming from it stop receiving updates, so keep
+# RESTAURANT_MAX_OPEN_LOCATIONS above the number of locations in service at once.
+class PerLocation:
+    def __init__(self, factory):
+        self._factory = factory
+        self._default = factory()
+        self._instances = {}
+        self._lock = threading.Lock()
+        location_databases.on_close.append(self.drop)
+
+    def current(self):
+        location = current_location.get()
+        if location is None:
+            return self._default
+        instance = self._instances.get(location)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.setdefault(location, self._factory())
+        return instance
+
+    def drop(self, location: str):
+        with self._lock:
+            self._instances.pop(location, None)
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
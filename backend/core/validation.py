@@ -0,0 +1,83 @@
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Model invariants checked once per flush, before any SQL is emitted.
+#
+# Validators live in the service modules and are registered per model; each one receives the
+# session and the new and modified instances of its models, so it can check them from the
+# state already in memory or with one batched query for the whole flush. Unlike mapper
+# before_insert/before_update listeners they never lazy-load a relationship per row.
+VALIDATORS = []
+
+
+# A business rule broken by a flush. Raised before any SQL runs, so nothing is written; the
+# API answers it with a 400 carrying the message. Real constraint violations reported by the
+# database stay IntegrityErrors.
+class InvariantError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+# Exception handler registered on the application
+async def invariant_error_response(request: Request, error: InvariantError) -> JSONResponse:
+    return JSONResponse({"detail": error.message}, status_code=status.HTTP_400_BAD_REQUEST)
+
+
+# Register a validator function(session, new, dirty) for one or more models
+def validator(*models):
+    def register(validate):
+        VALIDATORS.append((models, validate))
+        return validate
+    return register
+
+
+# Value of an attribute if it is already in memory, without loading it
+def in_memory(target, key, default=None):
+    return target.__dict__.get(key, default)
+
+
+# Whether a relationship was loaded or assigned in this session. A relationship that was never
+# touched on a persistent instance still holds what was valid at its last flush.
+def is_loaded(target, key) -> bool:
+    return key in target.__dict__
+
+
+# Invariant "target must reference a parent": the foreign key or the related object is set
+def has_parent(target, column: str, relationship: str) -> bool:
+    return bool(getattr(target, column)) or in_memory(target, relationship) is not None
+
+
+# Whether any of the attributes was changed since the instance was loaded
+def changed(target, *keys) -> bool:
+    state = inspect(target)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
+# Instances of a flush paired with whether they are being inserted
+def flushed(new, dirty):
+    return [(instance, True) for instance in new] + [(instance, False) for instance in dirty]
+
+
+# Size of a collection to check, or None when there is nothing to check: a pending instance
+# has nothing to load, so an untouched collection is empty, while an untouched collection of a
+# persistent instance is unchanged since its last flush
+def collection_size(target, key, pending: bool):
+    if is_loaded(target, key):
+        return len(target.__dict__[key])
+    return 0 if pending else None
+
+
+@event.listens_for(Session, "before_flush")
+def validate_flush(session, flush_context, instances):
+    if not VALIDATORS:
+        return
+    new = list(session.new)
+    dirty = [instance for instance in session.dirty if session.is_modified(instance)]
+    for models, validate in VALIDATORS:
+        model_new = [instance for instance in new if isinstance(instance, models)]
+        model_dirty = [instance for instance in dirty if isinstance(instance, models)]
+        if model_new or model_dirty:
+            validate(session, model_new, model_dirty)
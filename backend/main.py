@@ -1,45 +1,122 @@
-from fastapi import FastAPI
-from backend.core.database import initialize_database
+import re
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from backend.core.admission import AdmissionMiddleware
+from backend.core.config import settings
+from backend.core.database import initialize_database, init_async_engine
+from backend.core.idempotency import IdempotencyMiddleware
+from backend.core.metrics import MetricsMiddleware
+from backend.core.serialization import FastJSONResponse
+from backend.core.validation import InvariantError, invariant_error_response
+from backend.core.tenancy import LocationMiddleware
+from backend.services.jobs import job_runner
 from backend.routes.address_history import router as address_history_router
+from backend.routes.analytics import router as analytics_router
 from backend.routes.client import router as client_router
 from backend.routes.deliver import router as deliver_router
 from backend.routes.delivery import router as delivery_router
 from backend.routes.dish import router as dish_router
 from backend.routes.employment_contract import router as employment_contract_router
 from backend.routes.ingredient import router as ingredient_router
+from backend.routes.jobs import router as jobs_router
+from backend.routes.menu import router as menu_router
+from backend.routes.metrics import router as metrics_router
 from backend.routes.order import router as order_router
 from backend.routes.person import router as person_router
 from backend.routes.reservation import router as reservation_router
 from backend.routes.restaurant_employee import router as restaurant_employee_router
+from backend.routes.search import router as search_router
+from backend.routes.stock import router as stock_router
 from backend.routes.table import router as table_router
 
+sync_routers = [
+    address_history_router,
+    analytics_router,
+    client_router,
+    deliver_router,
+    delivery_router,
+    dish_router,
+    employment_contract_router,
+    ingredient_router,
+    jobs_router,
+    menu_router,
+    order_router,
+    person_router,
+    reservation_router,
+    restaurant_employee_router,
+    search_router,
+    stock_router,
+    table_router,
+]
+
+# Route identity ignoring path parameter names: ("GET", "/order/{}")
+def route_keys(route):
+    path = re.sub(r"\{[^}]+\}", "{}", route.path)
+    return {(method, path) for method in route.methods}
+
+# Register the routers; in async mode the async CRUD routes replace their sync counterparts
+# and only the sync routes without an async equivalent stay mounted. Those are mounted first:
+# static paths such as /order/kitchen and /reservation/availability would otherwise be matched
+# by the async /{record_id} routes.
+def include_routers(app, async_routes):
+    if not async_routes:
+        for router in sync_routers:
+            app.include_router(router)
+        return
+
+    from backend.routes.async_crud import routers as async_routers
+
+    served = set()
+    for router in async_routers:
+        for route in router.routes:
+            served |= route_keys(route)
+    for router in sync_routers:
+        remaining = APIRouter()
+        remaining.routes.extend(route for route in router.routes if not route_keys(route) & served)
+        app.include_router(remaining)
+    for router in async_routers:
+        app.include_router(router)
+
+# Build the FastAPI application
+def create_app(async_routes: bool = settings.async_routes) -> FastAPI:
+    app = FastAPI(
+        title="Restaurant Management System",
+        description="An API for managing restaurant operations including employees, orders, and deliveries.",
+        version="1.0.0",
+        default_response_class=FastJSONResponse if settings.fast_responses else JSONResponse,
+    )
+    include_routers(app, async_routes)
+    app.add_exception_handler(InvariantError, invariant_error_response)
+    # Added first so that they run inside LocationMiddleware
+    app.add_middleware(IdempotencyMiddleware)
+    if settings.write_concurrency:
+        app.add_middleware(AdmissionMiddleware)
+    if settings.locations:
+        app.add_middleware(LocationMiddleware, locations=settings.locations)
+    if settings.metrics:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
+
+    # On application startup, initialize the database
+    @app.on_event("startup")
+    def startup_event():
+        initialize_database()
+        if async_routes:
+            init_async_engine()
+        print("Database initialized successfully.")
+        job_runner.start()
+
+    # Let the background jobs in progress finish
+    @app.on_event("shutdown")
+    def shutdown_event():
+        job_runner.stop()
+
+    # Simple health check endpoint
+    @app.get("/", tags=["Health Check"])
+    def health_check():
+        return {"status": "running", "message": "Welcome to the Restaurant Management System API!"}
+
+    return app
+
 # Initialize FastAPI application
-app = FastAPI(
-    title="Restaurant Management System",
-    description="An API for managing restaurant operations including employees, orders, and deliveries.",
-    version="1.0.0",
-)
-
-app.include_router(address_history_router)
-app.include_router(client_router)
-app.include_router(deliver_router)
-app.include_router(delivery_router)
-app.include_router(dish_router)
-app.include_router(employment_contract_router)
-app.include_router(ingredient_router)
-app.include_router(order_router)
-app.include_router(person_router)
-app.include_router(reservation_router)
-app.include_router(restaurant_employee_router)
-app.include_router(table_router)
-
-# On application startup, initialize the database
-@app.on_event("startup")
-def startup_event():
-    initialize_database()
-    print("Database initialized successfully.")
-
-# Simple health check endpoint
-@app.get("/", tags=["Health Check"])
-def health_check():
-    return {"status": "running", "message": "Welcome to the Restaurant Management System API!"}
+app = create_app()
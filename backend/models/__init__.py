@@ -6,10 +6,27 @@ from backend.models.address_history import AddressHistory
 from backend.models.dish import Dish
 from backend.models.employment_contract import EmploymentContract
 from backend.models.ingredient import Ingredient
-from backend.models.order import Order
+from backend.models.order import Order, OrderNumberSequence
 from backend.models.reservation import Reservation
 from backend.models.table import Table
 from backend.models.delivery import Delivery  # Dodana klasa Delivery
+from backend.models.stock import StockMovement, StockLevel
+from backend.models.sales import Sale, SaleDish, SalesRollup, DishSalesRollup
+from backend.models.idempotency import IdempotencyKey
+from backend.models.job import Job
+
+# Flush-time validation of the models lives in the service layer; importing the modules
+# registers their validators
+import backend.services.address_history  # noqa: E402,F401
+import backend.services.client  # noqa: E402,F401
+import backend.services.deliver  # noqa: E402,F401
+import backend.services.delivery  # noqa: E402,F401
+import backend.services.dish  # noqa: E402,F401
+import backend.services.employment_contract  # noqa: E402,F401
+import backend.services.order  # noqa: E402,F401
+import backend.services.person  # noqa: E402,F401
+import backend.services.reservation  # noqa: E402,F401
+import backend.services.restaurant_employee  # noqa: E402,F401
 
 __all__ = [
     "Person",
@@ -21,7 +38,16 @@ __all__ = [
     "EmploymentContract",
     "Ingredient",
     "Order",
+    "OrderNumberSequence",
     "Reservation",
     "Table",
     "Delivery",  # Dodana klasa Delivery do listy eksportu
+    "StockMovement",
+    "StockLevel",
+    "Sale",
+    "SaleDish",
+    "SalesRollup",
+    "DishSalesRollup",
+    "IdempotencyKey",
+    "Job",
 ]
@@ -1,8 +1,6 @@
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
-from sqlalchemy import event
-from sqlalchemy.exc import IntegrityError
 
 class AddressHistory(Base):
     __tablename__ = "address_history"
@@ -14,20 +12,12 @@ class AddressHistory(Base):
     building_number = Column(String, nullable=False)
     floor = Column(Integer, nullable=True)
     staircase = Column(String, nullable=True)
-    client_id = Column(Integer, ForeignKey("client.id", ondelete="CASCADE"), nullable=False)  # Client required
+    client_id = Column(Integer, ForeignKey("client.id", ondelete="CASCADE"), nullable=False, index=True)  # Client required
 
     # Relationships
     client = relationship("Client", back_populates="address_history")
     orders = relationship(
         "Order",
         back_populates="address_history",
+        passive_deletes=True,
     )
-
-# Validation to ensure AddressHistory has a client
-def validate_address_history_client(mapper, connection, target):
-    if not target.client_id:
-        raise IntegrityError(None, None, "An address history record must be associated with a client.")
-
-# Attach event listener to AddressHistory
-event.listen(AddressHistory, "before_insert", validate_address_history_client)
-event.listen(AddressHistory, "before_update", validate_address_history_client)
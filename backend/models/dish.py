@@ -1,15 +1,14 @@
 from sqlalchemy import Column, Integer, String, Float, Table, ForeignKey
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
-from sqlalchemy import event
-from sqlalchemy.exc import IntegrityError
 
 # Association table for Dish and Ingredient (Many-to-Many)
 dish_ingredient = Table(
     "dish_ingredient",
     Base.metadata,
     Column("dish_id", Integer, ForeignKey("dish.id", ondelete="CASCADE"), primary_key=True),
-    Column("ingredient_id", Integer, ForeignKey("ingredient.id", ondelete="CASCADE"), primary_key=True)
+    Column("ingredient_id", Integer, ForeignKey("ingredient.id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("quantity", Integer, nullable=True)  # Used per portion; NULL means DEFAULT_PORTION_QUANTITY
 )
 
 class Dish(Base):
@@ -25,20 +24,12 @@ class Dish(Base):
     orders = relationship(
         "Order",
         secondary="order_dish",  # Use the association table defined in order.py
-        back_populates="dishes"
+        back_populates="dishes",
+        passive_deletes=True,
     )  # Many-to-many with Order
     ingredients = relationship(
         "Ingredient",
         secondary=dish_ingredient,
         back_populates="dishes",
-        cascade="all, delete"  # Ensures cascading deletes in composition
+        passive_deletes=True,  # The database deletes the link rows; the ingredients stay
     )
-
-# Validation to ensure a dish has at least 2 ingredients
-def validate_dish_ingredients(mapper, connection, target):
-    if len(target.ingredients) < 2:
-        raise IntegrityError(None, None, "A dish must have at least 2 ingredients.")
-
-# Attach event listener to Dish
-event.listen(Dish, "before_insert", validate_dish_ingredients)
-event.listen(Dish, "before_update", validate_dish_ingredients)
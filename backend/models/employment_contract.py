@@ -2,8 +2,6 @@ from sqlalchemy import Column, Integer, ForeignKey, Date, Float, Enum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.core.database import Base
-from sqlalchemy import event
-from sqlalchemy.exc import IntegrityError
 from enum import Enum as PyEnum
 
 # Enum for positions
@@ -21,16 +19,7 @@ class EmploymentContract(Base):
     end_date = Column(Date, nullable=True)
     salary = Column(Float, nullable=False)
     position = Column(Enum(Position), nullable=False)
-    employee_id = Column(Integer, ForeignKey("restaurant_employee.id", ondelete="CASCADE"), nullable=False)
+    employee_id = Column(Integer, ForeignKey("restaurant_employee.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Relationships
     restaurant_employee = relationship("RestaurantEmployee", back_populates="employment_contract")
-
-# Validation to ensure an EmploymentContract is always linked to a RestaurantEmployee
-def validate_employment_contract_employee(mapper, connection, target):
-    if not target.employee_id:
-        raise IntegrityError(None, None, "An EmploymentContract must be associated with a RestaurantEmployee.")
-
-# Attach event listener to EmploymentContract
-event.listen(EmploymentContract, "before_insert", validate_employment_contract_employee)
-event.listen(EmploymentContract, "before_update", validate_employment_contract_employee)
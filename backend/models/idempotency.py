@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from backend.core.database import Base
+
+# Response stored for an Idempotency-Key, replayed when a client retries the same request.
+# status_code is NULL while the first request is still being served.
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_key"
+
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
@@ -21,10 +21,11 @@ class Ingredient(Base):
         "Dish",
         secondary="dish_ingredient",
         back_populates="ingredients",
-        cascade="all, delete"  # Ensures cascading deletes for composition
+        passive_deletes=True,  # The database deletes the link rows; the dishes stay
     )
     deliveries = relationship(
         "Delivery",
         secondary="delivery_ingredient",
-        back_populates="ingredients"
+        back_populates="ingredients",
+        passive_deletes=True,
     )
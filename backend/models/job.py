@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, Index
+from backend.core.database import Base
+from enum import Enum as PyEnum
+
+# Lifecycle of a background job
+class JobStatus(PyEnum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+# Deferred work run by the background workers. The queue lives in the database, so jobs
+# survive restarts; a running job whose lease has expired (its worker died) is picked up again.
+class Job(Base):
+    __tablename__ = "job"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    payload = Column(Text, nullable=False, default="{}")  # JSON keyword arguments of the task
+    key = Column(String, nullable=True, unique=True)  # Deduplicates jobs, e.g. one per periodic slot
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, default=datetime.now, nullable=False)
+    locked_until = Column(DateTime, nullable=True)
+    result = Column(Text, nullable=True)  # JSON returned by the task
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_status_run_at", "status", "run_at"),
+    )
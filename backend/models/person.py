@@ -1,8 +1,6 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
-from sqlalchemy import event
-from sqlalchemy.exc import IntegrityError
 
 class Person(Base):
     __tablename__ = "person"
@@ -13,21 +11,7 @@ class Person(Base):
     email = Column(String, unique=True, nullable=False)
     phone_number = Column(String, nullable=False)
 
-    # Relationships with composition
-    restaurant_employee = relationship("RestaurantEmployee", back_populates="person", cascade="all, delete")
-    client = relationship("Client", back_populates="person", cascade="all, delete")
-    deliver = relationship("Deliver", back_populates="person", cascade="all, delete")
-
-# Validation to ensure Person is associated with only one role
-def validate_person_roles(mapper, connection, target):
-    roles = [
-        bool(target.client),
-        bool(target.restaurant_employee),
-        bool(target.deliver)
-    ]
-    if sum(roles) > 1:
-        raise IntegrityError(None, None, "A person can only be associated with one role (Client, RestaurantEmployee, Deliver).")
-
-# Attach event listener to Person
-event.listen(Person, "before_insert", validate_person_roles)
-event.listen(Person, "before_update", validate_person_roles)
+    # Relationships with composition, deleted by the database's ON DELETE CASCADE
+    restaurant_employee = relationship("RestaurantEmployee", back_populates="person", cascade="all, delete", passive_deletes=True)
+    client = relationship("Client", back_populates="person", cascade="all, delete", passive_deletes=True)
+    deliver = relationship("Deliver", back_populates="person", cascade="all, delete", passive_deletes=True)
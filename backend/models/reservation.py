@@ -1,8 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Date, Table
+from sqlalchemy.orm import relationship, synonym
 from backend.core.database import Base
-from sqlalchemy import event
-from sqlalchemy.exc import IntegrityError
 from enum import Enum as PyEnum
 
 # Enum for reservation status
@@ -10,31 +8,34 @@ class ReservationStatus(PyEnum):
     placed = "placed"
     canceled = "canceled"
 
+# Association table for Reservation and Table (Many-to-Many): a table holds any number of
+# reservations, at different times
+reservation_table = Table(
+    "reservation_table",
+    Base.metadata,
+    Column("reservation_id", Integer, ForeignKey("reservation.id", ondelete="CASCADE"), primary_key=True),
+    Column("table_id", Integer, ForeignKey("table.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
 class Reservation(Base):
     __tablename__ = "reservation"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(Date, nullable=False)
+    date = Column(Date, nullable=False, index=True)
     hour = Column(String, nullable=False)
     number_of_people = Column(Integer, nullable=False)
     status = Column(Enum(ReservationStatus), nullable=False)
-    client_id = Column(Integer, ForeignKey("client.id", ondelete="CASCADE"), nullable=False)  # Client required
+    client_id = Column(Integer, ForeignKey("client.id", ondelete="CASCADE"), nullable=False, index=True)  # Client required
+
+    # Names used by the API schemas
+    reservation_date = synonym("date")
+    reservation_hour = synonym("hour")
 
     # Relationships
     client = relationship("Client", back_populates="reservations")
     tables = relationship(
         "Table",
-        back_populates="reservation",
-        cascade="all, delete-orphan"  # Ensures tables are unlinked if reservation is deleted
+        secondary=reservation_table,
+        back_populates="reservations",
+        passive_deletes=True,  # The database deletes the links (CASCADE)
     )
-
-# Validation to ensure Reservation has a client and at least one table
-def validate_reservation(mapper, connection, target):
-    if not target.client_id:
-        raise IntegrityError(None, None, "A reservation must be associated with a client.")
-    if not target.tables or len(target.tables) < 1:
-        raise IntegrityError(None, None, "A reservation must include at least one table.")
-
-# Attach event listener to Reservation
-event.listen(Reservation, "before_insert", validate_reservation)
-event.listen(Reservation, "before_update", validate_reservation)
@@ -1,8 +1,6 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Table
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
-from sqlalchemy import event
-from sqlalchemy.exc import IntegrityError
 from enum import Enum as PyEnum
 
 # Enum for roles
@@ -18,7 +16,7 @@ restaurant_employee_order = Table(
     "restaurant_employee_order",
     Base.metadata,
     Column("employee_id", Integer, ForeignKey("restaurant_employee.id", ondelete="CASCADE"), primary_key=True),
-    Column("order_id", Integer, ForeignKey("order.id", ondelete="CASCADE"), primary_key=True)
+    Column("order_id", Integer, ForeignKey("order.id", ondelete="CASCADE"), primary_key=True, index=True)
 )
 
 class RestaurantEmployee(Base):
@@ -27,22 +25,14 @@ class RestaurantEmployee(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     employee_identificator = Column(String, unique=True, nullable=False)
     role = Column(Enum(Role), nullable=False)
-    person_id = Column(Integer, ForeignKey("person.id", ondelete="CASCADE"), nullable=False)  # Ensure cascade delete
+    person_id = Column(Integer, ForeignKey("person.id", ondelete="CASCADE"), nullable=False, index=True)  # Ensure cascade delete
 
     # Relationships
     person = relationship("Person", back_populates="restaurant_employee")
-    employment_contract = relationship("EmploymentContract", back_populates="restaurant_employee", cascade="all, delete")
+    employment_contract = relationship("EmploymentContract", back_populates="restaurant_employee", cascade="all, delete", passive_deletes=True)
     orders = relationship(
         "Order",
         secondary=restaurant_employee_order,
-        back_populates="restaurant_employee"
+        back_populates="restaurant_employee",
+        passive_deletes=True,
     )
-
-# Validation to ensure a RestaurantEmployee is always linked to a Person
-def validate_restaurant_employee_person(mapper, connection, target):
-    if not target.person_id:
-        raise IntegrityError(None, None, "A RestaurantEmployee must be associated with a Person.")
-
-# Attach event listener to RestaurantEmployee
-event.listen(RestaurantEmployee, "before_insert", validate_restaurant_employee_person)
-event.listen(RestaurantEmployee, "before_update", validate_restaurant_employee_person)
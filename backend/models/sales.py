@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, Enum
+from backend.core.database import Base
+from backend.models.order import PaymentType, OrderType
+
+# What a paid order currently contributes to the rollups. Kept so an edited, reverted or
+# deleted order can take back exactly what it added. No foreign keys: the row has to outlive
+# the order until its contribution has been retracted.
+class Sale(Base):
+    __tablename__ = "sale"
+
+    order_id = Column(Integer, primary_key=True, autoincrement=False)
+    paid_at = Column(DateTime, nullable=False)
+    payment = Column(Enum(PaymentType), nullable=False)
+    takeaway_or_onsite = Column(Enum(OrderType), nullable=False)
+    items = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+# Per-dish part of a sale, priced after the dish discount at the time of the sale
+class SaleDish(Base):
+    __tablename__ = "sale_dish"
+
+    order_id = Column(Integer, primary_key=True, autoincrement=False)
+    dish_id = Column(Integer, primary_key=True, autoincrement=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+# Orders, items and revenue per hour, payment type and order type
+class SalesRollup(Base):
+    __tablename__ = "sales_rollup"
+
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True, autoincrement=False)
+    payment = Column(Enum(PaymentType), primary_key=True)
+    takeaway_or_onsite = Column(Enum(OrderType), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    items = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+# Portions sold and revenue per hour and dish
+class DishSalesRollup(Base):
+    __tablename__ = "dish_sales_rollup"
+
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True, autoincrement=False)
+    dish_id = Column(Integer, primary_key=True, autoincrement=False, index=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
@@ -0,0 +1,43 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Index
+from sqlalchemy.orm import relationship
+from backend.core.database import Base
+from enum import Enum as PyEnum
+
+# Enum for the source of a stock movement
+class StockMovementKind(PyEnum):
+    delivery = "delivery"
+    order = "order"
+    adjustment = "adjustment"
+
+# Ledger of stock changes; quantities are signed and in the ingredient's measurement unit
+class StockMovement(Base):
+    __tablename__ = "stock_movement"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ingredient_id = Column(Integer, ForeignKey("ingredient.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    kind = Column(Enum(StockMovementKind), nullable=False)
+    delivery_id = Column(Integer, ForeignKey("delivery.id", ondelete="SET NULL"), nullable=True, index=True)
+    order_id = Column(Integer, ForeignKey("order.id", ondelete="SET NULL"), nullable=True, index=True)
+    note = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    # Relationships
+    ingredient = relationship("Ingredient")
+
+    __table_args__ = (
+        Index("ix_stock_movement_ingredient_id_id", "ingredient_id", "id"),
+    )
+
+# Materialized on-hand balance of an ingredient: the sum of its movements, kept up to date
+# in the same transaction that posts them
+class StockLevel(Base):
+    __tablename__ = "stock_level"
+
+    ingredient_id = Column(Integer, ForeignKey("ingredient.id", ondelete="CASCADE"), primary_key=True)
+    on_hand = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+
+    # Relationships
+    ingredient = relationship("Ingredient")
@@ -8,7 +8,15 @@ class Table(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     number = Column(String, unique=True, nullable=False)
     number_of_seats = Column(Integer, nullable=False)
-    reservation_id = Column(Integer, ForeignKey("reservation.id", ondelete="SET NULL"), nullable=True)
+    # Single reservation link of the table API, kept for existing clients. Reservations hold
+    # their tables through reservation_table, which is what availability is computed from.
+    reservation_id = Column(Integer, ForeignKey("reservation.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
-    reservation = relationship("Reservation", back_populates="tables")
+    reservation = relationship("Reservation")
+    reservations = relationship(
+        "Reservation",
+        secondary="reservation_table",  # Use the association table defined in reservation.py
+        back_populates="tables",
+        passive_deletes=True,
+    )
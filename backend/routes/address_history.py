@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 from typing import List
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.address_history import AddressHistory as AddressHistoryModel
+from backend.models.client import Client as ClientModel
+from backend.services.deletion import delete_address_histories
 from backend.schemas.address_history import (
     AddressHistory,
     AddressHistoryCreate,
@@ -12,24 +18,28 @@ from backend.schemas.address_history import (
 
 router = APIRouter(prefix="/address-history", tags=["AddressHistory"])
 
+# ETag dependencies of the read endpoints
+address_history_etag = Depends(conditional_get(AddressHistoryModel))
+address_history_relations_etag = Depends(conditional_get(AddressHistoryModel, schema=AddressHistoryWithRelations))
+
 # Retrieve all records
-@router.get("/", response_model=List[AddressHistory])
-def get_all_address_histories(db: Session = Depends(get_db)):
-    return db.query(AddressHistoryModel).all()
+@router.get("/", response_model=List[AddressHistory], dependencies=[address_history_etag])
+def get_all_address_histories(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(AddressHistoryModel), AddressHistoryModel, AddressHistory, page, response)
 
 # Retrieve a specific record by ID
-@router.get("/{address_history_id}", response_model=AddressHistory)
-def get_address_history(address_history_id: int, db: Session = Depends(get_db)):
+@router.get("/{address_history_id}", response_model=AddressHistory, dependencies=[address_history_etag])
+def get_address_history(address_history_id: int, db: Session = Depends(get_read_db)):
     address_history = db.query(AddressHistoryModel).filter(AddressHistoryModel.id == address_history_id).first()
     if not address_history:
         raise HTTPException(status_code=404, detail="AddressHistory not found")
     return address_history
 
 # Retrieve a specific record with related objects
-@router.get("/{address_history_id}/details", response_model=AddressHistoryWithRelations)
-def get_address_history_with_relations(address_history_id: int, db: Session = Depends(get_db)):
+@router.get("/{address_history_id}/details", response_model=AddressHistoryWithRelations, dependencies=[address_history_relations_etag])
+def get_address_history_with_relations(address_history_id: int, db: Session = Depends(get_read_db)):
     address_history = (
-        db.query(AddressHistoryModel)
+        apply_loading_plan(db.query(AddressHistoryModel), AddressHistoryWithRelations)
         .filter(AddressHistoryModel.id == address_history_id)
         .first()
     )
@@ -40,6 +50,9 @@ def get_address_history_with_relations(address_history_id: int, db: Session = De
 # Create a new record
 @router.post("/", response_model=AddressHistory)
 def create_address_history(address_history: AddressHistoryCreate, db: Session = Depends(get_db)):
+    client = db.query(ClientModel).filter(ClientModel.id == address_history.client_id).first()
+    if not client:
+        raise HTTPException(status_code=400, detail="Invalid client ID")
     new_address_history = AddressHistoryModel(**address_history.dict())
     db.add(new_address_history)
     db.commit()
@@ -56,18 +69,29 @@ def update_address_history(
     address_history = db.query(AddressHistoryModel).filter(AddressHistoryModel.id == address_history_id).first()
     if not address_history:
         raise HTTPException(status_code=404, detail="AddressHistory not found")
+    if address_history_data.client_id:
+        client = db.query(ClientModel).filter(ClientModel.id == address_history_data.client_id).first()
+        if not client:
+            raise HTTPException(status_code=400, detail="Invalid client ID")
     for key, value in address_history_data.dict(exclude_unset=True).items():
         setattr(address_history, key, value)
     db.commit()
     db.refresh(address_history)
     return address_history
 
-# Delete a record by ID
+# Change scalar fields of an AddressHistory record with one UPDATE ... RETURNING
+@router.patch("/{address_history_id}", response_model=AddressHistory)
+def patch_address_history(address_history_id: int, address_history_data: AddressHistoryUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, AddressHistoryModel, AddressHistory, address_history_id, address_history_data.dict(exclude_unset=True), "AddressHistory not found")
+    db.commit()
+    return row_response(AddressHistoryModel, AddressHistory, record)
+
+# Delete a record by ID, together with the orders delivered to it
 @router.delete("/{address_history_id}", status_code=204)
 def delete_address_history(address_history_id: int, db: Session = Depends(get_db)):
-    address_history = db.query(AddressHistoryModel).filter(AddressHistoryModel.id == address_history_id).first()
-    if not address_history:
+    deleted = delete_address_histories(db, AddressHistoryModel.id == address_history_id)
+    if not deleted.ids:
         raise HTTPException(status_code=404, detail="AddressHistory not found")
-    db.delete(address_history)
     db.commit()
+    deleted.forget()
     return None
@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.models.dish import Dish as DishModel
+from backend.models.job import Job as JobModel
+from backend.models.sales import SalesRollup as SalesRollupModel, DishSalesRollup as DishSalesRollupModel
+from backend.services.analytics import date_range, dish_sales, sales_series, sales_summary
+from backend.services.jobs import enqueue
+from backend.schemas.analytics import DishSales, SalesBucket, SalesSummary
+from backend.schemas.job import Job
+import backend.services.tasks  # noqa: F401
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+)
+
+# ETag dependencies of the read endpoints
+sales_etag = Depends(conditional_get(SalesRollupModel))
+dish_sales_etag = Depends(conditional_get(DishSalesRollupModel, DishModel))
+
+# Start and end day of a dashboard query (both inclusive, defaults to the last 30 days)
+def sales_range(
+    start: Optional[date] = Query(None, title="First Day"),
+    end: Optional[date] = Query(None, title="Last Day"),
+):
+    return date_range(start, end)
+
+# Get order count, revenue, average order value and payment/order type mix
+@router.get("/summary", response_model=SalesSummary, dependencies=[sales_etag])
+def get_sales_summary(days: tuple = Depends(sales_range), db: Session = Depends(get_read_db)):
+    return sales_summary(db, *days)
+
+# Get sales per day or per hour
+@router.get("/sales", response_model=list[SalesBucket], dependencies=[sales_etag])
+def get_sales(
+    granularity: Literal["day", "hour"] = Query("day", title="Bucket Size"),
+    days: tuple = Depends(sales_range),
+    db: Session = Depends(get_read_db),
+):
+    return sales_series(db, *days, by_hour=granularity == "hour")
+
+# Get portions sold and revenue per dish, in total or per day/hour
+@router.get("/dishes", response_model=list[DishSales], dependencies=[dish_sales_etag])
+def get_dish_sales(
+    granularity: Literal["total", "day", "hour"] = Query("total", title="Bucket Size"),
+    days: tuple = Depends(sales_range),
+    db: Session = Depends(get_read_db),
+):
+    return dish_sales(db, *days, granularity=granularity)
+
+# Recompute the rollups from the orders in a background job (sales.rebuild); poll /jobs/{id}
+@router.post("/rebuild", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def rebuild_sales_rollups(db: Session = Depends(get_db)):
+    job_id = enqueue(db, "sales.rebuild")
+    db.commit()
+    return db.query(JobModel).filter(JobModel.id == job_id).first()
@@ -0,0 +1,416 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.core.database import get_async_db, get_async_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import loader_options
+from backend.core.pagination import PageParams, paginate_async
+from backend.core.patch import conflict_error, patch_record_async, row_response
+from backend.models.address_history import AddressHistory as AddressHistoryModel
+from backend.models.client import Client as ClientModel
+from backend.models.deliver import Deliver as DeliverModel
+from backend.models.delivery import Delivery as DeliveryModel, delivery_ingredient
+from backend.models.dish import Dish as DishModel, dish_ingredient
+from backend.models.employment_contract import EmploymentContract as EmploymentContractModel
+from backend.models.ingredient import Ingredient as IngredientModel
+from backend.models.order import Order as OrderModel
+from backend.models.person import Person as PersonModel
+from backend.models.reservation import Reservation as ReservationModel
+from backend.models.restaurant_employee import RestaurantEmployee as RestaurantEmployeeModel
+from backend.models.table import Table as TableModel
+from backend.schemas import (
+    address_history,
+    client,
+    deliver,
+    delivery,
+    dish,
+    employment_contract,
+    ingredient,
+    order,
+    person,
+    reservation,
+    restaurant_employee,
+    table,
+)
+from backend.services.analytics import SALE_FIELDS, SALE_PAYLOAD_FIELDS, stamp_paid_at, sync_order_sales
+from backend.services.availability import availability
+from backend.services.deletion import delete_address_histories, delete_clients, delete_orders, delete_people, delete_reservations
+from backend.services.kitchen import kitchen_queue
+from backend.services.menu import menu_snapshot
+from backend.services.order_numbers import assign_order_number
+from backend.services.stock import set_link_quantities, sync_delivery_stock, sync_order_stock
+
+
+# Relationship populated from a list of IDs in the create/update payload (e.g. Order.dish_ids)
+class RelatedIds:
+    def __init__(self, field, attribute, model, detail, min_count=0, min_detail=None):
+        self.field = field
+        self.attribute = attribute
+        self.model = model
+        self.detail = detail
+        self.min_count = min_count
+        self.min_detail = min_detail
+
+
+# Foreign key that must point at an existing record (e.g. Reservation.client_id)
+class Reference:
+    def __init__(self, field, model, detail):
+        self.field = field
+        self.model = model
+        self.detail = detail
+
+
+# Fetch the records listed in a payload field, with the same validation as the sync routes
+async def resolve_related(db: AsyncSession, spec: RelatedIds, ids):
+    records = (await db.scalars(select(spec.model).where(spec.model.id.in_(ids)))).all()
+    if len(records) != len(ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=spec.detail)
+    if len(records) < spec.min_count:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=spec.min_detail)
+    return records
+
+
+async def check_reference(db: AsyncSession, spec: Reference, value):
+    if value and await db.get(spec.model, value) is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=spec.detail)
+
+
+# Keep the in-memory services in step with writes made through the async routes.
+# after_save receives the record and the related records resolved from the payload.
+def record_reservation(record, related):
+    tables = related.get("tables")
+    table_ids = [table.id for table in tables] if tables is not None else None
+    availability.record(record.id, record.date, record.hour, record.status, table_ids)
+
+
+# PATCH hooks receive the returned row, whose keys are the read schema's field names
+def record_patched_reservation(row):
+    availability.record(row.id, row.reservation_date, row.reservation_hour, row.status)
+
+
+def publish_order(record, related=None):
+    kitchen_queue.publish(record)
+
+
+def clear_availability(*args):
+    availability.clear()
+
+
+# Looked up per call: menu_snapshot is a per-location service
+def invalidate_menu(*args):
+    menu_snapshot.invalidate()
+
+
+# Stock and sales postings run in the write's own transaction (before_commit receives the sync
+# session, the record ID and the payload)
+def delivery_stock(session, record_id, payload):
+    set_link_quantities(session, delivery_ingredient, "delivery_id", record_id, payload.ingredient_quantities)
+    sync_delivery_stock(session, record_id)
+
+
+def dish_quantities(session, record_id, payload):
+    set_link_quantities(session, dish_ingredient, "dish_id", record_id, payload.ingredient_quantities)
+
+
+def order_postings(session, record_id, payload):
+    sync_order_stock(session, record_id)
+    # A create always sets the sale fields; a PUT without them leaves the sale as it is
+    if SALE_PAYLOAD_FIELDS & payload.dict(exclude_unset=True).keys():
+        sync_order_sales(session, record_id)
+
+
+# before_patch receives the sync session, the record ID and the patched values
+def delivery_patch_stock(session, record_id, values):
+    if "delivery_status" in values:
+        sync_delivery_stock(session, record_id)
+
+
+def order_patch_sales(session, record_id, values):
+    if SALE_FIELDS & values.keys():
+        sync_order_sales(session, record_id)
+
+
+# Build an async router exposing the same CRUD endpoints as the sync router for an entity
+def build_async_router(
+    prefix,
+    tags,
+    model,
+    schema,
+    create_schema,
+    update_schema,
+    relations_schema,
+    not_found,
+    relations_path="/{record_id}/with-relations",
+    create_status=status.HTTP_201_CREATED,
+    related=(),
+    references=(),
+    payload_only=(),
+    create_values=None,
+    before_commit=None,
+    delete_records=None,
+    after_save=None,
+    after_delete=None,
+    patch_schema=None,
+    patch_values=None,
+    before_patch=None,
+    after_patch=None,
+):
+    router = APIRouter(prefix=prefix, tags=tags)
+    patch_schema = patch_schema or update_schema
+    related_fields = {spec.field for spec in related}
+    payload_only = set(payload_only)
+
+    # A write colliding with a unique constraint (e.g. a taken order number) is a 409
+    async def commit(db: AsyncSession, record, payload):
+        try:
+            if before_commit:
+                await db.flush()
+                await db.run_sync(before_commit, record.id, payload)
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise conflict_error()
+
+    async def get_record(db: AsyncSession, record_id: int):
+        record = await db.get(model, record_id)
+        if not record:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return record
+
+    record_etag = Depends(conditional_get(model))
+    relations_etag = Depends(conditional_get(model, schema=relations_schema))
+
+    # Get all records
+    @router.get("/", response_model=list[schema], dependencies=[record_etag])
+    async def get_all(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_async_read_db)):
+        return await paginate_async(db, model, schema, page, response)
+
+    # Get a specific record by ID
+    @router.get("/{record_id}", response_model=schema, dependencies=[record_etag])
+    async def get_one(record_id: int, db: AsyncSession = Depends(get_async_read_db)):
+        return await get_record(db, record_id)
+
+    # Get a record with all related objects, eager-loaded by the schema's loading plan
+    @router.get(relations_path, response_model=relations_schema, dependencies=[relations_etag])
+    async def get_with_relations(record_id: int, db: AsyncSession = Depends(get_async_read_db)):
+        statement = (
+            select(model)
+            .options(*loader_options(model, relations_schema))
+            .where(model.id == record_id)
+        )
+        record = (await db.execute(statement)).unique().scalar_one_or_none()
+        if not record:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return record
+
+    # Create a new record
+    @router.post("/", response_model=schema, status_code=create_status)
+    async def create(payload: create_schema, db: AsyncSession = Depends(get_async_db)):
+        values = payload.dict(exclude=payload_only)
+        for spec in references:
+            await check_reference(db, spec, values.get(spec.field))
+        resolved = {}
+        for spec in related:
+            resolved[spec.attribute] = await resolve_related(db, spec, values.pop(spec.field))
+        if create_values:
+            # Runs once the payload is validated and before anything is written (e.g. a block
+            # of order numbers is reserved on a second connection)
+            await db.run_sync(create_values, values)
+        record = model(**values, **resolved)
+        db.add(record)
+        await commit(db, record, payload)
+        await db.refresh(record)
+        if after_save:
+            after_save(record, resolved)
+        return record
+
+    # Update an existing record
+    @router.put("/{record_id}", response_model=schema)
+    async def update(record_id: int, payload: update_schema, db: AsyncSession = Depends(get_async_db)):
+        record = await get_record(db, record_id)
+        values = payload.dict(exclude_unset=True, exclude=payload_only)
+        for spec in references:
+            await check_reference(db, spec, values.get(spec.field))
+        resolved = {}
+        for spec in related:
+            ids = values.get(spec.field)
+            if ids:
+                # Relationship collections are replaced wholesale, so load the current one first
+                await db.refresh(record, [spec.attribute])
+                resolved[spec.attribute] = await resolve_related(db, spec, ids)
+                setattr(record, spec.attribute, resolved[spec.attribute])
+        for key, value in values.items():
+            if key not in related_fields:
+                setattr(record, key, value)
+        await commit(db, record, payload)
+        await db.refresh(record)
+        if after_save:
+            after_save(record, resolved)
+        return record
+
+    # Change scalar fields with one UPDATE ... RETURNING (patch_values may add derived columns,
+    # after_patch receives the returned row)
+    @router.patch("/{record_id}", response_model=schema)
+    async def patch(record_id: int, payload: patch_schema, db: AsyncSession = Depends(get_async_db)):
+        values = payload.dict(exclude_unset=True, exclude=related_fields | payload_only)
+        if patch_values:
+            values = patch_values(values)
+        row = await patch_record_async(db, model, schema, record_id, values, not_found)
+        if before_patch:
+            await db.run_sync(before_patch, record_id, values)
+        await db.commit()
+        if after_patch:
+            after_patch(row)
+        return row_response(model, schema, row)
+
+    # Delete a record by ID. delete_records is a set-based delete from services.deletion,
+    # run on the sync session with the record's condition.
+    @router.delete("/{record_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete(record_id: int, db: AsyncSession = Depends(get_async_db)):
+        if delete_records:
+            deleted = await db.run_sync(delete_records, model.id == record_id)
+            if not deleted.ids:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+            await db.commit()
+            deleted.forget()
+            return
+        record = await get_record(db, record_id)
+        await db.delete(record)
+        await db.commit()
+        if after_delete:
+            after_delete(record_id)
+        return
+
+    return router
+
+
+routers = [
+    build_async_router(
+        "/address-history", ["AddressHistory"], AddressHistoryModel,
+        address_history.AddressHistory, address_history.AddressHistoryCreate,
+        address_history.AddressHistoryUpdate, address_history.AddressHistoryWithRelations,
+        not_found="AddressHistory not found",
+        references=[Reference("client_id", ClientModel, "Invalid client ID")],
+        relations_path="/{record_id}/details",
+        create_status=status.HTTP_200_OK,
+        delete_records=delete_address_histories,
+    ),
+    build_async_router(
+        "/clients", ["Clients"], ClientModel,
+        client.Client, client.ClientCreate, client.ClientUpdate, client.ClientWithRelations,
+        not_found="Client not found",
+        references=[Reference("person_id", PersonModel, "Invalid Person ID")],
+        relations_path="/{record_id}/details",
+        create_status=status.HTTP_200_OK,
+        delete_records=delete_clients,
+    ),
+    build_async_router(
+        "/deliver", ["Deliver"], DeliverModel,
+        deliver.Deliver, deliver.DeliverCreate, deliver.DeliverUpdate, deliver.DeliverWithRelations,
+        not_found="Deliver not found",
+        references=[Reference("person_id", PersonModel, "Invalid Person ID")],
+    ),
+    build_async_router(
+        "/delivery", ["Delivery"], DeliveryModel,
+        delivery.Delivery, delivery.DeliveryCreate, delivery.DeliveryUpdate, delivery.DeliveryWithRelations,
+        not_found="Delivery not found",
+        references=[Reference("deliver_id", DeliverModel, "Invalid Deliver ID")],
+        related=[RelatedIds("ingredient_ids", "ingredients", IngredientModel, "One or more Ingredient IDs are invalid")],
+        payload_only=["ingredient_quantities"],
+        before_commit=delivery_stock,
+        patch_schema=delivery.DeliveryPatch,
+        before_patch=delivery_patch_stock,
+    ),
+    build_async_router(
+        "/dish", ["Dish"], DishModel,
+        dish.Dish, dish.DishCreate, dish.DishUpdate, dish.DishWithRelations,
+        not_found="Dish not found",
+        related=[RelatedIds("ingredient_ids", "ingredients", IngredientModel, "One or more Ingredient IDs are invalid")],
+        payload_only=["ingredient_quantities"],
+        before_commit=dish_quantities,
+        after_save=invalidate_menu,
+        after_delete=invalidate_menu,
+        patch_schema=dish.DishPatch,
+        after_patch=invalidate_menu,
+    ),
+    build_async_router(
+        "/employment_contract", ["EmploymentContract"], EmploymentContractModel,
+        employment_contract.EmploymentContract, employment_contract.EmploymentContractCreate,
+        employment_contract.EmploymentContractUpdate, employment_contract.EmploymentContractWithRelations,
+        not_found="Employment contract not found",
+        references=[Reference("employee_id", RestaurantEmployeeModel, "Invalid Employee ID")],
+    ),
+    build_async_router(
+        "/ingredient", ["Ingredient"], IngredientModel,
+        ingredient.Ingredient, ingredient.IngredientCreate, ingredient.IngredientUpdate,
+        ingredient.IngredientWithRelations,
+        not_found="Ingredient not found",
+        after_save=invalidate_menu,
+        after_delete=invalidate_menu,
+        after_patch=invalidate_menu,
+    ),
+    build_async_router(
+        "/order", ["Order"], OrderModel,
+        order.Order, order.OrderCreate, order.OrderUpdate, order.OrderWithRelations,
+        not_found="Order not found",
+        references=[
+            Reference("client_id", ClientModel, "Invalid client ID"),
+            Reference("address_history_id", AddressHistoryModel, "Invalid address history ID"),
+        ],
+        related=[
+            RelatedIds("dish_ids", "dishes", DishModel, "Invalid dish IDs"),
+            RelatedIds(
+                "restaurant_employee_ids", "restaurant_employee", RestaurantEmployeeModel, "Invalid employee IDs",
+                min_count=2, min_detail="An order must have at least two employees",
+            ),
+        ],
+        create_values=assign_order_number,
+        before_commit=order_postings,
+        delete_records=delete_orders,
+        after_save=publish_order,
+        patch_schema=order.OrderPatch,
+        patch_values=stamp_paid_at,
+        before_patch=order_patch_sales,
+        after_patch=publish_order,
+    ),
+    build_async_router(
+        "/person", ["Person"], PersonModel,
+        person.Person, person.PersonCreate, person.PersonUpdate, person.PersonWithRelations,
+        not_found="Person not found",
+        delete_records=delete_people,
+    ),
+    build_async_router(
+        "/reservation", ["Reservation"], ReservationModel,
+        reservation.Reservation, reservation.ReservationCreate, reservation.ReservationUpdate,
+        reservation.ReservationWithRelations,
+        not_found="Reservation not found",
+        references=[Reference("client_id", ClientModel, "Invalid client ID")],
+        related=[
+            RelatedIds(
+                "table_ids", "tables", TableModel, "Invalid table IDs",
+                min_count=1, min_detail="A reservation must include at least one table",
+            ),
+        ],
+        delete_records=delete_reservations,
+        after_save=record_reservation,
+        patch_schema=reservation.ReservationPatch,
+        after_patch=record_patched_reservation,
+    ),
+    build_async_router(
+        "/restaurant_employee", ["Restaurant Employee"], RestaurantEmployeeModel,
+        restaurant_employee.RestaurantEmployee, restaurant_employee.RestaurantEmployeeCreate,
+        restaurant_employee.RestaurantEmployeeUpdate, restaurant_employee.RestaurantEmployeeWithRelations,
+        not_found="Restaurant Employee not found",
+        references=[Reference("person_id", PersonModel, "Invalid Person ID")],
+    ),
+    build_async_router(
+        "/table", ["Table"], TableModel,
+        table.Table, table.TableCreate, table.TableUpdate, table.TableWithRelations,
+        not_found="Table not found",
+        references=[Reference("reservation_id", ReservationModel, "Invalid Reservation ID")],
+        after_save=clear_availability,
+        after_delete=clear_availability,
+        after_patch=clear_availability,
+    ),
+]
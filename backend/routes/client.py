@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 from typing import List
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.client import Client as ClientModel
+from backend.models.person import Person as PersonModel
+from backend.services.deletion import delete_clients
 from backend.schemas.client import (
     Client,
     ClientCreate,
@@ -12,23 +18,31 @@ from backend.schemas.client import (
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
+# ETag dependencies of the read endpoints
+client_etag = Depends(conditional_get(ClientModel))
+client_relations_etag = Depends(conditional_get(ClientModel, schema=ClientWithRelations))
+
 # Retrieve all clients
-@router.get("/", response_model=List[Client])
-def get_all_clients(db: Session = Depends(get_db)):
-    return db.query(ClientModel).all()
+@router.get("/", response_model=List[Client], dependencies=[client_etag])
+def get_all_clients(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(ClientModel), ClientModel, Client, page, response)
 
 # Retrieve a specific client by ID
-@router.get("/{client_id}", response_model=Client)
-def get_client(client_id: int, db: Session = Depends(get_db)):
+@router.get("/{client_id}", response_model=Client, dependencies=[client_etag])
+def get_client(client_id: int, db: Session = Depends(get_read_db)):
     client = db.query(ClientModel).filter(ClientModel.id == client_id).first()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     return client
 
 # Retrieve a specific client with related objects
-@router.get("/{client_id}/details", response_model=ClientWithRelations)
-def get_client_with_relations(client_id: int, db: Session = Depends(get_db)):
-    client = db.query(ClientModel).filter(ClientModel.id == client_id).first()
+@router.get("/{client_id}/details", response_model=ClientWithRelations, dependencies=[client_relations_etag])
+def get_client_with_relations(client_id: int, db: Session = Depends(get_read_db)):
+    client = (
+        apply_loading_plan(db.query(ClientModel), ClientWithRelations)
+        .filter(ClientModel.id == client_id)
+        .first()
+    )
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     return client
@@ -36,6 +50,9 @@ def get_client_with_relations(client_id: int, db: Session = Depends(get_db)):
 # Create a new client
 @router.post("/", response_model=Client)
 def create_client(client: ClientCreate, db: Session = Depends(get_db)):
+    person = db.query(PersonModel).filter(PersonModel.id == client.person_id).first()
+    if not person:
+        raise HTTPException(status_code=400, detail="Invalid Person ID")
     new_client = ClientModel(**client.dict())
     db.add(new_client)
     db.commit()
@@ -48,18 +65,29 @@ def update_client(client_id: int, client_data: ClientUpdate, db: Session = Depen
     client = db.query(ClientModel).filter(ClientModel.id == client_id).first()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
+    if client_data.person_id:
+        person = db.query(PersonModel).filter(PersonModel.id == client_data.person_id).first()
+        if not person:
+            raise HTTPException(status_code=400, detail="Invalid Person ID")
     for key, value in client_data.dict(exclude_unset=True).items():
         setattr(client, key, value)
     db.commit()
     db.refresh(client)
     return client
 
+# Change scalar fields of a client with one UPDATE ... RETURNING
+@router.patch("/{client_id}", response_model=Client)
+def patch_client(client_id: int, client_data: ClientUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, ClientModel, Client, client_id, client_data.dict(exclude_unset=True), "Client not found")
+    db.commit()
+    return row_response(ClientModel, Client, record)
+
 # Delete a client by ID
 @router.delete("/{client_id}", status_code=204)
 def delete_client(client_id: int, db: Session = Depends(get_db)):
-    client = db.query(ClientModel).filter(ClientModel.id == client_id).first()
-    if not client:
+    deleted = delete_clients(db, ClientModel.id == client_id)
+    if not deleted.ids:
         raise HTTPException(status_code=404, detail="Client not found")
-    db.delete(client)
     db.commit()
+    deleted.forget()
     return None
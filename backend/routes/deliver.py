@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.deliver import Deliver as DeliverModel
+from backend.models.person import Person as PersonModel
 from backend.schemas.deliver import DeliverCreate, DeliverUpdate, Deliver, DeliverWithRelations
 
 router = APIRouter(
@@ -9,14 +14,18 @@ router = APIRouter(
     tags=["Deliver"],
 )
 
+# ETag dependencies of the read endpoints
+deliver_etag = Depends(conditional_get(DeliverModel))
+deliver_relations_etag = Depends(conditional_get(DeliverModel, schema=DeliverWithRelations))
+
 # Get all Deliver records
-@router.get("/", response_model=list[Deliver])
-def get_all_delivers(db: Session = Depends(get_db)):
-    return db.query(DeliverModel).all()
+@router.get("/", response_model=list[Deliver], dependencies=[deliver_etag])
+def get_all_delivers(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(DeliverModel), DeliverModel, Deliver, page, response)
 
 # Get a specific Deliver record by ID
-@router.get("/{deliver_id}", response_model=Deliver)
-def get_deliver(deliver_id: int, db: Session = Depends(get_db)):
+@router.get("/{deliver_id}", response_model=Deliver, dependencies=[deliver_etag])
+def get_deliver(deliver_id: int, db: Session = Depends(get_read_db)):
     deliver = db.query(DeliverModel).filter(DeliverModel.id == deliver_id).first()
     if not deliver:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deliver not found")
@@ -25,6 +34,9 @@ def get_deliver(deliver_id: int, db: Session = Depends(get_db)):
 # Create a new Deliver record
 @router.post("/", response_model=Deliver, status_code=status.HTTP_201_CREATED)
 def create_deliver(deliver: DeliverCreate, db: Session = Depends(get_db)):
+    person = db.query(PersonModel).filter(PersonModel.id == deliver.person_id).first()
+    if not person:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Person ID")
     new_deliver = DeliverModel(**deliver.dict())
     db.add(new_deliver)
     db.commit()
@@ -37,12 +49,23 @@ def update_deliver(deliver_id: int, deliver: DeliverUpdate, db: Session = Depend
     db_deliver = db.query(DeliverModel).filter(DeliverModel.id == deliver_id).first()
     if not db_deliver:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deliver not found")
+    if deliver.person_id:
+        person = db.query(PersonModel).filter(PersonModel.id == deliver.person_id).first()
+        if not person:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Person ID")
     for key, value in deliver.dict(exclude_unset=True).items():
         setattr(db_deliver, key, value)
     db.commit()
     db.refresh(db_deliver)
     return db_deliver
 
+# Change scalar fields of a Deliver record with one UPDATE ... RETURNING
+@router.patch("/{deliver_id}", response_model=Deliver)
+def patch_deliver(deliver_id: int, deliver: DeliverUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, DeliverModel, Deliver, deliver_id, deliver.dict(exclude_unset=True), "Deliver not found")
+    db.commit()
+    return row_response(DeliverModel, Deliver, record)
+
 # Delete a Deliver record by ID
 @router.delete("/{deliver_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_deliver(deliver_id: int, db: Session = Depends(get_db)):
@@ -54,9 +77,13 @@ def delete_deliver(deliver_id: int, db: Session = Depends(get_db)):
     return
 
 # Get a Deliver record with all related objects
-@router.get("/{deliver_id}/with-relations", response_model=DeliverWithRelations)
-def get_deliver_with_relations(deliver_id: int, db: Session = Depends(get_db)):
-    deliver = db.query(DeliverModel).filter(DeliverModel.id == deliver_id).first()
+@router.get("/{deliver_id}/with-relations", response_model=DeliverWithRelations, dependencies=[deliver_relations_etag])
+def get_deliver_with_relations(deliver_id: int, db: Session = Depends(get_read_db)):
+    deliver = (
+        apply_loading_plan(db.query(DeliverModel), DeliverWithRelations)
+        .filter(DeliverModel.id == deliver_id)
+        .first()
+    )
     if not deliver:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deliver not found")
     return deliver
@@ -1,23 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.delivery import Delivery as DeliveryModel, delivery_ingredient
-from backend.schemas.delivery import DeliveryCreate, DeliveryUpdate, Delivery, DeliveryWithRelations
+from backend.models.deliver import Deliver as DeliverModel
+from backend.schemas.delivery import DeliveryCreate, DeliveryUpdate, DeliveryPatch, Delivery, DeliveryWithRelations
 from backend.models.ingredient import Ingredient as IngredientModel
+from backend.services.stock import set_link_quantities, sync_delivery_stock
 
 router = APIRouter(
     prefix="/delivery",
     tags=["Delivery"],
 )
 
+# ETag dependencies of the read endpoints
+delivery_etag = Depends(conditional_get(DeliveryModel))
+delivery_relations_etag = Depends(conditional_get(DeliveryModel, schema=DeliveryWithRelations))
+
 # Get all Delivery records
-@router.get("/", response_model=list[Delivery])
-def get_all_deliveries(db: Session = Depends(get_db)):
-    return db.query(DeliveryModel).all()
+@router.get("/", response_model=list[Delivery], dependencies=[delivery_etag])
+def get_all_deliveries(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(DeliveryModel), DeliveryModel, Delivery, page, response)
 
 # Get a specific Delivery record by ID
-@router.get("/{delivery_id}", response_model=Delivery)
-def get_delivery(delivery_id: int, db: Session = Depends(get_db)):
+@router.get("/{delivery_id}", response_model=Delivery, dependencies=[delivery_etag])
+def get_delivery(delivery_id: int, db: Session = Depends(get_read_db)):
     delivery = db.query(DeliveryModel).filter(DeliveryModel.id == delivery_id).first()
     if not delivery:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
@@ -26,6 +36,9 @@ def get_delivery(delivery_id: int, db: Session = Depends(get_db)):
 # Create a new Delivery record
 @router.post("/", response_model=Delivery, status_code=status.HTTP_201_CREATED)
 def create_delivery(delivery: DeliveryCreate, db: Session = Depends(get_db)):
+    deliver = db.query(DeliverModel).filter(DeliverModel.id == delivery.deliver_id).first()
+    if not deliver:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Deliver ID")
     ingredient_records = db.query(IngredientModel).filter(IngredientModel.id.in_(delivery.ingredient_ids)).all()
     if len(ingredient_records) != len(delivery.ingredient_ids):
         raise HTTPException(
@@ -33,12 +46,15 @@ def create_delivery(delivery: DeliveryCreate, db: Session = Depends(get_db)):
             detail="One or more Ingredient IDs are invalid"
         )
     new_delivery = DeliveryModel(
-        status=delivery.status,
-        date=delivery.date,
+        status=delivery.delivery_status,
+        date=delivery.delivery_date,
         deliver_id=delivery.deliver_id,
         ingredients=ingredient_records
     )
     db.add(new_delivery)
+    db.flush()
+    set_link_quantities(db, delivery_ingredient, "delivery_id", new_delivery.id, delivery.ingredient_quantities)
+    sync_delivery_stock(db, new_delivery.id)
     db.commit()
     db.refresh(new_delivery)
     return new_delivery
@@ -49,6 +65,10 @@ def update_delivery(delivery_id: int, delivery: DeliveryUpdate, db: Session = De
     db_delivery = db.query(DeliveryModel).filter(DeliveryModel.id == delivery_id).first()
     if not db_delivery:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
+    if delivery.deliver_id:
+        deliver = db.query(DeliverModel).filter(DeliverModel.id == delivery.deliver_id).first()
+        if not deliver:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Deliver ID")
     if delivery.ingredient_ids:
         ingredient_records = db.query(IngredientModel).filter(IngredientModel.id.in_(delivery.ingredient_ids)).all()
         if len(ingredient_records) != len(delivery.ingredient_ids):
@@ -58,12 +78,25 @@ def update_delivery(delivery_id: int, delivery: DeliveryUpdate, db: Session = De
             )
         db_delivery.ingredients = ingredient_records
     for key, value in delivery.dict(exclude_unset=True).items():
-        if key != "ingredient_ids":
+        if key not in {"ingredient_ids", "ingredient_quantities"}:
             setattr(db_delivery, key, value)
+    db.flush()
+    set_link_quantities(db, delivery_ingredient, "delivery_id", delivery_id, delivery.ingredient_quantities)
+    sync_delivery_stock(db, delivery_id)
     db.commit()
     db.refresh(db_delivery)
     return db_delivery
 
+# Change scalar fields of a Delivery record with one UPDATE ... RETURNING
+@router.patch("/{delivery_id}", response_model=Delivery)
+def patch_delivery(delivery_id: int, delivery: DeliveryPatch, db: Session = Depends(get_db)):
+    values = delivery.dict(exclude_unset=True)
+    record = patch_record(db, DeliveryModel, Delivery, delivery_id, values, "Delivery not found")
+    if "delivery_status" in values:
+        sync_delivery_stock(db, delivery_id)
+    db.commit()
+    return row_response(DeliveryModel, Delivery, record)
+
 # Delete a Delivery record by ID
 @router.delete("/{delivery_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_delivery(delivery_id: int, db: Session = Depends(get_db)):
@@ -75,9 +108,13 @@ def delete_delivery(delivery_id: int, db: Session = Depends(get_db)):
     return
 
 # Get a Delivery record with all related objects
-@router.get("/{delivery_id}/with-relations", response_model=DeliveryWithRelations)
-def get_delivery_with_relations(delivery_id: int, db: Session = Depends(get_db)):
-    delivery = db.query(DeliveryModel).filter(DeliveryModel.id == delivery_id).first()
+@router.get("/{delivery_id}/with-relations", response_model=DeliveryWithRelations, dependencies=[delivery_relations_etag])
+def get_delivery_with_relations(delivery_id: int, db: Session = Depends(get_read_db)):
+    delivery = (
+        apply_loading_plan(db.query(DeliveryModel), DeliveryWithRelations)
+        .filter(DeliveryModel.id == delivery_id)
+        .first()
+    )
     if not delivery:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
     return delivery
@@ -1,23 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.dish import Dish as DishModel, dish_ingredient
 from backend.models.ingredient import Ingredient as IngredientModel
-from backend.schemas.dish import DishCreate, DishUpdate, Dish, DishWithRelations
+from backend.schemas.bulk import BulkResult
+from backend.services.bulk import BulkBatch, bulk_transaction, existing_values, insert_many
+from backend.services.menu import menu_snapshot
+from backend.services.stock import set_link_quantities
+from backend.schemas.dish import DishCreate, DishUpdate, DishPatch, Dish, DishWithRelations
 
 router = APIRouter(
     prefix="/dish",
     tags=["Dish"],
 )
 
+# ETag dependencies of the read endpoints
+dish_etag = Depends(conditional_get(DishModel))
+dish_relations_etag = Depends(conditional_get(DishModel, schema=DishWithRelations))
+
 # Get all Dish records
-@router.get("/", response_model=list[Dish])
-def get_all_dishes(db: Session = Depends(get_db)):
-    return db.query(DishModel).all()
+@router.get("/", response_model=list[Dish], dependencies=[dish_etag])
+def get_all_dishes(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(DishModel), DishModel, Dish, page, response)
 
 # Get a specific Dish record by ID
-@router.get("/{dish_id}", response_model=Dish)
-def get_dish(dish_id: int, db: Session = Depends(get_db)):
+@router.get("/{dish_id}", response_model=Dish, dependencies=[dish_etag])
+def get_dish(dish_id: int, db: Session = Depends(get_read_db)):
     dish = db.query(DishModel).filter(DishModel.id == dish_id).first()
     if not dish:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
@@ -40,10 +52,45 @@ def create_dish(dish: DishCreate, db: Session = Depends(get_db)):
         ingredients=ingredient_records
     )
     db.add(new_dish)
+    db.flush()
+    set_link_quantities(db, dish_ingredient, "dish_id", new_dish.id, dish.ingredient_quantities)
     db.commit()
     db.refresh(new_dish)
+    menu_snapshot.invalidate()
     return new_dish
 
+# Create many Dish records in one transaction; ingredient IDs of the whole payload are resolved at once
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_dishes(rows: list[dict], db: Session = Depends(get_db)):
+    batch = BulkBatch()
+    dishes = batch.parse(DishCreate, rows)
+    known_ingredients = existing_values(
+        db, IngredientModel.id, [ingredient_id for _, dish in dishes for ingredient_id in dish.ingredient_ids]
+    )
+
+    ingredient_ids = []
+    for index, dish in dishes:
+        unique_ids = set(dish.ingredient_ids)
+        if not unique_ids <= known_ingredients:
+            batch.reject(index, "One or more Ingredient IDs are invalid")
+        elif len(unique_ids) < 2:
+            batch.reject(index, "A dish must have at least 2 ingredients.")
+        else:
+            batch.accept(index, dish.dict(exclude={"ingredient_ids", "ingredient_quantities"}))
+            ingredient_ids.append((sorted(unique_ids), dish.ingredient_quantities or {}))
+
+    with bulk_transaction(db):
+        ids = insert_many(db, DishModel, batch.rows)
+        links = [
+            {"dish_id": dish_id, "ingredient_id": ingredient_id, "quantity": quantities.get(ingredient_id)}
+            for dish_id, (dish_ingredient_ids, quantities) in zip(ids, ingredient_ids)
+            for ingredient_id in dish_ingredient_ids
+        ]
+        if links:
+            db.execute(dish_ingredient.insert(), links)
+    menu_snapshot.invalidate()
+    return batch.result(ids)
+
 # Update an existing Dish record
 @router.put("/{dish_id}", response_model=Dish)
 def update_dish(dish_id: int, dish: DishUpdate, db: Session = Depends(get_db)):
@@ -59,12 +106,23 @@ def update_dish(dish_id: int, dish: DishUpdate, db: Session = Depends(get_db)):
             )
         db_dish.ingredients = ingredient_records
     for key, value in dish.dict(exclude_unset=True).items():
-        if key != "ingredient_ids":
+        if key not in {"ingredient_ids", "ingredient_quantities"}:
             setattr(db_dish, key, value)
+    db.flush()
+    set_link_quantities(db, dish_ingredient, "dish_id", dish_id, dish.ingredient_quantities)
     db.commit()
     db.refresh(db_dish)
+    menu_snapshot.invalidate()
     return db_dish
 
+# Change scalar fields of a Dish record with one UPDATE ... RETURNING
+@router.patch("/{dish_id}", response_model=Dish)
+def patch_dish(dish_id: int, dish: DishPatch, db: Session = Depends(get_db)):
+    record = patch_record(db, DishModel, Dish, dish_id, dish.dict(exclude_unset=True), "Dish not found")
+    db.commit()
+    menu_snapshot.invalidate()
+    return row_response(DishModel, Dish, record)
+
 # Delete a Dish record by ID
 @router.delete("/{dish_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_dish(dish_id: int, db: Session = Depends(get_db)):
@@ -73,12 +131,17 @@ def delete_dish(dish_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
     db.delete(db_dish)
     db.commit()
+    menu_snapshot.invalidate()
     return
 
 # Get a Dish record with all related objects
-@router.get("/{dish_id}/with-relations", response_model=DishWithRelations)
-def get_dish_with_relations(dish_id: int, db: Session = Depends(get_db)):
-    dish = db.query(DishModel).filter(DishModel.id == dish_id).first()
+@router.get("/{dish_id}/with-relations", response_model=DishWithRelations, dependencies=[dish_relations_etag])
+def get_dish_with_relations(dish_id: int, db: Session = Depends(get_read_db)):
+    dish = (
+        apply_loading_plan(db.query(DishModel), DishWithRelations)
+        .filter(DishModel.id == dish_id)
+        .first()
+    )
     if not dish:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
     return dish
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.employment_contract import EmploymentContract as EmploymentContractModel
 from backend.models.restaurant_employee import RestaurantEmployee as RestaurantEmployeeModel
 from backend.schemas.employment_contract import (
@@ -15,14 +19,18 @@ router = APIRouter(
     tags=["EmploymentContract"],
 )
 
+# ETag dependencies of the read endpoints
+employment_contract_etag = Depends(conditional_get(EmploymentContractModel))
+employment_contract_relations_etag = Depends(conditional_get(EmploymentContractModel, schema=EmploymentContractWithRelations))
+
 # Get all EmploymentContract records
-@router.get("/", response_model=list[EmploymentContract])
-def get_all_employment_contracts(db: Session = Depends(get_db)):
-    return db.query(EmploymentContractModel).all()
+@router.get("/", response_model=list[EmploymentContract], dependencies=[employment_contract_etag])
+def get_all_employment_contracts(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(EmploymentContractModel), EmploymentContractModel, EmploymentContract, page, response)
 
 # Get a specific EmploymentContract record by ID
-@router.get("/{contract_id}", response_model=EmploymentContract)
-def get_employment_contract(contract_id: int, db: Session = Depends(get_db)):
+@router.get("/{contract_id}", response_model=EmploymentContract, dependencies=[employment_contract_etag])
+def get_employment_contract(contract_id: int, db: Session = Depends(get_read_db)):
     contract = db.query(EmploymentContractModel).filter(EmploymentContractModel.id == contract_id).first()
     if not contract:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employment contract not found")
@@ -63,6 +71,13 @@ def update_employment_contract(contract_id: int, contract: EmploymentContractUpd
     db.refresh(db_contract)
     return db_contract
 
+# Change scalar fields of an EmploymentContract record with one UPDATE ... RETURNING
+@router.patch("/{contract_id}", response_model=EmploymentContract)
+def patch_employment_contract(contract_id: int, contract: EmploymentContractUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, EmploymentContractModel, EmploymentContract, contract_id, contract.dict(exclude_unset=True), "Employment contract not found")
+    db.commit()
+    return row_response(EmploymentContractModel, EmploymentContract, record)
+
 # Delete an EmploymentContract record by ID
 @router.delete("/{contract_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_employment_contract(contract_id: int, db: Session = Depends(get_db)):
@@ -74,9 +89,13 @@ def delete_employment_contract(contract_id: int, db: Session = Depends(get_db)):
     return
 
 # Get an EmploymentContract record with all related objects
-@router.get("/{contract_id}/with-relations", response_model=EmploymentContractWithRelations)
-def get_employment_contract_with_relations(contract_id: int, db: Session = Depends(get_db)):
-    contract = db.query(EmploymentContractModel).filter(EmploymentContractModel.id == contract_id).first()
+@router.get("/{contract_id}/with-relations", response_model=EmploymentContractWithRelations, dependencies=[employment_contract_relations_etag])
+def get_employment_contract_with_relations(contract_id: int, db: Session = Depends(get_read_db)):
+    contract = (
+        apply_loading_plan(db.query(EmploymentContractModel), EmploymentContractWithRelations)
+        .filter(EmploymentContractModel.id == contract_id)
+        .first()
+    )
     if not contract:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employment contract not found")
     return contract
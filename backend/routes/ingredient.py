@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.ingredient import Ingredient as IngredientModel
+from backend.models.ingredient import Metric
+from backend.schemas.bulk import BulkResult
+from backend.services.bulk import BulkBatch, bulk_transaction, insert_many
+from backend.services.menu import menu_snapshot
 from backend.schemas.ingredient import (
     IngredientCreate,
     IngredientUpdate,
@@ -14,14 +22,18 @@ router = APIRouter(
     tags=["Ingredient"],
 )
 
+# ETag dependencies of the read endpoints
+ingredient_etag = Depends(conditional_get(IngredientModel))
+ingredient_relations_etag = Depends(conditional_get(IngredientModel, schema=IngredientWithRelations))
+
 # Get all Ingredient records
-@router.get("/", response_model=list[Ingredient])
-def get_all_ingredients(db: Session = Depends(get_db)):
-    return db.query(IngredientModel).all()
+@router.get("/", response_model=list[Ingredient], dependencies=[ingredient_etag])
+def get_all_ingredients(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(IngredientModel), IngredientModel, Ingredient, page, response)
 
 # Get a specific Ingredient record by ID
-@router.get("/{ingredient_id}", response_model=Ingredient)
-def get_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
+@router.get("/{ingredient_id}", response_model=Ingredient, dependencies=[ingredient_etag])
+def get_ingredient(ingredient_id: int, db: Session = Depends(get_read_db)):
     ingredient = db.query(IngredientModel).filter(IngredientModel.id == ingredient_id).first()
     if not ingredient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
@@ -40,6 +52,20 @@ def create_ingredient(ingredient: IngredientCreate, db: Session = Depends(get_db
     db.refresh(new_ingredient)
     return new_ingredient
 
+# Create many Ingredient records in one transaction
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_ingredients(ingredients: list[dict], db: Session = Depends(get_db)):
+    batch = BulkBatch()
+    for index, ingredient in batch.parse(IngredientCreate, ingredients):
+        if ingredient.metric not in Metric.__members__:
+            batch.reject(index, f"Invalid measurement unit '{ingredient.metric}'")
+            continue
+        batch.accept(index, ingredient.dict())
+
+    with bulk_transaction(db):
+        ids = insert_many(db, IngredientModel, batch.rows)
+    return batch.result(ids)
+
 # Update an existing Ingredient record
 @router.put("/{ingredient_id}", response_model=Ingredient)
 def update_ingredient(ingredient_id: int, ingredient: IngredientUpdate, db: Session = Depends(get_db)):
@@ -50,8 +76,17 @@ def update_ingredient(ingredient_id: int, ingredient: IngredientUpdate, db: Sess
         setattr(db_ingredient, key, value)
     db.commit()
     db.refresh(db_ingredient)
+    menu_snapshot.invalidate()
     return db_ingredient
 
+# Change scalar fields of an Ingredient record with one UPDATE ... RETURNING
+@router.patch("/{ingredient_id}", response_model=Ingredient)
+def patch_ingredient(ingredient_id: int, ingredient: IngredientUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, IngredientModel, Ingredient, ingredient_id, ingredient.dict(exclude_unset=True), "Ingredient not found")
+    db.commit()
+    menu_snapshot.invalidate()
+    return row_response(IngredientModel, Ingredient, record)
+
 # Delete an Ingredient record by ID
 @router.delete("/{ingredient_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
@@ -60,12 +95,17 @@ def delete_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
     db.delete(db_ingredient)
     db.commit()
+    menu_snapshot.invalidate()
     return
 
 # Get an Ingredient record with all related objects
-@router.get("/{ingredient_id}/with-relations", response_model=IngredientWithRelations)
-def get_ingredient_with_relations(ingredient_id: int, db: Session = Depends(get_db)):
-    ingredient = db.query(IngredientModel).filter(IngredientModel.id == ingredient_id).first()
+@router.get("/{ingredient_id}/with-relations", response_model=IngredientWithRelations, dependencies=[ingredient_relations_etag])
+def get_ingredient_with_relations(ingredient_id: int, db: Session = Depends(get_read_db)):
+    ingredient = (
+        apply_loading_plan(db.query(IngredientModel), IngredientWithRelations)
+        .filter(IngredientModel.id == ingredient_id)
+        .first()
+    )
     if not ingredient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
     return ingredient
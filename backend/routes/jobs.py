@@ -0,0 +1,51 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from sqlalchemy.orm import Session
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.pagination import NEXT_CURSOR_HEADER, PageParams, keyset
+from backend.models.job import Job as JobModel, JobStatus
+from backend.services.jobs import TASKS, enqueue
+from backend.schemas.job import Job, JobCreate
+import backend.services.tasks  # noqa: F401
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+)
+
+# ETag dependency of the read endpoints
+job_etag = Depends(conditional_get(JobModel))
+
+# Get background jobs, optionally only those in one status
+@router.get("/", response_model=list[Job], dependencies=[job_etag])
+def get_jobs(
+    response: Response,
+    job_status: Optional[JobStatus] = Query(None, alias="status", title="Job Status"),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
+):
+    query = db.query(JobModel)
+    if job_status is not None:
+        query = query.filter(JobModel.status == job_status)
+    jobs = keyset(query, JobModel, page.after, page.limit).all()
+    if len(jobs) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(jobs[-1].id)
+    return jobs
+
+# Get a background job, with its result once it has run
+@router.get("/{job_id}", response_model=Job, dependencies=[job_etag])
+def get_job(job_id: int, db: Session = Depends(get_read_db)):
+    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+# Enqueue a background job; it runs on a worker thread once due
+@router.post("/", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def create_job(job: JobCreate, db: Session = Depends(get_db)):
+    if job.name not in TASKS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown task, expected one of: {', '.join(sorted(TASKS))}")
+    job_id = enqueue(db, job.name, job.payload, run_at=job.run_at, max_attempts=job.max_attempts)
+    db.commit()
+    return db.query(JobModel).filter(JobModel.id == job_id).first()
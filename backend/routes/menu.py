@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.orm import Session
+from backend.core.database import get_read_db
+from backend.core.etag import conditional_get
+from backend.models.dish import Dish as DishModel
+from backend.schemas.dish import DishWithRelations
+from backend.schemas.menu import Menu
+from backend.services.menu import menu_snapshot
+
+router = APIRouter(
+    prefix="/menu",
+    tags=["Menu"],
+)
+
+# The menu is built from dishes, ingredients and the links between them
+menu_etag = Depends(conditional_get(DishModel, schema=DishWithRelations))
+
+# Get the menu: every dish with its ingredients and price after discount
+@router.get("/", response_model=Menu, dependencies=[menu_etag])
+def get_menu(response: Response, db: Session = Depends(get_read_db)):
+    return Response(content=menu_snapshot.get(db), media_type="application/json", headers=response.headers)
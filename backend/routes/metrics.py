@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from backend.core.admission import admission
+from backend.core.metrics import registry
+
+router = APIRouter(tags=["Metrics"])
+
+# Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Per-route latency, SQL statement count, database time and rows loaded, plus the write
+# admission queues
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(registry.render() + admission.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,12 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import conflict_error, patch_record, row_response
 from backend.models.order import Order as OrderModel
+from backend.models.address_history import AddressHistory as AddressHistoryModel
+from backend.models.client import Client as ClientModel
 from backend.models.dish import Dish as DishModel
 from backend.models.restaurant_employee import RestaurantEmployee as RestaurantEmployeeModel
+from backend.services.analytics import SALE_FIELDS, SALE_PAYLOAD_FIELDS, stamp_paid_at, sync_order_sales
+from backend.services.bulk import bulk_filter
+from backend.services.deletion import delete_orders
+from backend.services.stock import sync_order_stock
+from backend.services.kitchen import kitchen_queue, sse_event, HEARTBEAT_SECONDS
+from backend.services.order_numbers import order_numbers
+from backend.schemas.bulk import BulkDeleted
 from backend.schemas.order import (
+    OrderBulkDelete,
     OrderCreate,
     OrderUpdate,
+    OrderPatch,
     Order,
     OrderWithRelations,
 )
@@ -16,14 +36,71 @@ router = APIRouter(
     tags=["Order"],
 )
 
+# ETag dependencies of the read endpoints
+order_etag = Depends(conditional_get(OrderModel))
+order_relations_etag = Depends(conditional_get(OrderModel, schema=OrderWithRelations))
+
+# The client and address of an order must exist
+def check_order_references(db: Session, client_id: Optional[int], address_history_id: Optional[int]):
+    if client_id:
+        client = db.query(ClientModel).filter(ClientModel.id == client_id).first()
+        if not client:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid client ID")
+    if address_history_id:
+        address = db.query(AddressHistoryModel).filter(AddressHistoryModel.id == address_history_id).first()
+        if not address:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid address history ID")
+
 # Get all Order records
-@router.get("/", response_model=list[Order])
-def get_all_orders(db: Session = Depends(get_db)):
-    return db.query(OrderModel).all()
+@router.get("/", response_model=list[Order], dependencies=[order_etag])
+def get_all_orders(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(OrderModel), OrderModel, Order, page, response)
+
+# Get the active orders grouped by status, served from the in-memory kitchen queue
+@router.get("/kitchen", response_model=dict[str, list[dict]], dependencies=[order_etag])
+def get_kitchen_queue(db: Session = Depends(get_read_db)):
+    kitchen_queue.ensure_loaded(db)
+    return kitchen_queue.snapshot()
+
+# Stream order status transitions as server-sent events.
+# The first event is a snapshot of the queue; a "resync" event asks the client to reconnect.
+# The idle stream reloads the queue when it expires, and the session is closed after each
+# load so the stream does not hold a read transaction open.
+@router.get("/kitchen/stream")
+async def stream_kitchen_queue(request: Request, db: Session = Depends(get_read_db)):
+    def reload():
+        kitchen_queue.ensure_loaded(db)
+        db.close()
+
+    await run_in_threadpool(reload)
+    queue = kitchen_queue.subscribe()
+
+    async def events():
+        try:
+            yield sse_event("snapshot", kitchen_queue.snapshot())
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    await run_in_threadpool(reload)
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.get("resync"):
+                    yield sse_event("resync", {})
+                    break
+                yield f"id: {event['sequence']}\n" + sse_event("transition", event)
+        finally:
+            kitchen_queue.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # Get a specific Order record by ID
-@router.get("/{order_id}", response_model=Order)
-def get_order(order_id: int, db: Session = Depends(get_db)):
+@router.get("/{order_id}", response_model=Order, dependencies=[order_etag])
+def get_order(order_id: int, db: Session = Depends(get_read_db)):
     order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
@@ -46,10 +123,16 @@ def create_order(order: OrderCreate, db: Session = Depends(get_db)):
     if len(employees) < 2:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An order must have at least two employees")
 
+    check_order_references(db, order.client_id, order.address_history_id)
+
+    # Number the order on the server unless the client sent a number. Comes after the checks,
+    # so a rejected request does not use up a number, and before any change to the session.
+    number = order.number or order_numbers.next_number(db)
+
     # Create new order
     new_order = OrderModel(
         status=order.status,
-        number=order.number,
+        number=number,
         hour=order.hour,
         payment=order.payment,
         takeaway_or_onsite=order.takeaway_or_onsite,
@@ -61,8 +144,17 @@ def create_order(order: OrderCreate, db: Session = Depends(get_db)):
         restaurant_employee=employees,
     )
     db.add(new_order)
+    try:
+        db.flush()
+    except IntegrityError:
+        # Another order already has the number
+        db.rollback()
+        raise conflict_error()
+    sync_order_stock(db, new_order.id)
+    sync_order_sales(db, new_order.id)
     db.commit()
     db.refresh(new_order)
+    kitchen_queue.publish(new_order)
     return new_order
 
 # Update an existing Order record
@@ -88,28 +180,68 @@ def update_order(order_id: int, order: OrderUpdate, db: Session = Depends(get_db
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An order must have at least two employees")
         db_order.restaurant_employee = employees
 
-    for key, value in order.dict(exclude_unset=True).items():
+    check_order_references(db, order.client_id, order.address_history_id)
+
+    values = order.dict(exclude_unset=True)
+    for key, value in values.items():
         if key not in {"dish_ids", "restaurant_employee_ids"}:
             setattr(db_order, key, value)
 
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise conflict_error()
+    sync_order_stock(db, order_id)
+    # Other fields leave the sale as it is
+    if SALE_PAYLOAD_FIELDS & values.keys():
+        sync_order_sales(db, order_id)
     db.commit()
     db.refresh(db_order)
+    kitchen_queue.publish(db_order)
     return db_order
 
+# Change scalar fields of an Order record with one UPDATE ... RETURNING
+@router.patch("/{order_id}", response_model=Order)
+def patch_order(order_id: int, order: OrderPatch, db: Session = Depends(get_db)):
+    values = stamp_paid_at(order.dict(exclude_unset=True))
+    record = patch_record(db, OrderModel, Order, order_id, values, "Order not found")
+    if SALE_FIELDS & values.keys():
+        sync_order_sales(db, order_id)
+    db.commit()
+    kitchen_queue.publish(record)
+    return row_response(OrderModel, Order, record)
+
 # Delete an Order record by ID
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_order(order_id: int, db: Session = Depends(get_db)):
-    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
-    if not db_order:
+    deleted = delete_orders(db, OrderModel.id == order_id)
+    if not deleted.ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    db.delete(db_order)
     db.commit()
+    deleted.forget()
     return
 
+# Delete many Order records with one statement: by ID and/or paid before a point in time
+@router.post("/bulk-delete", response_model=BulkDeleted)
+def bulk_delete_orders(filters: OrderBulkDelete, db: Session = Depends(get_db)):
+    condition = bulk_filter(
+        OrderModel.id.in_(filters.ids) if filters.ids is not None else None,
+        OrderModel.paid_at < filters.paid_before if filters.paid_before is not None else None,
+    )
+    deleted = delete_orders(db, condition)
+    db.commit()
+    deleted.forget()
+    return BulkDeleted(deleted=deleted.ids)
+
 # Get an Order record with all related objects
-@router.get("/{order_id}/with-relations", response_model=OrderWithRelations)
-def get_order_with_relations(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+@router.get("/{order_id}/with-relations", response_model=OrderWithRelations, dependencies=[order_relations_etag])
+def get_order_with_relations(order_id: int, db: Session = Depends(get_read_db)):
+    order = (
+        apply_loading_plan(db.query(OrderModel), OrderWithRelations)
+        .filter(OrderModel.id == order_id)
+        .first()
+    )
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
     return order
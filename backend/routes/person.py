@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.person import Person as PersonModel
+from backend.schemas.bulk import BulkResult
+from backend.services.bulk import BulkBatch, bulk_transaction, duplicated_values, existing_values, insert_many
+from backend.services.deletion import delete_people
 from backend.schemas.person import (
     PersonCreate,
     PersonUpdate,
@@ -14,15 +21,18 @@ router = APIRouter(
     tags=["Person"],
 )
 
+# ETag dependencies of the read endpoints
+person_etag = Depends(conditional_get(PersonModel))
+person_relations_etag = Depends(conditional_get(PersonModel, schema=PersonWithRelations))
+
 # Get all Person records
-@router.get("/", response_model=list[Person])
-def get_all_people(db: Session = Depends(get_db)):
-    persons = db.query(PersonModel).all()
-    return persons
+@router.get("/", response_model=list[Person], dependencies=[person_etag])
+def get_all_people(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(PersonModel), PersonModel, Person, page, response)
 
 # Get a specific Person record by ID
-@router.get("/{person_id}", response_model=Person)
-def get_person(person_id: int, db: Session = Depends(get_db)):
+@router.get("/{person_id}", response_model=Person, dependencies=[person_etag])
+def get_person(person_id: int, db: Session = Depends(get_read_db)):
     person = db.query(PersonModel).filter(PersonModel.id == person_id).first()
     if not person:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Person not found")
@@ -42,6 +52,27 @@ def create_person(person: PersonCreate, db: Session = Depends(get_db)):
     db.refresh(new_person)
     return new_person
 
+# Create many Person records in one transaction
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_people(rows: list[dict], db: Session = Depends(get_db)):
+    batch = BulkBatch()
+    people = batch.parse(PersonCreate, rows)
+    emails = [person.email for _, person in people]
+    taken = existing_values(db, PersonModel.email, emails)
+    duplicated = duplicated_values(emails)
+
+    for index, person in people:
+        if person.email in taken:
+            batch.reject(index, f"Email '{person.email}' is already registered")
+        elif person.email in duplicated:
+            batch.reject(index, f"Email '{person.email}' appears more than once in the payload")
+        else:
+            batch.accept(index, person.dict())
+
+    with bulk_transaction(db):
+        ids = insert_many(db, PersonModel, batch.rows)
+    return batch.result(ids)
+
 # Update an existing Person record
 @router.put("/{person_id}", response_model=Person)
 def update_person(person_id: int, person: PersonUpdate, db: Session = Depends(get_db)):
@@ -56,20 +87,31 @@ def update_person(person_id: int, person: PersonUpdate, db: Session = Depends(ge
     db.refresh(db_person)
     return db_person
 
+# Change scalar fields of a Person record with one UPDATE ... RETURNING
+@router.patch("/{person_id}", response_model=Person)
+def patch_person(person_id: int, person: PersonUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, PersonModel, Person, person_id, person.dict(exclude_unset=True), "Person not found")
+    db.commit()
+    return row_response(PersonModel, Person, record)
+
 # Delete a Person record by ID
 @router.delete("/{person_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_person(person_id: int, db: Session = Depends(get_db)):
-    db_person = db.query(PersonModel).filter(PersonModel.id == person_id).first()
-    if not db_person:
+    deleted = delete_people(db, PersonModel.id == person_id)
+    if not deleted.ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Person not found")
-    db.delete(db_person)
     db.commit()
+    deleted.forget()
     return
 
 # Get a Person record with all related objects
-@router.get("/{person_id}/with-relations", response_model=PersonWithRelations)
-def get_person_with_relations(person_id: int, db: Session = Depends(get_db)):
-    person = db.query(PersonModel).filter(PersonModel.id == person_id).first()
+@router.get("/{person_id}/with-relations", response_model=PersonWithRelations, dependencies=[person_relations_etag])
+def get_person_with_relations(person_id: int, db: Session = Depends(get_read_db)):
+    person = (
+        apply_loading_plan(db.query(PersonModel), PersonWithRelations)
+        .filter(PersonModel.id == person_id)
+        .first()
+    )
     if not person:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Person not found")
     return person
@@ -1,12 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.reservation import Reservation as ReservationModel
 from backend.models.table import Table as TableModel
 from backend.models.client import Client as ClientModel
+from backend.services.availability import availability, parse_hour, DEFAULT_RESERVATION_MINUTES
+from backend.services.bulk import bulk_filter
+from backend.services.deletion import delete_reservations
+from backend.schemas.bulk import BulkDeleted
 from backend.schemas.reservation import (
+    Availability,
+    ReservationBulkDelete,
     ReservationCreate,
     ReservationUpdate,
+    ReservationPatch,
     Reservation,
     ReservationWithRelations,
 )
@@ -16,14 +29,47 @@ router = APIRouter(
     tags=["Reservation"],
 )
 
+# ETag dependencies of the read endpoints
+reservation_etag = Depends(conditional_get(ReservationModel))
+reservation_relations_etag = Depends(conditional_get(ReservationModel, schema=ReservationWithRelations))
+availability_etag = Depends(conditional_get(ReservationModel, TableModel, tables=["reservation_table"]))
+
 # Get all Reservation records
-@router.get("/", response_model=list[Reservation])
-def get_all_reservations(db: Session = Depends(get_db)):
-    return db.query(ReservationModel).all()
+@router.get("/", response_model=list[Reservation], dependencies=[reservation_etag])
+def get_all_reservations(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(ReservationModel), ReservationModel, Reservation, page, response)
+
+# Find free tables (or pairs of tables) for a party on a given day and time window
+@router.get("/availability", response_model=Availability, dependencies=[availability_etag])
+def get_availability(
+    reservation_date: date = Query(..., title="Reservation Date"),
+    start: str = Query(..., title="Start Hour", examples=["18:00"]),
+    end: Optional[str] = Query(None, title="End Hour (defaults to the standard reservation length)"),
+    number_of_people: int = Query(..., ge=1, title="Number of People"),
+    max_tables: int = Query(2, ge=1, le=4, title="Maximum Tables Combined"),
+    db: Session = Depends(get_read_db),
+):
+    start_minutes = parse_hour(start)
+    if start_minutes is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid start hour")
+    end_minutes = parse_hour(end) if end else start_minutes + DEFAULT_RESERVATION_MINUTES
+    if end_minutes is None or end_minutes <= start_minutes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid end hour")
+
+    candidates = availability.search(
+        db, reservation_date, start_minutes, end_minutes, number_of_people, max_tables=max_tables
+    )
+    return Availability(
+        reservation_date=reservation_date,
+        start=f"{start_minutes // 60:02d}:{start_minutes % 60:02d}",
+        end=f"{end_minutes // 60:02d}:{end_minutes % 60:02d}" if end_minutes < 24 * 60 else "24:00",
+        number_of_people=number_of_people,
+        candidates=candidates,
+    )
 
 # Get a specific Reservation record by ID
-@router.get("/{reservation_id}", response_model=Reservation)
-def get_reservation(reservation_id: int, db: Session = Depends(get_db)):
+@router.get("/{reservation_id}", response_model=Reservation, dependencies=[reservation_etag])
+def get_reservation(reservation_id: int, db: Session = Depends(get_read_db)):
     reservation = db.query(ReservationModel).filter(ReservationModel.id == reservation_id).first()
     if not reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
@@ -47,16 +93,20 @@ def create_reservation(reservation: ReservationCreate, db: Session = Depends(get
 
     # Create new reservation
     new_reservation = ReservationModel(
-        date=reservation.date,
-        hour=reservation.hour,
+        date=reservation.reservation_date,
+        hour=reservation.reservation_hour,
         number_of_people=reservation.number_of_people,
         status=reservation.status,
         client_id=reservation.client_id,
         tables=tables,
     )
+    table_ids = [table.id for table in tables]
     db.add(new_reservation)
     db.commit()
     db.refresh(new_reservation)
+    availability.record(
+        new_reservation.id, new_reservation.date, new_reservation.hour, new_reservation.status, table_ids
+    )
     return new_reservation
 
 # Update an existing Reservation record
@@ -66,11 +116,18 @@ def update_reservation(reservation_id: int, reservation: ReservationUpdate, db:
     if not db_reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
+    if reservation.client_id:
+        client = db.query(ClientModel).filter(ClientModel.id == reservation.client_id).first()
+        if not client:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid client ID")
+
+    table_ids = None
     if reservation.table_ids:
         tables = db.query(TableModel).filter(TableModel.id.in_(reservation.table_ids)).all()
         if len(tables) != len(reservation.table_ids):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid table IDs")
         db_reservation.tables = tables
+        table_ids = [table.id for table in tables]
 
     for key, value in reservation.dict(exclude_unset=True).items():
         if key != "table_ids":
@@ -78,22 +135,49 @@ def update_reservation(reservation_id: int, reservation: ReservationUpdate, db:
 
     db.commit()
     db.refresh(db_reservation)
+    availability.record(
+        db_reservation.id, db_reservation.date, db_reservation.hour, db_reservation.status, table_ids
+    )
     return db_reservation
 
+# Change scalar fields of a Reservation record with one UPDATE ... RETURNING
+@router.patch("/{reservation_id}", response_model=Reservation)
+def patch_reservation(reservation_id: int, reservation: ReservationPatch, db: Session = Depends(get_db)):
+    record = patch_record(db, ReservationModel, Reservation, reservation_id, reservation.dict(exclude_unset=True), "Reservation not found")
+    db.commit()
+    availability.record(record.id, record.reservation_date, record.reservation_hour, record.status)
+    return row_response(ReservationModel, Reservation, record)
+
 # Delete a Reservation record by ID
 @router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_reservation(reservation_id: int, db: Session = Depends(get_db)):
-    db_reservation = db.query(ReservationModel).filter(ReservationModel.id == reservation_id).first()
-    if not db_reservation:
+    deleted = delete_reservations(db, ReservationModel.id == reservation_id)
+    if not deleted.ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
-    db.delete(db_reservation)
     db.commit()
+    deleted.forget()
     return
 
+# Delete many Reservation records with one statement: by ID and/or dated before a day
+@router.post("/bulk-delete", response_model=BulkDeleted)
+def bulk_delete_reservations(filters: ReservationBulkDelete, db: Session = Depends(get_db)):
+    condition = bulk_filter(
+        ReservationModel.id.in_(filters.ids) if filters.ids is not None else None,
+        ReservationModel.date < filters.before if filters.before is not None else None,
+    )
+    deleted = delete_reservations(db, condition)
+    db.commit()
+    deleted.forget()
+    return BulkDeleted(deleted=deleted.ids)
+
 # Get a Reservation record with all related objects
-@router.get("/{reservation_id}/with-relations", response_model=ReservationWithRelations)
-def get_reservation_with_relations(reservation_id: int, db: Session = Depends(get_db)):
-    reservation = db.query(ReservationModel).filter(ReservationModel.id == reservation_id).first()
+@router.get("/{reservation_id}/with-relations", response_model=ReservationWithRelations, dependencies=[reservation_relations_etag])
+def get_reservation_with_relations(reservation_id: int, db: Session = Depends(get_read_db)):
+    reservation = (
+        apply_loading_plan(db.query(ReservationModel), ReservationWithRelations)
+        .filter(ReservationModel.id == reservation_id)
+        .first()
+    )
     if not reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     return reservation
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.restaurant_employee import RestaurantEmployee as RestaurantEmployeeModel
 from backend.models.person import Person as PersonModel
 from backend.models.order import Order as OrderModel
@@ -16,14 +20,18 @@ router = APIRouter(
     tags=["Restaurant Employee"],
 )
 
+# ETag dependencies of the read endpoints
+restaurant_employee_etag = Depends(conditional_get(RestaurantEmployeeModel))
+restaurant_employee_relations_etag = Depends(conditional_get(RestaurantEmployeeModel, schema=RestaurantEmployeeWithRelations))
+
 # Get all RestaurantEmployee records
-@router.get("/", response_model=list[RestaurantEmployee])
-def get_all_employees(db: Session = Depends(get_db)):
-    return db.query(RestaurantEmployeeModel).all()
+@router.get("/", response_model=list[RestaurantEmployee], dependencies=[restaurant_employee_etag])
+def get_all_employees(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(RestaurantEmployeeModel), RestaurantEmployeeModel, RestaurantEmployee, page, response)
 
 # Get a specific RestaurantEmployee record by ID
-@router.get("/{employee_id}", response_model=RestaurantEmployee)
-def get_employee(employee_id: int, db: Session = Depends(get_db)):
+@router.get("/{employee_id}", response_model=RestaurantEmployee, dependencies=[restaurant_employee_etag])
+def get_employee(employee_id: int, db: Session = Depends(get_read_db)):
     employee = db.query(RestaurantEmployeeModel).filter(RestaurantEmployeeModel.id == employee_id).first()
     if not employee:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant Employee not found")
@@ -55,6 +63,11 @@ def update_employee(employee_id: int, employee: RestaurantEmployeeUpdate, db: Se
     if not db_employee:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant Employee not found")
 
+    if employee.person_id:
+        person = db.query(PersonModel).filter(PersonModel.id == employee.person_id).first()
+        if not person:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Person ID")
+
     for key, value in employee.dict(exclude_unset=True).items():
         setattr(db_employee, key, value)
 
@@ -62,6 +75,13 @@ def update_employee(employee_id: int, employee: RestaurantEmployeeUpdate, db: Se
     db.refresh(db_employee)
     return db_employee
 
+# Change scalar fields of a RestaurantEmployee record with one UPDATE ... RETURNING
+@router.patch("/{employee_id}", response_model=RestaurantEmployee)
+def patch_restaurant_employee(employee_id: int, employee: RestaurantEmployeeUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, RestaurantEmployeeModel, RestaurantEmployee, employee_id, employee.dict(exclude_unset=True), "Restaurant Employee not found")
+    db.commit()
+    return row_response(RestaurantEmployeeModel, RestaurantEmployee, record)
+
 # Delete a RestaurantEmployee record by ID
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_employee(employee_id: int, db: Session = Depends(get_db)):
@@ -73,9 +93,13 @@ def delete_employee(employee_id: int, db: Session = Depends(get_db)):
     return
 
 # Get a RestaurantEmployee record with all related objects
-@router.get("/{employee_id}/with-relations", response_model=RestaurantEmployeeWithRelations)
-def get_employee_with_relations(employee_id: int, db: Session = Depends(get_db)):
-    employee = db.query(RestaurantEmployeeModel).filter(RestaurantEmployeeModel.id == employee_id).first()
+@router.get("/{employee_id}/with-relations", response_model=RestaurantEmployeeWithRelations, dependencies=[restaurant_employee_relations_etag])
+def get_employee_with_relations(employee_id: int, db: Session = Depends(get_read_db)):
+    employee = (
+        apply_loading_plan(db.query(RestaurantEmployeeModel), RestaurantEmployeeWithRelations)
+        .filter(RestaurantEmployeeModel.id == employee_id)
+        .first()
+    )
     if not employee:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant Employee not found")
     return employee
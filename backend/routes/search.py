@@ -0,0 +1,31 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from backend.core.database import get_read_db
+from backend.core.etag import conditional_get
+from backend.models.client import Client as ClientModel
+from backend.models.dish import Dish as DishModel
+from backend.models.person import Person as PersonModel
+from backend.services.search import search_dishes, search_people
+from backend.schemas.search import SearchResults
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"],
+)
+
+# ETag dependencies of the read endpoints
+search_etag = Depends(conditional_get(PersonModel, ClientModel, DishModel))
+
+# Search people (or only clients) by name, surname, email or phone, and dishes by name or
+# description. Every word of the query matches as a prefix: "jan kow" finds "Jan Kowalski".
+@router.get("/", response_model=SearchResults, dependencies=[search_etag])
+def search(
+    q: str = Query(..., min_length=2, max_length=200, title="Query"),
+    scope: Literal["all", "people", "clients", "dishes"] = Query("all", title="What to Search"),
+    limit: int = Query(20, ge=1, le=100, title="Maximum Results per Kind"),
+    db: Session = Depends(get_read_db),
+):
+    people = search_people(db, q, limit, clients_only=scope == "clients") if scope != "dishes" else []
+    dishes = search_dishes(db, q, limit) if scope in ("all", "dishes") else []
+    return SearchResults(query=q, people=people, dishes=dishes)
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.pagination import NEXT_CURSOR_HEADER, PageParams, keyset, paginate
+from backend.models.ingredient import Ingredient as IngredientModel
+from backend.models.job import Job as JobModel
+from backend.models.stock import StockLevel as StockLevelModel, StockMovement as StockMovementModel
+from backend.models.dish import Dish as DishModel
+from backend.services.jobs import enqueue
+from backend.services.stock import adjust_stock, cookable_dishes
+from backend.schemas.job import Job
+from backend.schemas.stock import CookableDish, StockAdjustment, StockLevel, StockMovement
+import backend.services.tasks  # noqa: F401
+
+router = APIRouter(
+    prefix="/stock",
+    tags=["Stock"],
+)
+
+# ETag dependencies of the read endpoints
+stock_etag = Depends(conditional_get(IngredientModel, StockLevelModel))
+movements_etag = Depends(conditional_get(StockMovementModel))
+cookable_etag = Depends(conditional_get(DishModel, StockLevelModel, tables=["dish_ingredient"]))
+
+# Get the on-hand balance of every ingredient (one row per ingredient)
+@router.get("/", response_model=list[StockLevel], dependencies=[stock_etag])
+def get_stock_levels(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    query = db.query(
+        IngredientModel.id.label("ingredient_id"),
+        IngredientModel.name,
+        IngredientModel.metric,
+        func.coalesce(StockLevelModel.on_hand, 0).label("on_hand"),
+        StockLevelModel.updated_at,
+    ).outerjoin(StockLevelModel, StockLevelModel.ingredient_id == IngredientModel.id)
+    rows = keyset(query, IngredientModel, page.after, page.limit).all()
+    if len(rows) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(rows[-1].ingredient_id)
+    return [row._asdict() for row in rows]
+
+# Get the dishes with the number of portions the stock on hand still allows
+@router.get("/cookable", response_model=list[CookableDish], dependencies=[cookable_etag])
+def get_cookable_dishes(db: Session = Depends(get_read_db)):
+    return cookable_dishes(db)
+
+# Get the ledger of an ingredient, oldest first
+@router.get("/{ingredient_id}/movements", response_model=list[StockMovement], dependencies=[movements_etag])
+def get_stock_movements(ingredient_id: int, response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    query = db.query(StockMovementModel).filter(StockMovementModel.ingredient_id == ingredient_id)
+    return paginate(query, StockMovementModel, StockMovement, page, response)
+
+# Correct the stock of an ingredient (stock count, waste, opening balance)
+@router.post("/adjustments", response_model=StockLevel, status_code=status.HTTP_201_CREATED)
+def create_stock_adjustment(adjustment: StockAdjustment, db: Session = Depends(get_db)):
+    ingredient = db.query(IngredientModel).filter(IngredientModel.id == adjustment.ingredient_id).first()
+    if not ingredient:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
+    adjust_stock(db, ingredient.id, adjustment.quantity, adjustment.note)
+    db.commit()
+    level = db.query(StockLevelModel).filter(StockLevelModel.ingredient_id == ingredient.id).first()
+    return StockLevel(
+        ingredient_id=ingredient.id,
+        name=ingredient.name,
+        metric=ingredient.metric.value,
+        on_hand=level.on_hand if level else 0,
+        updated_at=level.updated_at if level else None,
+    )
+
+# Recompute the on-hand balances from the ledger in a background job (stock.rebuild); poll /jobs/{id}
+@router.post("/rebuild", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def rebuild_stock(db: Session = Depends(get_db)):
+    job_id = enqueue(db, "stock.rebuild")
+    db.commit()
+    return db.query(JobModel).filter(JobModel.id == job_id).first()
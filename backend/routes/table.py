@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
+from backend.core.etag import conditional_get
+from backend.core.loading import apply_loading_plan
+from backend.core.pagination import PageParams, paginate
+from backend.core.patch import patch_record, row_response
 from backend.models.table import Table as TableModel
 from backend.models.reservation import Reservation as ReservationModel
+from backend.schemas.bulk import BulkResult
+from backend.services.availability import availability
+from backend.services.bulk import BulkBatch, bulk_transaction, duplicated_values, existing_values, insert_many
 from backend.schemas.table import (
     TableCreate,
     TableUpdate,
@@ -15,14 +22,18 @@ router = APIRouter(
     tags=["Table"],
 )
 
+# ETag dependencies of the read endpoints
+table_etag = Depends(conditional_get(TableModel))
+table_relations_etag = Depends(conditional_get(TableModel, schema=TableWithRelations))
+
 # Get all Table records
-@router.get("/", response_model=list[Table])
-def get_all_tables(db: Session = Depends(get_db)):
-    return db.query(TableModel).all()
+@router.get("/", response_model=list[Table], dependencies=[table_etag])
+def get_all_tables(response: Response, page: PageParams = Depends(), db: Session = Depends(get_read_db)):
+    return paginate(db.query(TableModel), TableModel, Table, page, response)
 
 # Get a specific Table record by ID
-@router.get("/{table_id}", response_model=Table)
-def get_table(table_id: int, db: Session = Depends(get_db)):
+@router.get("/{table_id}", response_model=Table, dependencies=[table_etag])
+def get_table(table_id: int, db: Session = Depends(get_read_db)):
     table = db.query(TableModel).filter(TableModel.id == table_id).first()
     if not table:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
@@ -46,8 +57,36 @@ def create_table(table: TableCreate, db: Session = Depends(get_db)):
     db.add(new_table)
     db.commit()
     db.refresh(new_table)
+    availability.clear()
     return new_table
 
+# Create many Table records in one transaction
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_tables(rows: list[dict], db: Session = Depends(get_db)):
+    batch = BulkBatch()
+    tables = batch.parse(TableCreate, rows)
+    numbers = [table.number for _, table in tables]
+    taken = existing_values(db, TableModel.number, numbers)
+    duplicated = duplicated_values(numbers)
+    reservations = existing_values(
+        db, ReservationModel.id, [table.reservation_id for _, table in tables if table.reservation_id]
+    )
+
+    for index, table in tables:
+        if table.number in taken:
+            batch.reject(index, f"Table number '{table.number}' already exists")
+        elif table.number in duplicated:
+            batch.reject(index, f"Table number '{table.number}' appears more than once in the payload")
+        elif table.reservation_id and table.reservation_id not in reservations:
+            batch.reject(index, "Invalid Reservation ID")
+        else:
+            batch.accept(index, table.dict())
+
+    with bulk_transaction(db):
+        ids = insert_many(db, TableModel, batch.rows)
+    availability.clear()
+    return batch.result(ids)
+
 # Update an existing Table record
 @router.put("/{table_id}", response_model=Table)
 def update_table(table_id: int, table: TableUpdate, db: Session = Depends(get_db)):
@@ -66,8 +105,17 @@ def update_table(table_id: int, table: TableUpdate, db: Session = Depends(get_db
 
     db.commit()
     db.refresh(db_table)
+    availability.clear()
     return db_table
 
+# Change scalar fields of a Table record with one UPDATE ... RETURNING
+@router.patch("/{table_id}", response_model=Table)
+def patch_table(table_id: int, table: TableUpdate, db: Session = Depends(get_db)):
+    record = patch_record(db, TableModel, Table, table_id, table.dict(exclude_unset=True), "Table not found")
+    db.commit()
+    availability.clear()
+    return row_response(TableModel, Table, record)
+
 # Delete a Table record by ID
 @router.delete("/{table_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_table(table_id: int, db: Session = Depends(get_db)):
@@ -76,12 +124,17 @@ def delete_table(table_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
     db.delete(db_table)
     db.commit()
+    availability.clear()
     return
 
 # Get a Table record with all related objects
-@router.get("/{table_id}/with-relations", response_model=TableWithRelations)
-def get_table_with_relations(table_id: int, db: Session = Depends(get_db)):
-    table = db.query(TableModel).filter(TableModel.id == table_id).first()
+@router.get("/{table_id}/with-relations", response_model=TableWithRelations, dependencies=[table_relations_etag])
+def get_table_with_relations(table_id: int, db: Session = Depends(get_read_db)):
+    table = (
+        apply_loading_plan(db.query(TableModel), TableWithRelations)
+        .filter(TableModel.id == table_id)
+        .first()
+    )
     if not table:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
     return table
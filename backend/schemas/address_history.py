@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, ClassVar
 
 # Base schema for AddressHistory
 class AddressHistoryBase(BaseModel):
@@ -36,13 +36,17 @@ class AddressHistory(BaseModel):
     floor: Optional[int]
     staircase: Optional[str]
     client_id: int
-    order_id: Optional[int]
+    order_id: Optional[int] = None  # Not a column: addresses link to orders from the order side
 
     class Config:
         from_attributes = True
 
 # Schema for retrieving AddressHistory with related objects
 class AddressHistoryWithRelations(AddressHistory):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "client": "joined",
+    }
     client: Optional["Client"] = None  # Will include client information
     order: Optional["Order"] = None   # Will include order information
 
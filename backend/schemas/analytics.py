@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+# Sales of one day (or one hour of a day)
+class SalesBucket(BaseModel):
+    day: date
+    hour: Optional[int]
+    orders: int
+    items: int
+    revenue: float
+    average_order_value: float
+
+# Sales of a dish, in total or per day/hour
+class DishSales(BaseModel):
+    dish_id: int
+    name: Optional[str]  # None once the dish has been deleted
+    day: Optional[date]
+    hour: Optional[int]
+    quantity: int
+    revenue: float
+
+# Share of orders of a payment type or order type
+class SalesMix(BaseModel):
+    key: str
+    orders: int
+    revenue: float
+    share: float
+
+# Totals over a date range
+class SalesSummary(BaseModel):
+    start: date
+    end: date
+    orders: int
+    items: int
+    revenue: float
+    average_order_value: float
+    average_items_per_order: float
+    payment_mix: List[SalesMix]
+    order_type_mix: List[SalesMix]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# A row of a bulk payload that was inserted
+class BulkCreated(BaseModel):
+    index: int = Field(..., title="Position in the payload")
+    id: int = Field(..., title="ID of the created record")
+
+# A row of a bulk payload that was rejected
+class BulkError(BaseModel):
+    index: int = Field(..., title="Position in the payload")
+    detail: str = Field(..., title="Reason")
+
+# Report returned by the bulk create endpoints
+class BulkResult(BaseModel):
+    created: List[BulkCreated] = []
+    errors: List[BulkError] = []
+
+# IDs removed by a bulk delete
+class BulkDeleted(BaseModel):
+    deleted: List[int] = []
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, ClassVar
 
 # Base schema for Client
 class ClientBase(BaseModel):
@@ -27,6 +27,12 @@ class Client(BaseModel):
 
 # Detailed schema with related objects
 class ClientWithRelations(Client):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "address_history": "selectin",
+        "orders": "selectin",
+        "reservations": "selectin",
+    }
     address_history: List["AddressHistory"] = []
     orders: List["Order"] = []
     reservations: List["Reservation"] = []
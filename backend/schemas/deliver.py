@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, ClassVar
 
 # Base schema for Deliver
 class DeliverBase(BaseModel):
@@ -26,6 +26,10 @@ class Deliver(BaseModel):
 
 # Detailed schema with related objects
 class DeliverWithRelations(Deliver):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "deliveries": "selectin",
+    }
     deliveries: List["Delivery"] = []
 
 
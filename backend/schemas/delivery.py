@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional, ClassVar
 
 class DeliveryBase(BaseModel):
     delivery_status: str = Field(..., title="Delivery Status")  # Renamed from `status`
@@ -9,12 +9,22 @@ class DeliveryBase(BaseModel):
 
 class DeliveryCreate(DeliveryBase):
     ingredient_ids: List[int] = Field(..., title="Ingredient IDs")
+    ingredient_quantities: Optional[Dict[int, int]] = Field(None, title="Delivered quantity by Ingredient ID")
 
-class DeliveryUpdate(BaseModel):
+class DeliveryPatch(BaseModel):
     delivery_status: Optional[str] = Field(None, title="Delivery Status")
     delivery_date: Optional[date] = Field(None, title="Delivery Date")
     deliver_id: Optional[int] = Field(None, title="Deliver ID")
+
+    class Config:
+        extra = "forbid"  # Relationship IDs are only accepted by PUT
+
+class DeliveryUpdate(DeliveryPatch):
     ingredient_ids: Optional[List[int]] = Field(None, title="Ingredient IDs")
+    ingredient_quantities: Optional[Dict[int, int]] = Field(None, title="Delivered quantity by Ingredient ID")
+
+    class Config:
+        extra = "ignore"
 
 class Delivery(BaseModel):
     id: int
@@ -26,6 +36,11 @@ class Delivery(BaseModel):
         from_attributes = True
 
 class DeliveryWithRelations(Delivery):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "deliver": "joined",
+        "ingredients": "selectin",
+    }
     deliver: "Deliver"
     ingredients: List["Ingredient"] = []
 
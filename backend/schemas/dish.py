@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional, ClassVar
 
 # Base schema for Dish
 class DishBase(BaseModel):
@@ -11,14 +11,25 @@ class DishBase(BaseModel):
 # Create schema
 class DishCreate(DishBase):
     ingredient_ids: List[int] = Field(..., title="Ingredient IDs")
+    ingredient_quantities: Optional[Dict[int, int]] = Field(None, title="Quantity per portion by Ingredient ID")
 
-# Update schema
-class DishUpdate(BaseModel):
+# Scalar fields, changed in place by PATCH
+class DishPatch(BaseModel):
     name: Optional[str] = Field(None, title="Dish Name")
     description: Optional[str] = Field(None, title="Dish Description")
     price: Optional[float] = Field(None, title="Price")
     discount: Optional[float] = Field(None, title="Discount")
+
+    class Config:
+        extra = "forbid"  # Relationship IDs are only accepted by PUT
+
+# Update schema
+class DishUpdate(DishPatch):
     ingredient_ids: Optional[List[int]] = Field(None, title="Ingredient IDs")
+    ingredient_quantities: Optional[Dict[int, int]] = Field(None, title="Quantity per portion by Ingredient ID")
+
+    class Config:
+        extra = "ignore"
 
 # Read schema
 class Dish(BaseModel):
@@ -33,6 +44,10 @@ class Dish(BaseModel):
 
 # Detailed schema with related objects
 class DishWithRelations(Dish):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "ingredients": "selectin",
+    }
     ingredients: List["Ingredient"] = []
 
 
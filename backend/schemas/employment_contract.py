@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date
-from typing import Optional
+from typing import Optional, ClassVar
 
 # Base schema for EmploymentContract
 class EmploymentContractBase(BaseModel):
@@ -36,6 +36,10 @@ class EmploymentContract(BaseModel):
 
 # Detailed schema with related objects
 class EmploymentContractWithRelations(EmploymentContract):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "restaurant_employee": "joined",
+    }
     restaurant_employee: "RestaurantEmployee"
 
 
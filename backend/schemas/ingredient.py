@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, ClassVar
 
 # Base schema for Ingredient
 class IngredientBase(BaseModel):
@@ -29,6 +29,11 @@ class Ingredient(BaseModel):
 
 # Detailed schema with related objects
 class IngredientWithRelations(Ingredient):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "dishes": "selectin",
+        "deliveries": "selectin",
+    }
     dishes: List["Dish"] = []
     deliveries: List["Delivery"] = []
 
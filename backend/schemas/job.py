@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field, Json
+from datetime import datetime
+from typing import Any, Optional
+from backend.models.job import JobStatus
+
+# Background job to enqueue
+class JobCreate(BaseModel):
+    name: str = Field(..., title="Task Name")
+    payload: dict[str, Any] = Field(default_factory=dict, title="Keyword Arguments of the Task")
+    run_at: Optional[datetime] = Field(None, title="Run Not Before (default: now)")
+    max_attempts: int = Field(5, ge=1, title="Attempts Before the Job Fails")
+
+# State of a background job; result holds what the task returned
+class Job(BaseModel):
+    id: int
+    name: str
+    payload: Json[Any]
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    result: Optional[Json[Any]]
+    last_error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
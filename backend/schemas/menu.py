@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+# Ingredient as listed on the menu
+class MenuIngredient(BaseModel):
+    id: int
+    name: str
+
+# Dish as listed on the menu
+class MenuDish(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
+    discount: Optional[float]
+    effective_price: float = Field(..., title="Price after discount")
+    ingredients: List[MenuIngredient] = []
+
+# The customer-facing menu document
+class Menu(BaseModel):
+    generated_at: datetime = Field(..., title="When the snapshot was built")
+    dishes: List[MenuDish] = []
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import List, Optional, ClassVar
+from backend.services.order_numbers import is_server_number
 
 # Base schema for Order
 class OrderBase(BaseModel):
@@ -13,13 +15,22 @@ class OrderBase(BaseModel):
     client_id: int = Field(..., title="Client ID")
     address_history_id: int = Field(..., title="Address History ID")
 
+# Client-supplied numbers may not use the server's YYYYMMDD-NNNN format
+def check_client_number(number: Optional[str]) -> Optional[str]:
+    if number is not None and is_server_number(number):
+        raise ValueError("Numbers in the YYYYMMDD-NNNN format are allocated by the server")
+    return number
+
 # Create schema
 class OrderCreate(OrderBase):
+    number: Optional[str] = Field(None, title="Order Number")  # Allocated by the server when omitted
     dish_ids: List[int] = Field(..., title="Dish IDs")
     restaurant_employee_ids: List[int] = Field(..., title="Restaurant Employee IDs")
 
-# Update schema
-class OrderUpdate(BaseModel):
+    _check_number = field_validator("number")(check_client_number)
+
+# Scalar fields, changed in place by PATCH
+class OrderPatch(BaseModel):
     status: Optional[str] = Field(None, title="Order Status")
     number: Optional[str] = Field(None, title="Order Number")
     hour: Optional[str] = Field(None, title="Order Hour")
@@ -29,9 +40,25 @@ class OrderUpdate(BaseModel):
     delay: Optional[bool] = Field(None, title="Delay")
     client_id: Optional[int] = Field(None, title="Client ID")
     address_history_id: Optional[int] = Field(None, title="Address History ID")
+
+    _check_number = field_validator("number")(check_client_number)
+
+    class Config:
+        extra = "forbid"  # Relationship IDs are only accepted by PUT
+
+# Update schema
+class OrderUpdate(OrderPatch):
     dish_ids: Optional[List[int]] = Field(None, title="Dish IDs")
     restaurant_employee_ids: Optional[List[int]] = Field(None, title="Restaurant Employee IDs")
 
+    class Config:
+        extra = "ignore"
+
+# Bulk delete filter: the listed orders and/or the orders paid before a point in time
+class OrderBulkDelete(BaseModel):
+    ids: Optional[List[int]] = Field(None, title="Order IDs")
+    paid_before: Optional[datetime] = Field(None, title="Paid Before")
+
 # Read schema
 class Order(BaseModel):
     id: int
@@ -44,12 +71,20 @@ class Order(BaseModel):
     delay: bool
     client_id: int
     address_history_id: int
+    paid_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 # Detailed schema with related objects
 class OrderWithRelations(Order):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "client": "joined",
+        "address_history": "joined",
+        "restaurant_employee": "selectin",
+        "dishes": "selectin",
+    }
     client: "Client"
     address_history: "AddressHistory"
     restaurant_employee: List["RestaurantEmployee"] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional, ClassVar
 
 # Base schema for Person
 class PersonBase(BaseModel):
@@ -32,9 +32,16 @@ class Person(BaseModel):
 
 # Detailed schema with related objects
 class PersonWithRelations(Person):
-    restaurant_employee: Optional["RestaurantEmployee"] = None
-    client: Optional["Client"] = None
-    deliver: Optional["Deliver"] = None
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "restaurant_employee": "selectin",
+        "client": "selectin",
+        "deliver": "selectin",
+    }
+    # One-to-many on the model, so lists
+    restaurant_employee: List["RestaurantEmployee"] = []
+    client: List["Client"] = []
+    deliver: List["Deliver"] = []
 
 
 # Import related schemas
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, ClassVar
 from datetime import date
 
 # Base schema for Reservation
@@ -14,15 +14,43 @@ class ReservationBase(BaseModel):
 class ReservationCreate(ReservationBase):
     table_ids: List[int] = Field(..., title="Table IDs")
 
-# Update schema
-class ReservationUpdate(BaseModel):
+# Scalar fields, changed in place by PATCH
+class ReservationPatch(BaseModel):
     reservation_date: Optional[date] = Field(None, title="Reservation Date")
     reservation_hour: Optional[str] = Field(None, title="Reservation Hour")
     number_of_people: Optional[int] = Field(None, title="Number of People")
     status: Optional[str] = Field(None, title="Reservation Status")
     client_id: Optional[int] = Field(None, title="Client ID")
+
+    class Config:
+        extra = "forbid"  # Relationship IDs are only accepted by PUT
+
+# Update schema
+class ReservationUpdate(ReservationPatch):
     table_ids: Optional[List[int]] = Field(None, title="Table IDs")
 
+    class Config:
+        extra = "ignore"
+
+# Bulk delete filter: the listed reservations and/or the reservations dated before a day
+class ReservationBulkDelete(BaseModel):
+    ids: Optional[List[int]] = Field(None, title="Reservation IDs")
+    before: Optional[date] = Field(None, title="Reservation Date Before")
+
+# A set of free tables that can seat a party together
+class TableSet(BaseModel):
+    table_ids: List[int]
+    table_numbers: List[str]
+    seats: int
+
+# Availability search result
+class Availability(BaseModel):
+    reservation_date: date
+    start: str
+    end: str
+    number_of_people: int
+    candidates: List[TableSet] = []
+
 # Read schema
 class Reservation(BaseModel):
     id: int
@@ -37,6 +65,11 @@ class Reservation(BaseModel):
 
 # Detailed schema with related objects
 class ReservationWithRelations(Reservation):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "client": "joined",
+        "tables": "selectin",
+    }
     client: "Client"
     tables: List["Table"] = []
 
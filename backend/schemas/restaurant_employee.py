@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, ClassVar
 
 # Base schema for RestaurantEmployee
 class RestaurantEmployeeBase(BaseModel):
@@ -29,8 +29,14 @@ class RestaurantEmployee(BaseModel):
 
 # Detailed schema with related objects
 class RestaurantEmployeeWithRelations(RestaurantEmployee):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "person": "joined",
+        "employment_contract": "selectin",
+        "orders": "selectin",
+    }
     person: "Person"
-    employment_contract: Optional["EmploymentContract"] = None
+    employment_contract: List["EmploymentContract"] = []
     orders: List["Order"] = []
 
 
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+# Person found by the search; client_id is set when the person is a client
+class PersonHit(BaseModel):
+    id: int
+    name: str
+    surname: str
+    email: str
+    phone_number: str
+    client_id: Optional[int]
+
+# Dish found by the search
+class DishHit(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
+    discount: Optional[float]
+
+# Search results, best matches first
+class SearchResults(BaseModel):
+    query: str
+    people: List[PersonHit] = []
+    dishes: List[DishHit] = []
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+# On-hand balance of an ingredient
+class StockLevel(BaseModel):
+    ingredient_id: int
+    name: str
+    metric: str
+    on_hand: int
+    updated_at: Optional[datetime]
+
+# Ledger entry
+class StockMovement(BaseModel):
+    id: int
+    ingredient_id: int
+    quantity: int
+    kind: str
+    delivery_id: Optional[int]
+    order_id: Optional[int]
+    note: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Manual stock correction
+class StockAdjustment(BaseModel):
+    ingredient_id: int = Field(..., title="Ingredient ID")
+    quantity: int = Field(..., title="Quantity to add (negative to remove)")
+    note: Optional[str] = Field(None, title="Reason")
+
+# Portions of a dish that can be cooked from the stock on hand
+class CookableDish(BaseModel):
+    dish_id: int
+    name: str
+    portions: int
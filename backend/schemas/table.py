@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, ClassVar
 
 # Base schema for Table
 class TableBase(BaseModel):
@@ -29,6 +29,10 @@ class Table(BaseModel):
 
 # Detailed schema with related objects
 class TableWithRelations(Table):
+    # Relationships eager-loaded by the with-relations endpoint
+    loading_plan: ClassVar[dict[str, str]] = {
+        "reservation": "joined",
+    }
     reservation: Optional["Reservation"] = None
 
 
@@ -0,0 +1,10 @@
+from backend.core.validation import InvariantError, validator, has_parent
+from backend.models.address_history import AddressHistory
+
+
+# An address history record must belong to a client
+@validator(AddressHistory)
+def validate_address_history(session, new, dirty):
+    for address in new + dirty:
+        if not has_parent(address, "client_id", "client"):
+            raise InvariantError("An address history record must be associated with a client.")
@@ -0,0 +1,388 @@
+# Sales analytics served from pre-aggregated rollups.
+#
+# A paid or completed order contributes one row to `sale` (and one row per dish to
+# `sale_dish`), and those contributions are added to the hourly rollups in the same
+# transaction as the order write. Dashboard queries read only the rollups, so their cost
+# depends on the date range, not on the number of orders.
+#
+#   python -m backend.services.analytics rebuild
+import argparse
+import json
+from datetime import date, datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.models.dish import Dish
+from backend.models.order import Order, OrderStatus, order_dish
+from backend.models.sales import Sale, SaleDish, SalesRollup, DishSalesRollup
+from backend.services.menu import effective_price
+
+# Order statuses that count as a sale
+SALE_STATUSES = (OrderStatus.paid, OrderStatus.completed)
+
+# Order fields copied into the sale rows; changing any other field leaves the sales as they are
+SALE_FIELDS = {"status", "payment", "takeaway_or_onsite"}
+# Create and PUT payload fields that can change an order's sale
+SALE_PAYLOAD_FIELDS = SALE_FIELDS | {"dish_ids"}
+
+# Default dashboard range when none is given
+DEFAULT_RANGE_DAYS = 30
+
+# Orders read per batch by the full rebuild
+REBUILD_BATCH_SIZE = 1000
+
+
+# Contribution of an order: its sale row and its per-dish rows
+def sale_rows(order, paid_at: datetime, dishes) -> tuple:
+    dish_rows = {}
+    for dish_id, price, discount in dishes:
+        row = dish_rows.setdefault(dish_id, {"order_id": order.id, "dish_id": dish_id, "quantity": 0, "revenue": 0.0})
+        row["quantity"] += 1
+        row["revenue"] = round(row["revenue"] + effective_price(price, discount), 2)
+    sale = {
+        "order_id": order.id,
+        "paid_at": paid_at,
+        "payment": order.payment,
+        "takeaway_or_onsite": order.takeaway_or_onsite,
+        "items": sum(row["quantity"] for row in dish_rows.values()),
+        "revenue": round(sum(row["revenue"] for row in dish_rows.values()), 2),
+    }
+    return sale, list(dish_rows.values())
+
+
+# Add (sign=1) or take back (sign=-1) sales in the rollups, one upsert per rollup table
+def apply_sales(db: Session, sales: list, dish_rows: list, sign: int):
+    if not sales:
+        return
+    paid_at = {sale["order_id"]: sale["paid_at"] for sale in sales}
+
+    totals = {}
+    for sale in sales:
+        key = (sale["paid_at"].date(), sale["paid_at"].hour, sale["payment"], sale["takeaway_or_onsite"])
+        orders, items, revenue = totals.get(key, (0, 0, 0.0))
+        totals[key] = (orders + sign, items + sign * sale["items"], revenue + sign * sale["revenue"])
+    statement = sqlite_insert(SalesRollup).values([
+        {
+            "day": day, "hour": hour, "payment": payment, "takeaway_or_onsite": order_type,
+            "orders": orders, "items": items, "revenue": round(revenue, 2),
+        }
+        for (day, hour, payment, order_type), (orders, items, revenue) in totals.items()
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[SalesRollup.day, SalesRollup.hour, SalesRollup.payment, SalesRollup.takeaway_or_onsite],
+        set_={
+            # excluded["items"]: `.items` is the column collection's own method
+            "orders": SalesRollup.orders + statement.excluded["orders"],
+            "items": SalesRollup.items + statement.excluded["items"],
+            "revenue": func.round(SalesRollup.revenue + statement.excluded["revenue"], 2),
+        },
+    ))
+
+    dish_totals = {}
+    for row in dish_rows:
+        sold = paid_at[row["order_id"]]
+        key = (sold.date(), sold.hour, row["dish_id"])
+        quantity, revenue = dish_totals.get(key, (0, 0.0))
+        dish_totals[key] = (quantity + sign * row["quantity"], revenue + sign * row["revenue"])
+    if not dish_totals:
+        return
+    statement = sqlite_insert(DishSalesRollup).values([
+        {"day": day, "hour": hour, "dish_id": dish_id, "quantity": quantity, "revenue": round(revenue, 2)}
+        for (day, hour, dish_id), (quantity, revenue) in dish_totals.items()
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[DishSalesRollup.day, DishSalesRollup.hour, DishSalesRollup.dish_id],
+        set_={
+            "quantity": DishSalesRollup.quantity + statement.excluded.quantity,
+            "revenue": func.round(DishSalesRollup.revenue + statement.excluded.revenue, 2),
+        },
+    ))
+
+
+def order_dishes(db: Session, order_ids: list) -> dict:
+    dishes = {}
+    rows = db.execute(
+        select(order_dish.c.order_id, Dish.id, Dish.price, Dish.discount)
+        .join(Dish, Dish.id == order_dish.c.dish_id)
+        .where(order_dish.c.order_id.in_(order_ids))
+        .order_by(order_dish.c.order_id, Dish.id)
+    )
+    for order_id, dish_id, price, discount in rows:
+        dishes.setdefault(order_id, []).append((dish_id, price, discount))
+    return dishes
+
+
+# Dishes already sold keep the revenue recorded at the time of the sale; only dishes added
+# since, or extra portions, are priced from the current menu
+def keep_sold_prices(sale: dict, dish_rows: list, recorded_dishes: list) -> tuple:
+    sold = {row["dish_id"]: row for row in recorded_dishes}
+    for row in dish_rows:
+        recorded = sold.get(row["dish_id"])
+        if recorded is None:
+            continue
+        if row["quantity"] == recorded["quantity"]:
+            row["revenue"] = recorded["revenue"]
+        else:
+            unit = recorded["revenue"] / recorded["quantity"]
+            extra = max(row["quantity"] - recorded["quantity"], 0)
+            current = row["revenue"] / row["quantity"]
+            row["revenue"] = round(unit * min(row["quantity"], recorded["quantity"]) + current * extra, 2)
+    return {**sale, "revenue": round(sum(row["revenue"] for row in dish_rows), 2)}, dish_rows
+
+
+def recorded_sale(db: Session, order_id: int) -> tuple:
+    sale = db.execute(select(Sale.__table__).where(Sale.order_id == order_id)).mappings().first()
+    if sale is None:
+        return None, []
+    dish_rows = db.execute(
+        select(SaleDish.__table__).where(SaleDish.order_id == order_id).order_by(SaleDish.dish_id)
+    ).mappings().all()
+    return dict(sale), [dict(row) for row in dish_rows]
+
+
+# Bring the rollups in line with the current state of an order, in the caller's transaction.
+#
+# The order's recorded contribution is compared with what it should contribute now; when they
+# differ the old one is taken back and the new one added. This covers payment, status
+# reverts, edited dishes and deletes (the order is gone, so it contributes nothing). Dishes
+# that were already sold keep their recorded prices, so later menu price changes never
+# rewrite past revenue.
+def sync_order_sales(db: Session, order_id: int):
+    order = db.execute(
+        select(Order.id, Order.status, Order.paid_at, Order.payment, Order.takeaway_or_onsite)
+        .where(Order.id == order_id)
+    ).first()
+
+    wanted, wanted_dishes = None, []
+    if order is not None and order.status in SALE_STATUSES:
+        paid_at = order.paid_at
+        if paid_at is None:
+            paid_at = datetime.now()
+            db.execute(update(Order).where(Order.id == order_id).values(paid_at=paid_at))
+        wanted, wanted_dishes = sale_rows(order, paid_at, order_dishes(db, [order_id]).get(order_id, []))
+    elif order is not None and order.paid_at is not None:
+        db.execute(update(Order).where(Order.id == order_id).values(paid_at=None))
+
+    recorded, recorded_dishes = recorded_sale(db, order_id)
+    if recorded and wanted:
+        wanted, wanted_dishes = keep_sold_prices(wanted, wanted_dishes, recorded_dishes)
+    if (recorded, recorded_dishes) == (wanted, wanted_dishes):
+        return
+    if recorded:
+        apply_sales(db, [recorded], recorded_dishes, -1)
+        db.execute(delete(SaleDish).where(SaleDish.order_id == order_id))
+        db.execute(delete(Sale).where(Sale.order_id == order_id))
+    if wanted:
+        apply_sales(db, [wanted], wanted_dishes, 1)
+        db.execute(insert(Sale), [wanted])
+        if wanted_dishes:
+            db.execute(insert(SaleDish), wanted_dishes)
+
+
+# Take back the sales of orders about to be deleted, for any number of orders at once.
+# order_ids may be a list or a SELECT of order IDs.
+def remove_sales(db: Session, order_ids):
+    sales = [dict(row) for row in db.execute(select(Sale.__table__).where(Sale.order_id.in_(order_ids))).mappings()]
+    if not sales:
+        return
+    sold_ids = [sale["order_id"] for sale in sales]
+    dish_rows = [
+        dict(row)
+        for row in db.execute(select(SaleDish.__table__).where(SaleDish.order_id.in_(sold_ids))).mappings()
+    ]
+    apply_sales(db, sales, dish_rows, -1)
+    db.execute(delete(SaleDish).where(SaleDish.order_id.in_(sold_ids)))
+    db.execute(delete(Sale).where(Sale.order_id.in_(sold_ids)))
+
+
+# Add the paid_at that a status change implies to a single-statement (PATCH) update, so the
+# returned row already carries it; sync_order_sales then finds it set and keeps it
+def stamp_paid_at(values: dict) -> dict:
+    if "status" not in values:
+        return values
+    if values["status"] in {status.value for status in SALE_STATUSES}:
+        return {**values, "paid_at": func.coalesce(Order.paid_at, datetime.now())}
+    return {**values, "paid_at": None}
+
+
+# Recompute every rollup from the orders (backfills, or after changing how sales are counted).
+# Paid orders from before payment times were recorded are stamped with the rebuild time.
+def rebuild_sales(db: Session) -> int:
+    for model in (Sale, SaleDish, SalesRollup, DishSalesRollup):
+        db.execute(delete(model))
+    db.execute(
+        update(Order)
+        .where(Order.status.in_(SALE_STATUSES), Order.paid_at.is_(None))
+        .values(paid_at=datetime.now())
+    )
+
+    count = 0
+    after = 0
+    while True:
+        orders = db.execute(
+            select(Order.id, Order.paid_at, Order.payment, Order.takeaway_or_onsite)
+            .where(Order.status.in_(SALE_STATUSES), Order.id > after)
+            .order_by(Order.id)
+            .limit(REBUILD_BATCH_SIZE)
+        ).all()
+        if not orders:
+            break
+        dishes = order_dishes(db, [order.id for order in orders])
+        sales, dish_rows = [], []
+        for order in orders:
+            sale, rows = sale_rows(order, order.paid_at, dishes.get(order.id, []))
+            sales.append(sale)
+            dish_rows.extend(rows)
+        apply_sales(db, sales, dish_rows, 1)
+        db.execute(insert(Sale), sales)
+        if dish_rows:
+            db.execute(insert(SaleDish), dish_rows)
+        count += len(orders)
+        after = orders[-1].id
+    return count
+
+
+# Inclusive date range of a dashboard query
+def date_range(start: Optional[date], end: Optional[date]) -> tuple:
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    return start, end
+
+
+def average(total, count) -> float:
+    return round(total / count, 2) if count else 0.0
+
+
+# Orders, items, revenue and average order value per day or per hour
+def sales_series(db: Session, start: date, end: date, by_hour: bool = False) -> list:
+    keys = [SalesRollup.day, SalesRollup.hour] if by_hour else [SalesRollup.day]
+    rows = db.execute(
+        select(
+            *keys,
+            func.sum(SalesRollup.orders).label("orders"),
+            func.sum(SalesRollup.items).label("items"),
+            func.round(func.sum(SalesRollup.revenue), 2).label("revenue"),
+        )
+        .where(SalesRollup.day.between(start, end))
+        .group_by(*keys)
+        .having(func.sum(SalesRollup.orders) > 0)
+        .order_by(*keys)
+    )
+    return [
+        {
+            "day": row.day,
+            "hour": row.hour if by_hour else None,
+            "orders": row.orders,
+            "items": row.items,
+            "revenue": row.revenue,
+            "average_order_value": average(row.revenue, row.orders),
+        }
+        for row in rows
+    ]
+
+
+# Portions sold and revenue per dish, in total or per day/hour
+def dish_sales(db: Session, start: date, end: date, granularity: str = "total") -> list:
+    keys = {
+        "total": [],
+        "day": [DishSalesRollup.day],
+        "hour": [DishSalesRollup.day, DishSalesRollup.hour],
+    }[granularity]
+    rows = db.execute(
+        select(
+            DishSalesRollup.dish_id,
+            Dish.name,
+            *keys,
+            func.sum(DishSalesRollup.quantity).label("quantity"),
+            func.round(func.sum(DishSalesRollup.revenue), 2).label("revenue"),
+        )
+        .outerjoin(Dish, Dish.id == DishSalesRollup.dish_id)
+        .where(DishSalesRollup.day.between(start, end))
+        .group_by(DishSalesRollup.dish_id, Dish.name, *keys)
+        .having(func.sum(DishSalesRollup.quantity) > 0)
+        .order_by(*keys, func.sum(DishSalesRollup.revenue).desc(), DishSalesRollup.dish_id)
+    )
+    return [
+        {
+            "dish_id": row.dish_id,
+            "name": row.name,
+            "day": row.day if keys else None,
+            "hour": row.hour if granularity == "hour" else None,
+            "quantity": row.quantity,
+            "revenue": row.revenue,
+        }
+        for row in rows
+    ]
+
+
+# Totals for the range with the payment type and order type mix
+def sales_summary(db: Session, start: date, end: date) -> dict:
+    rows = db.execute(
+        select(
+            SalesRollup.payment,
+            SalesRollup.takeaway_or_onsite,
+            func.sum(SalesRollup.orders).label("orders"),
+            func.sum(SalesRollup.items).label("items"),
+            func.sum(SalesRollup.revenue).label("revenue"),
+        )
+        .where(SalesRollup.day.between(start, end))
+        .group_by(SalesRollup.payment, SalesRollup.takeaway_or_onsite)
+    ).all()
+    orders = sum(row.orders for row in rows)
+    items = sum(row.items for row in rows)
+    revenue = round(sum(row.revenue for row in rows), 2)
+
+    def mix(attribute):
+        groups = {}
+        for row in rows:
+            key = getattr(row, attribute).value
+            group_orders, group_revenue = groups.get(key, (0, 0.0))
+            groups[key] = (group_orders + row.orders, group_revenue + row.revenue)
+        return [
+            {
+                "key": key,
+                "orders": group_orders,
+                "revenue": round(group_revenue, 2),
+                "share": average(group_orders, orders),
+            }
+            for key, (group_orders, group_revenue) in sorted(groups.items())
+            if group_orders > 0
+        ]
+
+    return {
+        "start": start,
+        "end": end,
+        "orders": orders,
+        "items": items,
+        "revenue": revenue,
+        "average_order_value": average(revenue, orders),
+        "average_items_per_order": average(items, orders),
+        "payment_mix": mix("payment"),
+        "order_type_mix": mix("takeaway_or_onsite"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the sales rollups")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute every rollup from the orders")
+    parser.add_argument("--location", default=None, help="Location whose database to use (default: the main database)")
+    args = parser.parse_args()
+
+    from backend.core.database import SessionLocal, initialize_database, location_databases
+
+    if args.location:
+        db = location_databases.get(args.location).sessions()
+    else:
+        initialize_database()
+        db = SessionLocal()
+    try:
+        orders = rebuild_sales(db)
+        db.commit()
+    finally:
+        db.close()
+    print(json.dumps({"orders": orders}))
+
+
+if __name__ == "__main__":
+    main()
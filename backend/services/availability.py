@@ -0,0 +1,216 @@
+import re
+import threading
+import time
+from datetime import date
+from itertools import combinations
+from typing import Iterable, Optional
+from sqlalchemy import select
+from backend.core.tenancy import PerLocation
+from backend.models.reservation import Reservation, ReservationStatus, reservation_table
+from backend.models.table import Table
+
+# A day is split into 15 minute slots; occupancy of one table on one day is a 96-bit integer
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+# How long a reservation holds its tables when only its start hour is known
+DEFAULT_RESERVATION_MINUTES = 120
+
+# Loaded days are rebuilt from the database after this long, which bounds staleness when
+# several worker processes write reservations
+DAY_TTL_SECONDS = 60
+
+# Tables too small on their own that a search combines, the largest first; bounds a search
+# to C(20, 4) = 4845 sets at most
+MAX_COMBINED_TABLES = 20
+
+HOUR_PATTERN = re.compile(r"^\s*(\d{1,2})(?:\s*[:.hH]\s*(\d{2}))?")
+
+
+# Parse a free-form reservation hour ("18:30", "18.30", "18h30", "18") into minutes after midnight
+def parse_hour(hour: Optional[str]) -> Optional[int]:
+    match = HOUR_PATTERN.match(hour or "")
+    if not match:
+        return None
+    hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    if hours > 23 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+# Bitmask of the slots covered by [start, end) minutes, clamped to the day
+def slot_mask(start_minutes: int, end_minutes: int) -> int:
+    first = max(start_minutes, 0) // SLOT_MINUTES
+    last = min(-(-end_minutes // SLOT_MINUTES), SLOTS_PER_DAY)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+# Slots held by a reservation; an hour that cannot be parsed blocks the whole day
+def reservation_mask(hour: Optional[str]) -> int:
+    start = parse_hour(hour)
+    if start is None:
+        return FULL_DAY
+    return slot_mask(start, start + DEFAULT_RESERVATION_MINUTES)
+
+
+# Per-day slot occupancy of every table, maintained incrementally by the reservation routes.
+#
+# Reservations are kept per table so a cancellation can be removed without rescanning:
+#   days[date][table_id] = {reservation_id: mask}
+#   occupied[date][table_id] = OR of those masks
+# A day is loaded from the database the first time it is searched.
+class AvailabilityIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._days = {}
+        self._occupied = {}
+        self._loaded_at = {}
+        self._reservations = {}  # reservation_id -> (date, mask, set of table ids)
+        self._tables = None  # table_id -> (number, number_of_seats)
+
+    # Forget everything; used when tables change (seats, or tables added and removed)
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._occupied.clear()
+            self._loaded_at.clear()
+            self._reservations.clear()
+            self._tables = None
+
+    def _load_tables(self, db):
+        if self._tables is None:
+            rows = db.execute(select(Table.id, Table.number, Table.number_of_seats))
+            self._tables = {row.id: (row.number, row.number_of_seats) for row in rows}
+        return self._tables
+
+    def _load_day(self, db, day: date):
+        loaded_at = self._loaded_at.get(day)
+        if loaded_at is not None and time.monotonic() - loaded_at < DAY_TTL_SECONDS:
+            return
+        self._forget_day(day)
+        self._days[day] = {}
+        self._occupied[day] = {}
+        rows = db.execute(
+            select(Reservation.id, Reservation.hour, reservation_table.c.table_id)
+            .join(reservation_table, reservation_table.c.reservation_id == Reservation.id)
+            .where(Reservation.date == day, Reservation.status == ReservationStatus.placed)
+        )
+        for row in rows:
+            self._add(row.id, day, reservation_mask(row.hour), {row.table_id})
+        self._loaded_at[day] = time.monotonic()
+
+    def _add(self, reservation_id: int, day: date, mask: int, table_ids: set):
+        _, _, current_tables = self._reservations.get(reservation_id, (day, mask, set()))
+        self._reservations[reservation_id] = (day, mask, current_tables | table_ids)
+        for table_id in table_ids:
+            holders = self._days[day].setdefault(table_id, {})
+            holders[reservation_id] = mask
+            self._occupied[day][table_id] = self._occupied[day].get(table_id, 0) | mask
+
+    def _remove_table(self, reservation_id: int, table_id: int):
+        day, mask, table_ids = self._reservations[reservation_id]
+        table_ids.discard(table_id)
+        holders = self._days.get(day, {}).get(table_id, {})
+        holders.pop(reservation_id, None)
+        occupied = 0
+        for holder_mask in holders.values():
+            occupied |= holder_mask
+        self._occupied[day][table_id] = occupied
+
+    # A reservation was deleted or canceled
+    def discard(self, reservation_id: int):
+        with self._lock:
+            if reservation_id not in self._reservations:
+                return
+            for table_id in list(self._reservations[reservation_id][2]):
+                self._remove_table(reservation_id, table_id)
+            del self._reservations[reservation_id]
+
+    # A reservation was created or updated. table_ids=None keeps the tables already recorded;
+    # for a reservation that is not tracked (e.g. canceled, then placed again) its tables are
+    # unknown here, so its day is read again from the database on the next search.
+    def record(self, reservation_id: int, day: date, hour: str, status, table_ids: Optional[Iterable[int]] = None):
+        with self._lock:
+            previous = self._reservations.get(reservation_id)
+            previous_tables = set(previous[2]) if previous else None  # discard() empties the set
+            self.discard(reservation_id)
+            if status not in (ReservationStatus.placed, ReservationStatus.placed.value):
+                return
+            if day not in self._loaded_at:
+                return  # The day is read from the database when it is first searched
+            if table_ids is None:
+                if previous_tables is None:
+                    self._forget_day(day)
+                    return
+                table_ids = previous_tables
+            self._add(reservation_id, day, reservation_mask(hour), set(table_ids))
+
+    def _forget_day(self, day: date):
+        for reservation_id, (reserved_day, _, _) in list(self._reservations.items()):
+            if reserved_day == day:
+                del self._reservations[reservation_id]
+        self._loaded_at.pop(day, None)
+        self._days.pop(day, None)
+        self._occupied.pop(day, None)
+
+    # Tables free for the whole [start, end) window on a day
+    def free_tables(self, db, day: date, start_minutes: int, end_minutes: int) -> list:
+        with self._lock:
+            tables = self._load_tables(db)
+            self._load_day(db, day)
+            window = slot_mask(start_minutes, end_minutes)
+            occupied = self._occupied[day]
+            return [table_id for table_id in tables if not occupied.get(table_id, 0) & window]
+
+    # Candidate sets of free tables seating the party, fewest tables and least spare seats first.
+    #
+    # A table that seats the party alone is only offered alone, so combinations are built from
+    # the tables too small on their own, at most MAX_COMBINED_TABLES of them (the largest), and
+    # only from those that can reach the party size with the largest partners. The search stops
+    # as soon as `limit` candidates are found, and runs on a snapshot, outside the index lock.
+    def search(self, db, day: date, start_minutes: int, end_minutes: int, party_size: int,
+               max_tables: int = 2, limit: int = 10) -> list:
+        with self._lock:
+            free = self.free_tables(db, day, start_minutes, end_minutes)
+            tables = {table_id: self._tables[table_id] for table_id in free}
+
+        seats = {table_id: number_of_seats for table_id, (_, number_of_seats) in tables.items()}
+        singles = sorted(
+            (seats[table_id] - party_size, table_id) for table_id in free if seats[table_id] >= party_size
+        )
+        candidates = [(1, spare, (table_id,)) for spare, table_id in singles[:limit]]
+
+        small = sorted(
+            (table_id for table_id in free if 0 < seats[table_id] < party_size),
+            key=lambda table_id: -seats[table_id],
+        )[:MAX_COMBINED_TABLES]
+        largest = [seats[table_id] for table_id in small]
+        for size in range(2, max_tables + 1):
+            if len(candidates) >= limit or sum(largest[:size]) < party_size:
+                continue
+            partners = sum(largest[:size - 1])
+            usable = [table_id for table_id in small if seats[table_id] + partners >= party_size]
+            level = []
+            for table_set in combinations(usable, size):
+                total = sum(seats[table_id] for table_id in table_set)
+                if total >= party_size:
+                    level.append((size, total - party_size, table_set))
+                    if len(candidates) + len(level) >= limit:
+                        break
+            level.sort(key=lambda candidate: candidate[1])
+            candidates.extend(level)
+
+        return [
+            {
+                "table_ids": list(table_set),
+                "table_numbers": [tables[table_id][0] for table_id in table_set],
+                "seats": sum(seats[table_id] for table_id in table_set),
+            }
+            for _, _, table_set in candidates[:limit]
+        ]
+
+
+availability = PerLocation(AvailabilityIndex)
@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from backend.schemas.bulk import BulkCreated, BulkError, BulkResult
+
+
+# Collects accepted rows and per-row errors while a bulk payload is validated
+class BulkBatch:
+    def __init__(self):
+        self.indexes = []
+        self.rows = []
+        self.errors = []
+
+    def accept(self, index: int, row: dict):
+        self.indexes.append(index)
+        self.rows.append(row)
+
+    def reject(self, index: int, detail: str):
+        self.errors.append(BulkError(index=index, detail=detail))
+
+    def result(self, ids) -> BulkResult:
+        return BulkResult(
+            created=[BulkCreated(index=index, id=id_) for index, id_ in zip(self.indexes, ids)],
+            errors=sorted(self.errors, key=lambda error: error.index),
+        )
+
+    # Validate every row of a payload with the create schema. Rows that fail are rejected with
+    # the schema's messages; the others are returned as (index, parsed row) pairs.
+    def parse(self, schema, rows: list) -> list:
+        parsed = []
+        for index, row in enumerate(rows):
+            try:
+                parsed.append((index, schema.model_validate(row)))
+            except ValidationError as error:
+                self.reject(index, validation_detail(error))
+        return parsed
+
+
+# "field: message" for each error of a row, e.g. "amount: Input should be a valid integer"
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+# Values of `column` that already exist in the database, in one query
+def existing_values(db, column, values) -> set:
+    values = set(values)
+    if not values:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(values))))
+
+
+# Values that appear more than once in a payload
+def duplicated_values(values) -> set:
+    seen, duplicates = set(), set()
+    for value in values:
+        if value in seen:
+            duplicates.add(value)
+        seen.add(value)
+    return duplicates
+
+
+# Insert every row with one executemany INSERT ... RETURNING id (batched by SQLAlchemy into
+# multi-row VALUES statements). SQLite assigns rowids in insertion order, so the sorted ids line
+# up with the rows; asking SQLAlchemy to sort by parameter order would fall back to one
+# statement per row on SQLite.
+def insert_many(db, model, rows) -> list:
+    if not rows:
+        return []
+    return sorted(db.scalars(insert(model).returning(model.id), rows))
+
+
+# Delete every row matching a condition with one DELETE ... RETURNING id; the database's
+# ON DELETE actions take care of the dependent rows
+def delete_where(db, model, condition) -> list:
+    return list(db.scalars(delete(model).where(condition).returning(model.id)))
+
+
+# Combine the filters given to a bulk delete. At least one is required, so an empty request
+# cannot delete the whole table.
+def bulk_filter(*conditions):
+    conditions = [condition for condition in conditions if condition is not None]
+    if not conditions:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one filter is required")
+    return and_(*conditions)
+
+
+# Run the inserts of a bulk request in one transaction; a conflict with a concurrent writer
+# rolls the whole batch back and is reported as 409
+@contextmanager
+def bulk_transaction(db):
+    try:
+        yield
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Bulk insert conflicts with existing records",
+        )
@@ -0,0 +1,10 @@
+from backend.core.validation import InvariantError, validator, has_parent
+from backend.models.client import Client
+
+
+# A client must be a person
+@validator(Client)
+def validate_clients(session, new, dirty):
+    for client in new + dirty:
+        if not has_parent(client, "person_id", "person"):
+            raise InvariantError("A client must be associated with a person.")
@@ -0,0 +1,79 @@
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from backend.models.address_history import AddressHistory
+from backend.models.client import Client
+from backend.models.order import Order
+from backend.models.person import Person
+from backend.models.reservation import Reservation
+from backend.services.analytics import remove_sales
+from backend.services.availability import availability
+from backend.services.bulk import delete_where
+from backend.services.kitchen import kitchen_queue
+
+# Set-based deletes of orders, reservations, addresses, clients and people.
+#
+# Each delete is one DELETE ... RETURNING id per table named here; the rows depending on them
+# (addresses, contracts, association rows, ...) go through the schema's ON DELETE actions, so
+# nothing is loaded into the session. The sales rollups are not tied to the orders by foreign
+# keys, so the sales of the orders are taken back first. The caller commits, then calls
+# forget() so the kitchen queue and the table availability drop what was deleted.
+
+
+# IDs removed by a delete, including the orders and reservations that went with them
+class Deleted:
+    def __init__(self, ids, order_ids=(), reservation_ids=()):
+        self.ids = list(ids)
+        self.order_ids = list(order_ids)
+        self.reservation_ids = list(reservation_ids)
+
+    def forget(self):
+        for order_id in self.order_ids:
+            kitchen_queue.remove(order_id)
+        for reservation_id in self.reservation_ids:
+            availability.discard(reservation_id)
+
+
+def delete_orders(db: Session, condition) -> Deleted:
+    remove_sales(db, select(Order.id).where(condition))
+    ids = delete_where(db, Order, condition)
+    return Deleted(ids, order_ids=ids)
+
+
+# The tables of a deleted reservation are unlinked by the database (SET NULL)
+def delete_reservations(db: Session, condition) -> Deleted:
+    ids = delete_where(db, Reservation, condition)
+    return Deleted(ids, reservation_ids=ids)
+
+
+# Orders and reservations of the matching clients. The orders are deleted explicitly rather
+# than through the client cascade: the cascade from their address would SET NULL on the
+# orders' NOT NULL address_history_id if it reached them first.
+def delete_client_dependents(db: Session, client_ids) -> Deleted:
+    orders = delete_orders(db, Order.client_id.in_(client_ids))
+    reservation_ids = db.scalars(select(Reservation.id).where(Reservation.client_id.in_(client_ids))).all()
+    return Deleted((), orders.order_ids, reservation_ids)
+
+
+# Addresses are deleted with the orders delivered to them, for the same reason: the database
+# would SET NULL on the orders' NOT NULL address_history_id
+def delete_address_histories(db: Session, condition) -> Deleted:
+    orders = delete_orders(db, Order.address_history_id.in_(select(AddressHistory.id).where(condition)))
+    ids = delete_where(db, AddressHistory, condition)
+    return Deleted(ids, orders.order_ids)
+
+
+# A client is deleted together with its person (Client.person is a composition)
+def delete_clients(db: Session, condition) -> Deleted:
+    dependents = delete_client_dependents(db, select(Client.id).where(condition))
+    deleted = db.execute(delete(Client).where(condition).returning(Client.id, Client.person_id)).all()
+    delete_where(db, Person, Person.id.in_([person_id for _, person_id in deleted]))
+    return Deleted([client_id for client_id, _ in deleted], dependents.order_ids, dependents.reservation_ids)
+
+
+# A person is deleted with whichever role they have (client, employee or deliverer) and
+# everything depending on it
+def delete_people(db: Session, condition) -> Deleted:
+    people = select(Person.id).where(condition)
+    dependents = delete_client_dependents(db, select(Client.id).where(Client.person_id.in_(people)))
+    ids = delete_where(db, Person, condition)
+    return Deleted(ids, dependents.order_ids, dependents.reservation_ids)
@@ -0,0 +1,10 @@
+from backend.core.validation import InvariantError, validator, has_parent
+from backend.models.deliver import Deliver
+
+
+# A deliver must be a person
+@validator(Deliver)
+def validate_delivers(session, new, dirty):
+    for deliver in new + dirty:
+        if not has_parent(deliver, "person_id", "person"):
+            raise InvariantError("A deliver must be associated with a person.")
@@ -1 +1,13 @@
+from backend.core.validation import InvariantError, validator, flushed, collection_size, has_parent
+from backend.models.delivery import Delivery
 
+
+# A delivery must have a deliverer and at least one ingredient
+@validator(Delivery)
+def validate_deliveries(session, new, dirty):
+    for delivery, pending in flushed(new, dirty):
+        if not has_parent(delivery, "deliver_id", "deliver"):
+            raise InvariantError("A delivery must have a deliverer assigned.")
+        ingredients = collection_size(delivery, "ingredients", pending)
+        if ingredients is not None and ingredients < 1:
+            raise InvariantError("A delivery must include at least one ingredient.")
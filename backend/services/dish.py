@@ -0,0 +1,13 @@
+from backend.core.validation import InvariantError, validator, flushed, collection_size
+from backend.models.dish import Dish
+
+MIN_INGREDIENTS = 2
+
+
+# A dish must have at least two ingredients
+@validator(Dish)
+def validate_dishes(session, new, dirty):
+    for dish, pending in flushed(new, dirty):
+        ingredients = collection_size(dish, "ingredients", pending)
+        if ingredients is not None and ingredients < MIN_INGREDIENTS:
+            raise InvariantError("A dish must have at least 2 ingredients.")
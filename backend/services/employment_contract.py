@@ -0,0 +1,10 @@
+from backend.core.validation import InvariantError, validator, has_parent
+from backend.models.employment_contract import EmploymentContract
+
+
+# An employment contract must belong to a restaurant employee
+@validator(EmploymentContract)
+def validate_employment_contracts(session, new, dirty):
+    for contract in new + dirty:
+        if not has_parent(contract, "employee_id", "restaurant_employee"):
+            raise InvariantError("An EmploymentContract must be associated with a RestaurantEmployee.")
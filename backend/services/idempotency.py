@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.core.tenancy import PerLocation
+from backend.models.idempotency import IdempotencyKey
+
+# Stored responses are replayed for a day; retries of a flaky tablet arrive within minutes
+TTL_SECONDS = 24 * 60 * 60
+# A key whose first request has not finished after this long (a crashed worker) is taken over
+PENDING_SECONDS = 60
+# Responses kept in memory in front of the table
+CACHE_SIZE = 1024
+
+
+# Response of the first request made with a key
+class StoredResponse:
+    __slots__ = ("fingerprint", "status_code", "content_type", "body")
+
+    def __init__(self, fingerprint: str, status_code: int, content_type: Optional[str], body: bytes):
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.content_type = content_type
+        self.body = body
+
+
+# Marker returned by claim_key() while another process serves the key
+PENDING = object()
+
+
+# Take a key for a request. Returns None when the caller is to serve the request, PENDING while
+# another worker serves it, or its StoredResponse. The insert runs under SQLite's write lock,
+# so exactly one worker process claims a key.
+def claim_key(db: Session, key: str, fingerprint: str):
+    now = datetime.now()
+    claimed = db.execute(
+        sqlite_insert(IdempotencyKey)
+        .values(key=key, fingerprint=fingerprint, created_at=now)
+        .on_conflict_do_nothing()
+        .returning(IdempotencyKey.key)
+    ).first()
+    if claimed is not None:
+        db.commit()
+        return None
+
+    row = db.execute(select(IdempotencyKey).where(IdempotencyKey.key == key)).scalar_one()
+    expired = row.created_at < now - timedelta(seconds=TTL_SECONDS)
+    abandoned = row.status_code is None and row.created_at < now - timedelta(seconds=PENDING_SECONDS)
+    if expired or abandoned:
+        # Conditional on the old timestamp, so one of several workers takes the key over
+        taken = db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.created_at == row.created_at)
+            .values(fingerprint=fingerprint, status_code=None, content_type=None, body=None, created_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return None if taken else PENDING
+    db.commit()
+    if row.status_code is None:
+        return PENDING
+    return StoredResponse(row.fingerprint, row.status_code, row.content_type, row.body)
+
+
+# Store the response of a claimed key
+def complete_key(db: Session, key: str, response: StoredResponse):
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .values(status_code=response.status_code, content_type=response.content_type, body=response.body)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+# Give up a claimed key whose request failed, so a retry runs it again
+def release_key(db: Session, key: str):
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)))
+    db.commit()
+
+
+# Delete the expired keys; run periodically by the background jobs
+def purge_expired_keys(db: Session) -> int:
+    cutoff = datetime.now() - timedelta(seconds=TTL_SECONDS)
+    return db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount
+
+
+# In-memory front of the table: an LRU of recent responses with TTL eviction, plus the keys
+# whose first request this process is serving. in_flight is only touched on the event loop.
+class IdempotencyStore:
+    def __init__(self, capacity: int = CACHE_SIZE, ttl: float = TTL_SECONDS):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.in_flight = {}  # key -> asyncio.Event set when the first request finishes
+        self._lock = threading.Lock()
+        self._responses = OrderedDict()  # key -> (expires_at, StoredResponse)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._responses[key]
+                return None
+            self._responses.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: StoredResponse):
+        now = time.monotonic()
+        with self._lock:
+            self._responses[key] = (now + self.ttl, response)
+            self._responses.move_to_end(key)
+            while self._responses:
+                oldest_key, (expires_at, _) = next(iter(self._responses.items()))
+                if len(self._responses) <= self.capacity and expires_at > now:
+                    break
+                del self._responses[oldest_key]
+
+
+# Keys are stored in each location's database
+idempotency_store = PerLocation(IdempotencyStore)
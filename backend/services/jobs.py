@@ -0,0 +1,324 @@
+# Background jobs: deferred work run outside the request path by worker threads.
+#
+# Jobs are rows of the `job` table of each database (the main one and every location's), so
+# they survive restarts and several worker processes can share one queue: a worker claims a
+# job with a single UPDATE ... RETURNING, which SQLite serializes. A failed job is retried with
+# exponential backoff until it runs out of attempts. Periodic jobs are enqueued once per
+# interval, deduplicated by a key naming the interval, so restarts and extra processes never
+# run them twice.
+#
+# Tasks are plain functions (db, **payload) registered with @task; they run in their own
+# transaction, committed when they return. A job whose worker dies is picked up again once its
+# lease expires, so tasks must be safe to run twice.
+#
+#   python -m backend.services.jobs run
+#   python -m backend.services.jobs enqueue sales.rebuild
+import argparse
+import json
+import random
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.core.config import settings
+from backend.core.database import (
+    LocationDatabase,
+    SessionLocal,
+    current_location,
+    location_databases,
+    session_factory,
+)
+from backend.models.job import Job, JobStatus
+
+# Seconds a claimed job may run before another worker may take it over
+LEASE_SECONDS = 10 * 60
+# Retry delays: BACKOFF_SECONDS, twice that, four times that... up to MAX_BACKOFF_SECONDS
+BACKOFF_SECONDS = 5
+MAX_BACKOFF_SECONDS = 60 * 60
+# Seconds an idle worker sleeps before looking at the queue again
+POLL_SECONDS = 1.0
+# Finished jobs are kept this long for inspection
+KEEP_FINISHED_DAYS = 7
+
+# Task functions by name
+TASKS = {}
+# Periodic jobs: (name, interval in seconds, payload)
+PERIODIC = []
+
+
+# Register a task function under a name
+def task(name: str):
+    def register(function):
+        TASKS[name] = function
+        return function
+
+    return register
+
+
+# Enqueue a task every `seconds`
+def every(seconds: int, name: str, payload: Optional[dict] = None):
+    PERIODIC.append((name, seconds, payload or {}))
+
+
+# Add a job to the queue of the session's database. With a key, a job already queued under the
+# same key wins and None is returned.
+def enqueue(
+    db: Session,
+    name: str,
+    payload: Optional[dict] = None,
+    run_at: Optional[datetime] = None,
+    key: Optional[str] = None,
+    max_attempts: int = 5,
+) -> Optional[int]:
+    if name not in TASKS:
+        raise ValueError(f"Unknown task '{name}'")
+    statement = sqlite_insert(Job).values(
+        name=name,
+        payload=json.dumps(payload or {}),
+        key=key,
+        status=JobStatus.queued,
+        max_attempts=max_attempts,
+        run_at=run_at or datetime.now(),
+        created_at=datetime.now(),
+    )
+    if key is not None:
+        statement = statement.on_conflict_do_nothing(index_elements=[Job.key])
+    job_id = db.execute(statement.returning(Job.id)).scalar()
+    job_runner.wake()
+    return job_id
+
+
+# Take the next due job (or one whose worker's lease has expired) and commit the claim
+def claim_job(db: Session, lease_seconds: int = LEASE_SECONDS):
+    now = datetime.now()
+    due = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == JobStatus.queued, Job.run_at <= now),
+            and_(Job.status == JobStatus.running, Job.locked_until < now),
+        ))
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    job = db.execute(
+        update(Job)
+        .where(Job.id == due)
+        .values(
+            status=JobStatus.running,
+            attempts=Job.attempts + 1,
+            started_at=now,
+            locked_until=now + timedelta(seconds=lease_seconds),
+        )
+        .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    return job
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return delay + random.uniform(0, delay / 4)
+
+
+# Run a claimed job and record its outcome
+def run_job(db: Session, job):
+    try:
+        function = TASKS.get(job.name)
+        if function is None:
+            raise LookupError(f"Unknown task '{job.name}'")
+        result = function(db, **json.loads(job.payload))
+        db.commit()
+        values = {"status": JobStatus.succeeded, "result": json.dumps(result, default=str), "last_error": None}
+    except Exception:
+        db.rollback()
+        values = {"last_error": traceback.format_exc(limit=5)}
+        if job.attempts < job.max_attempts and job.name in TASKS:
+            values.update(
+                status=JobStatus.queued,
+                run_at=datetime.now() + timedelta(seconds=backoff_seconds(job.attempts)),
+            )
+        else:
+            values.update(status=JobStatus.failed)
+    if values["status"] != JobStatus.queued:
+        values["finished_at"] = datetime.now()
+    db.execute(
+        update(Job)
+        .where(Job.id == job.id)
+        .values(locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+# Worker threads and the periodic scheduler of this process. Each worker polls the queues of
+# the main database and of the configured locations, and runs one job at a time.
+#
+# Only locations whose database is already open are polled, and polling does not count as a
+# use: opening closed locations would evict the ones serving requests (dropping their kitchen
+# queues and menu snapshots) as soon as there are more locations than
+# RESTAURANT_MAX_OPEN_LOCATIONS. Jobs of a closed location wait until a request opens it.
+# A runner serving no requests (python -m backend.services.jobs run) opens every location on
+# its own engines instead, outside the bounded pool.
+class JobRunner:
+    def __init__(self, workers: int = settings.job_workers, locations=settings.locations, own_databases: bool = False):
+        self.workers = workers
+        self.locations = (None, *locations)
+        self.own_databases = own_databases
+        self._databases = {}
+        self._databases_lock = threading.Lock()
+        self._threads = []
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._slots = {}  # (location, name) -> last periodic slot enqueued
+
+    def start(self):
+        if self._threads or not self.workers:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self.work, name=f"job-worker-{number}", daemon=True)
+            for number in range(self.workers)
+        ]
+        if PERIODIC:
+            self._threads.append(threading.Thread(target=self.schedule, name="job-scheduler", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    # Stop after the running jobs finish
+    def stop(self, timeout: Optional[float] = None):
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # Have an idle worker look at the queue now
+    def wake(self):
+        self._wake.set()
+
+    def work(self):
+        while not self._stopping.is_set():
+            if not self.run_next():
+                self._wake.wait(POLL_SECONDS)
+                self._wake.clear()
+
+    # New session on the database of a location, or None if the location is not open
+    def session(self, location: Optional[str]) -> Optional[Session]:
+        if location is None:
+            return SessionLocal()
+        if self.own_databases:
+            with self._databases_lock:
+                database = self._databases.get(location)
+                if database is None:
+                    database = self._databases[location] = LocationDatabase(
+                        settings.location_database_url.format(location=location)
+                    )
+        else:
+            database = location_databases.peek(location, touch=False)
+        return database.sessions() if database is not None else None
+
+    # Run one due job of any database; False when every queue is empty
+    def run_next(self) -> bool:
+        for location in self.locations:
+            db = self.session(location)
+            if db is None:
+                continue
+            token = current_location.set(location)
+            try:
+                job = claim_job(db)
+                if job is not None:
+                    run_job(db, job)
+                    return True
+            except Exception:
+                traceback.print_exc()
+            finally:
+                db.close()
+                current_location.reset(token)
+        return False
+
+    def schedule(self):
+        while not self._stopping.is_set():
+            self.enqueue_periodic()
+            self._stopping.wait(POLL_SECONDS)
+
+    # Enqueue the periodic jobs whose interval has started, once per database and interval
+    def enqueue_periodic(self):
+        now = time.time()
+        for location in self.locations:
+            due = [
+                (name, payload, int(now // seconds))
+                for name, seconds, payload in PERIODIC
+                if self._slots.get((location, name)) != int(now // seconds)
+            ]
+            if not due:
+                continue
+            db = self.session(location)
+            if db is None:
+                continue
+            token = current_location.set(location)
+            try:
+                for name, payload, slot in due:
+                    enqueue(db, name, payload, key=f"{name}@{slot}", max_attempts=1)
+                db.commit()
+                for name, _, slot in due:
+                    self._slots[(location, name)] = slot
+            except Exception:
+                traceback.print_exc()
+            finally:
+                db.close()
+                current_location.reset(token)
+
+
+job_runner = JobRunner()
+
+
+# Delete the jobs that finished more than KEEP_FINISHED_DAYS ago
+def purge_finished_jobs(db: Session) -> int:
+    cutoff = datetime.now() - timedelta(days=KEEP_FINISHED_DAYS)
+    return db.execute(
+        delete(Job).where(Job.status.in_((JobStatus.succeeded, JobStatus.failed)), Job.finished_at < cutoff)
+    ).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run or enqueue background jobs")
+    parser.add_argument("command", choices=["run", "enqueue"], help="run: work the queues until interrupted; enqueue: add a job")
+    parser.add_argument("name", nargs="?", help="Task to enqueue")
+    parser.add_argument("--payload", default="{}", help="JSON keyword arguments of the task")
+    parser.add_argument("--location", default=None, help="Location whose queue to use (default: the main database)")
+    args = parser.parse_args()
+
+    import backend.services.tasks  # noqa: F401
+    from backend.core.database import initialize_database
+
+    initialize_database()
+    if args.command == "run":
+        runner = JobRunner(workers=max(settings.job_workers, 1), own_databases=True)
+        runner.start()
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            runner.stop()
+        return
+
+    if not args.name:
+        parser.error("enqueue needs a task name")
+    current_location.set(args.location)
+    db = session_factory()()
+    try:
+        job_id = enqueue(db, args.name, json.loads(args.payload))
+        db.commit()
+    finally:
+        db.close()
+    print(json.dumps({"id": job_id}))
+
+
+if __name__ == "__main__":
+    main()
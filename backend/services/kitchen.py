@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+import time
+from enum import Enum
+from sqlalchemy import select
+from backend.core.tenancy import PerLocation
+from backend.models.order import Order, OrderStatus
+
+# Orders leave the kitchen queue once completed
+ACTIVE_STATUSES = [status for status in OrderStatus if status != OrderStatus.completed]
+
+# Events buffered per subscriber before it is told to resynchronize
+SUBSCRIBER_BUFFER = 1000
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# The queue is reloaded from the database after this long, so orders written by other worker
+# processes show up (the order routes only feed the queue of their own process)
+KITCHEN_TTL_SECONDS = 30
+
+
+def enum_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+# The fields a kitchen display shows for an order
+def order_summary(order) -> dict:
+    return {
+        "id": order.id,
+        "number": order.number,
+        "status": enum_value(order.status),
+        "hour": order.hour,
+        "takeaway_or_onsite": enum_value(order.takeaway_or_onsite),
+        "note": order.note,
+        "delay": bool(order.delay),
+    }
+
+
+# In-memory queue of active orders grouped by status, fed by the order routes.
+#
+# Every create/update/delete of an order is applied here and status transitions are pushed to
+# the subscribed SSE streams, so kitchen displays do not query the database for them. The
+# queue is reloaded once it is older than KITCHEN_TTL_SECONDS; the transitions found by a
+# reload (writes of other workers) are pushed like the local ones.
+class KitchenQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._by_status = {status.value: {} for status in ACTIVE_STATUSES}
+        self._status_of = {}  # order_id -> status value
+        self._subscribers = set()  # (event loop, asyncio.Queue)
+        self._sequence = 0
+
+    def ensure_loaded(self, db):
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < KITCHEN_TTL_SECONDS:
+                return
+            by_status = {status.value: {} for status in ACTIVE_STATUSES}
+            status_of = {}
+            rows = db.execute(
+                select(
+                    Order.id, Order.number, Order.status, Order.hour,
+                    Order.takeaway_or_onsite, Order.note, Order.delay,
+                )
+                .where(Order.status.in_(ACTIVE_STATUSES))
+                .order_by(Order.id)
+            )
+            for row in rows:
+                summary = order_summary(row)
+                by_status[summary["status"]][row.id] = summary
+                status_of[row.id] = summary["status"]
+            if self._loaded_at is not None:
+                self._announce_reload(by_status, status_of)
+            self._by_status, self._status_of = by_status, status_of
+            self._loaded_at = time.monotonic()
+
+    # Called with the lock held: push the transitions between the queue and a reload of it
+    def _announce_reload(self, by_status: dict, status_of: dict):
+        for order_id in sorted(self._status_of.keys() | status_of.keys()):
+            previous, current = self._status_of.get(order_id), status_of.get(order_id)
+            if previous == current:
+                continue
+            summary = by_status[current][order_id] if current else self._by_status[previous][order_id]
+            self._broadcast({"order": summary, "from": previous, "to": current})
+
+    # Current queue: {status: [orders, oldest first]}
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {status: list(orders.values()) for status, orders in self._by_status.items()}
+
+    # An order was created or updated; push an event if its status changed
+    def publish(self, order):
+        summary = order_summary(order)
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            previous = self._status_of.pop(summary["id"], None)
+            if previous is not None:
+                self._by_status[previous].pop(summary["id"], None)
+            if summary["status"] in self._by_status:
+                self._by_status[summary["status"]][summary["id"]] = summary
+                self._status_of[summary["id"]] = summary["status"]
+            if previous == summary["status"]:
+                return
+            self._broadcast({"order": summary, "from": previous, "to": summary["status"]})
+
+    # An order was deleted
+    def remove(self, order_id: int):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            previous = self._status_of.pop(order_id, None)
+            if previous is None:
+                return
+            summary = self._by_status[previous].pop(order_id)
+            self._broadcast({"order": summary, "from": previous, "to": None})
+
+    # Called with the lock held; subscribers live on the event loop, publishers on worker threads
+    def _broadcast(self, event: dict):
+        self._sequence += 1
+        event["sequence"] = self._sequence
+        for loop, queue in list(self._subscribers):
+            loop.call_soon_threadsafe(self._deliver, queue, event)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: dict):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled display gets a fresh snapshot instead of an unbounded backlog
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"resync": True})
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers = {entry for entry in self._subscribers if entry[1] is not queue}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# Format one server-sent event
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+kitchen_queue = PerLocation(KitchenQueue)
@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from backend.core.tenancy import PerLocation
+from backend.models.dish import Dish, dish_ingredient
+from backend.models.ingredient import Ingredient
+from backend.schemas.menu import Menu, MenuDish, MenuIngredient
+
+# A stored document is rebuilt after this long, which bounds how stale it can be when another
+# worker process writes dishes or ingredients (invalidate() only reaches this process)
+MENU_TTL_SECONDS = 60
+
+
+# Price after the dish discount, which is a fraction of the price (0.15 = 15% off)
+def effective_price(price: float, discount: Optional[float]) -> float:
+    if not discount:
+        return round(price, 2)
+    return round(price * (1 - min(max(discount, 0.0), 1.0)), 2)
+
+
+# Build the menu document with two queries: dishes, then every dish/ingredient pair
+def build_menu(db) -> Menu:
+    ingredients_by_dish = {}
+    rows = db.execute(
+        select(dish_ingredient.c.dish_id, Ingredient.id, Ingredient.name)
+        .join(Ingredient, Ingredient.id == dish_ingredient.c.ingredient_id)
+        .order_by(dish_ingredient.c.dish_id, Ingredient.name)
+    )
+    for dish_id, ingredient_id, name in rows:
+        ingredients_by_dish.setdefault(dish_id, []).append(MenuIngredient(id=ingredient_id, name=name))
+
+    dishes = db.execute(
+        select(Dish.id, Dish.name, Dish.description, Dish.price, Dish.discount).order_by(Dish.name, Dish.id)
+    )
+    return Menu(
+        generated_at=datetime.now(),
+        dishes=[
+            MenuDish(
+                id=dish.id,
+                name=dish.name,
+                description=dish.description,
+                price=dish.price,
+                discount=dish.discount,
+                effective_price=effective_price(dish.price, dish.discount),
+                ingredients=ingredients_by_dish.get(dish.id, []),
+            )
+            for dish in dishes
+        ],
+    )
+
+
+# Pre-serialized menu document.
+#
+# The dish and ingredient routes call invalidate() after every write; the next read rebuilds
+# the document once and every read after that returns the same bytes object. A generation
+# counter keeps a build that raced with a write from being stored. Writes made by other
+# workers are picked up once the document is older than MENU_TTL_SECONDS.
+class MenuSnapshot:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._body = None
+        self._built_at = 0.0
+        self._generation = 0
+
+    def invalidate(self, *args):
+        with self._lock:
+            self._generation += 1
+            self._body = None
+
+    def get(self, db) -> bytes:
+        body = self._body
+        if body is not None and time.monotonic() - self._built_at < MENU_TTL_SECONDS:
+            return body
+        with self._lock:
+            generation = self._generation
+        built_at = time.monotonic()
+        body = build_menu(db).model_dump_json().encode()
+        with self._lock:
+            if generation == self._generation:
+                self._body = body
+                self._built_at = built_at
+        return body
+
+
+menu_snapshot = PerLocation(MenuSnapshot)
@@ -0,0 +1,18 @@
+from backend.core.validation import InvariantError, validator, flushed, collection_size, has_parent
+from backend.models.order import Order
+
+MIN_EMPLOYEES = 2
+
+
+# An order must have a client, at least one dish and at least two restaurant employees
+@validator(Order)
+def validate_orders(session, new, dirty):
+    for order, pending in flushed(new, dirty):
+        if not has_parent(order, "client_id", "client"):
+            raise InvariantError("An order must be associated with a client.")
+        dishes = collection_size(order, "dishes", pending)
+        if dishes is not None and dishes < 1:
+            raise InvariantError("An order must include at least one dish.")
+        employees = collection_size(order, "restaurant_employee", pending)
+        if employees is not None and employees < MIN_EMPLOYEES:
+            raise InvariantError("An order must be associated with at least two restaurant employees.")
@@ -0,0 +1,119 @@
+import re
+import threading
+from datetime import date
+from typing import Optional
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from backend.core.config import is_memory_url, settings
+from backend.core.database import apply_pragmas
+from backend.core.tenancy import PerLocation
+from backend.models.order import OrderNumberSequence
+
+# Format of the numbers handed out by the server
+SERVER_NUMBER = re.compile(r"\d{8}-\d{4,}")
+
+# Numbers reserved at once by a process. Numbers left in a block when the process stops or
+# the day ends are never handed out, so the daily sequence can have gaps.
+BLOCK_SIZE = 20
+
+
+def format_number(day: date, value: int) -> str:
+    return f"{day:%Y%m%d}-{value:04d}"
+
+
+# Numbers in the server's format are left to the allocator: a client sending one would take a
+# number the server hands out later
+def is_server_number(number: str) -> bool:
+    return SERVER_NUMBER.fullmatch(number) is not None
+
+
+_sequence_engines = {}
+_sequence_engines_lock = threading.Lock()
+
+
+# Engine the blocks of a database are reserved on. It keeps no pool, so a reservation does not
+# wait for the connection held by the request's session when the write pool has a single one
+# (prod profile); async engines get a sync one on the same file. An in-memory database only
+# exists on its own connection, so it is reserved through the request's engine.
+def sequence_engine(bind):
+    url = bind.url.set(drivername="sqlite")
+    if is_memory_url(url.render_as_string(hide_password=False)):
+        return bind
+    key = url.render_as_string(hide_password=False)
+    with _sequence_engines_lock:
+        engine = _sequence_engines.get(key)
+        if engine is None:
+            engine = create_engine(url, poolclass=NullPool, connect_args={"check_same_thread": False})
+            apply_pragmas(engine, settings.profile.pragmas)
+            _sequence_engines[key] = engine
+    return engine
+
+
+# Reserve the next block of a day's numbers on a connection of its own to the database of db,
+# committed at once: a reservation is never undone by the rollback of the order that needed
+# it, and the work of the request's session is not committed with it. The upsert runs under
+# SQLite's write lock, so worker processes always receive disjoint blocks. Returns the first
+# and last number.
+def reserve_block(db: Session, day: date, size: int = BLOCK_SIZE) -> tuple:
+    statement = sqlite_insert(OrderNumberSequence).values(day=day, next_value=1 + size)
+    statement = statement.on_conflict_do_update(
+        index_elements=[OrderNumberSequence.day],
+        set_={"next_value": OrderNumberSequence.next_value + size},
+    ).returning(OrderNumberSequence.next_value)
+    with Session(bind=sequence_engine(db.get_bind())) as sequence_db:
+        end = sequence_db.execute(statement).scalar_one()
+        sequence_db.commit()
+    return end - size, end - 1
+
+
+# Hands out server-side order numbers (20261018-0001, ...) from blocks reserved in the
+# database, so only one order in BLOCK_SIZE costs an extra statement.
+#
+# The lock only guards the in-memory ranges: a reservation runs outside it, because async
+# routes reserve on the event loop thread, where waiting on a lock held across a database call
+# would block the loop (the reservation itself is a short blocking call there). Two concurrent
+# reservations simply leave an extra range for later.
+class OrderNumberAllocator:
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._day = None
+        self._ranges = []  # [next, last] pairs of the current day
+
+    def _take(self, day: date) -> Optional[str]:
+        with self._lock:
+            if self._day != day:
+                self._day, self._ranges = day, []
+            while self._ranges:
+                current = self._ranges[0]
+                if current[0] <= current[1]:
+                    current[0] += 1
+                    return format_number(day, current[0] - 1)
+                self._ranges.pop(0)
+            return None
+
+    # Next number for an order created now. Call it once the request is validated, so rejected
+    # requests do not use up numbers, and before db writes anything: a new block is reserved on
+    # a second connection, which would wait for the write lock held by db.
+    def next_number(self, db: Session) -> str:
+        day = date.today()
+        number = self._take(day)
+        while number is None:
+            first, last = reserve_block(db, day, self.block_size)
+            with self._lock:
+                if self._day == day:
+                    self._ranges.append([first, last])
+            number = self._take(day)
+        return number
+
+
+# Each location numbers its orders in its own database
+order_numbers = PerLocation(OrderNumberAllocator)
+
+
+# Give an order payload without a number the next server-side one
+def assign_order_number(db: Session, values: dict):
+    if not values.get("number"):
+        values["number"] = order_numbers.next_number(db)
@@ -0,0 +1,56 @@
+from sqlalchemy import literal, select, union_all
+from backend.core.validation import InvariantError, validator, changed, in_memory
+from backend.models.client import Client
+from backend.models.deliver import Deliver
+from backend.models.person import Person
+from backend.models.restaurant_employee import RestaurantEmployee
+
+# Role models and the Person relationship leading to each
+ROLES = {Client: "client", RestaurantEmployee: "restaurant_employee", Deliver: "deliver"}
+
+ROLE_ERROR = "A person can only be associated with one role (Client, RestaurantEmployee, Deliver)."
+
+
+# A new person may be created with at most one role
+@validator(Person)
+def validate_people(session, new, dirty):
+    for person in new:
+        if sum(bool(in_memory(person, key)) for key in ROLES.values()) > 1:
+            raise InvariantError(ROLE_ERROR)
+
+
+# A role row being saved must not give its person a second role. The roles the persons already
+# have are read with one query for the whole flush.
+@validator(*ROLES)
+def validate_person_roles(session, new, dirty):
+    roles = {}
+    flushed_rows = set()
+    for role in new + [role for role in dirty if changed(role, "person_id", "person")]:
+        person = in_memory(role, "person")
+        if person is None:
+            key = role.person_id
+        else:
+            # A person created in the same flush has no id yet
+            key = person.id if person.id is not None else ("pending", id(person))
+        if key is None:
+            continue
+        roles.setdefault(key, set()).add(type(role))
+        if role.id is not None:
+            flushed_rows.add((type(role), role.id))
+
+    person_ids = [key for key in roles if isinstance(key, int)]
+    if person_ids:
+        models = list(ROLES)
+        statement = union_all(*(
+            select(literal(index).label("role"), model.id, model.person_id).where(model.person_id.in_(person_ids))
+            for index, model in enumerate(models)
+        ))
+        with session.no_autoflush:
+            rows = session.execute(statement).all()
+        for index, role_id, person_id in rows:
+            model = models[index]
+            if (model, role_id) not in flushed_rows:
+                roles[person_id].add(model)
+
+    if any(len(kinds) > 1 for kinds in roles.values()):
+        raise InvariantError(ROLE_ERROR)
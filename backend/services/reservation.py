@@ -0,0 +1,13 @@
+from backend.core.validation import InvariantError, validator, flushed, collection_size, has_parent
+from backend.models.reservation import Reservation
+
+
+# A reservation must have a client and at least one table
+@validator(Reservation)
+def validate_reservations(session, new, dirty):
+    for reservation, pending in flushed(new, dirty):
+        if not has_parent(reservation, "client_id", "client"):
+            raise InvariantError("A reservation must be associated with a client.")
+        tables = collection_size(reservation, "tables", pending)
+        if tables is not None and tables < 1:
+            raise InvariantError("A reservation must include at least one table.")
@@ -0,0 +1,10 @@
+from backend.core.validation import InvariantError, validator, has_parent
+from backend.models.restaurant_employee import RestaurantEmployee
+
+
+# A restaurant employee must be a person
+@validator(RestaurantEmployee)
+def validate_restaurant_employees(session, new, dirty):
+    for employee in new + dirty:
+        if not has_parent(employee, "person_id", "person"):
+            raise InvariantError("A RestaurantEmployee must be associated with a Person.")
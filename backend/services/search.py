@@ -0,0 +1,67 @@
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Terms of a query used for matching; the rest of a long query is ignored
+MAX_TERMS = 8
+
+# bm25 column weights: a match on a name counts more than one on the contact details or description
+PERSON_WEIGHTS = "10.0, 10.0, 4.0, 4.0"  # name, surname, email, phone_number
+DISH_WEIGHTS = "10.0, 2.0"  # name, description
+
+# The best matches are picked inside the FTS index and only those are joined to their rows
+PERSON_QUERY = f"""
+    SELECT person.id, person.name, person.surname, person.email, person.phone_number,
+           client.id AS client_id
+    FROM (
+        SELECT rowid AS id, bm25(person_search, {PERSON_WEIGHTS}) AS score
+        FROM person_search
+        WHERE person_search MATCH :terms {{clients_only}}
+        ORDER BY score
+        LIMIT :limit
+    ) AS hit
+    JOIN person ON person.id = hit.id
+    LEFT JOIN client ON client.person_id = person.id
+    ORDER BY hit.score, person.id
+"""
+
+# The unary + keeps SQLite from handing the rowid filter to FTS5, which would then look up
+# every client's row instead of walking the matches
+CLIENTS_ONLY = "AND +rowid IN (SELECT person_id FROM client)"
+
+DISH_QUERY = f"""
+    SELECT dish.id, dish.name, dish.description, dish.price, dish.discount
+    FROM (
+        SELECT rowid AS id, bm25(dish_search, {DISH_WEIGHTS}) AS score
+        FROM dish_search
+        WHERE dish_search MATCH :terms
+        ORDER BY score
+        LIMIT :limit
+    ) AS hit
+    JOIN dish ON dish.id = hit.id
+    ORDER BY hit.score, dish.id
+"""
+
+
+# FTS5 query matching every term of the user's input as a prefix ("jan kow" -> "jan"* "kow"*).
+# Terms are quoted, so FTS5 operators and column filters typed by the user are matched as text.
+def match_terms(query: str):
+    terms = re.findall(r"\w+", query)[:MAX_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_people(db: Session, query: str, limit: int, clients_only: bool = False) -> list:
+    terms = match_terms(query)
+    if terms is None:
+        return []
+    statement = PERSON_QUERY.format(clients_only=CLIENTS_ONLY if clients_only else "")
+    return [dict(row) for row in db.execute(text(statement), {"terms": terms, "limit": limit}).mappings()]
+
+
+def search_dishes(db: Session, query: str, limit: int) -> list:
+    terms = match_terms(query)
+    if terms is None:
+        return []
+    return [dict(row) for row in db.execute(text(DISH_QUERY), {"terms": terms, "limit": limit}).mappings()]
@@ -0,0 +1,153 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.models.delivery import Delivery, DeliveryStatus, delivery_ingredient
+from backend.models.dish import Dish, dish_ingredient
+from backend.models.ingredient import Ingredient
+from backend.models.order import order_dish
+from backend.models.stock import StockLevel, StockMovement, StockMovementKind
+
+# Quantity of an ingredient used by one portion of a dish when the link does not set one
+DEFAULT_PORTION_QUANTITY = 1
+
+
+def enum_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+# Append movements to the ledger and apply them to the on-hand balances, in the caller's
+# transaction. Balances are updated with an upsert so concurrent postings add up correctly.
+def post_movements(db: Session, movements: list):
+    movements = [movement for movement in movements if movement["quantity"]]
+    if not movements:
+        return
+    db.execute(StockMovement.__table__.insert(), movements)
+
+    totals = {}
+    for movement in movements:
+        totals[movement["ingredient_id"]] = totals.get(movement["ingredient_id"], 0) + movement["quantity"]
+    statement = sqlite_insert(StockLevel).values([
+        {"ingredient_id": ingredient_id, "on_hand": quantity}
+        for ingredient_id, quantity in totals.items()
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[StockLevel.ingredient_id],
+        set_={"on_hand": StockLevel.on_hand + statement.excluded.on_hand, "updated_at": datetime.now()},
+    ))
+
+
+# Post whatever brings the movements recorded for a delivery or an order to the wanted totals.
+#
+# Reconciling against the ledger (instead of reacting to individual field changes) covers
+# status changes in both directions, edited ingredient lists and edited quantities alike.
+def reconcile(db: Session, kind: StockMovementKind, source_column, source_id: int, wanted: dict):
+    posted = dict(db.execute(
+        select(StockMovement.ingredient_id, func.sum(StockMovement.quantity))
+        .where(source_column == source_id)
+        .group_by(StockMovement.ingredient_id)
+    ).all())
+    post_movements(db, [
+        {
+            "ingredient_id": ingredient_id,
+            "quantity": wanted.get(ingredient_id, 0) - posted.get(ingredient_id, 0),
+            "kind": kind,
+            source_column.key: source_id,
+        }
+        for ingredient_id in set(wanted) | set(posted)
+    ])
+
+
+# A completed delivery adds its quantities to stock; any other status adds nothing
+def sync_delivery_stock(db: Session, delivery_id: int):
+    status = db.scalar(select(Delivery.status).where(Delivery.id == delivery_id))
+    wanted = {}
+    if enum_value(status) == DeliveryStatus.completed.value:
+        wanted = dict(db.execute(
+            select(
+                delivery_ingredient.c.ingredient_id,
+                func.coalesce(delivery_ingredient.c.quantity, Ingredient.amount),
+            )
+            .join(Ingredient, Ingredient.id == delivery_ingredient.c.ingredient_id)
+            .where(delivery_ingredient.c.delivery_id == delivery_id)
+        ).all())
+    reconcile(db, StockMovementKind.delivery, StockMovement.delivery_id, delivery_id, wanted)
+
+
+# A placed order consumes one portion of each of its dishes
+def sync_order_stock(db: Session, order_id: int):
+    wanted = {
+        ingredient_id: -quantity
+        for ingredient_id, quantity in db.execute(
+            select(
+                dish_ingredient.c.ingredient_id,
+                func.sum(func.coalesce(dish_ingredient.c.quantity, DEFAULT_PORTION_QUANTITY)),
+            )
+            .join(order_dish, order_dish.c.dish_id == dish_ingredient.c.dish_id)
+            .where(order_dish.c.order_id == order_id)
+            .group_by(dish_ingredient.c.ingredient_id)
+        )
+    }
+    reconcile(db, StockMovementKind.order, StockMovement.order_id, order_id, wanted)
+
+
+# Store per-ingredient quantities on the association rows of a dish or a delivery
+def set_link_quantities(db: Session, link_table, owner_column: str, owner_id: int, quantities: Optional[dict]):
+    if not quantities:
+        return
+    db.execute(
+        update(link_table)
+        .where(
+            link_table.c[owner_column] == owner_id,
+            link_table.c.ingredient_id == bindparam("link_ingredient_id"),
+        )
+        .values(quantity=bindparam("link_quantity")),
+        [
+            {"link_ingredient_id": ingredient_id, "link_quantity": quantity}
+            for ingredient_id, quantity in quantities.items()
+        ],
+    )
+
+
+# Manual correction, e.g. after a stock count or for waste
+def adjust_stock(db: Session, ingredient_id: int, quantity: int, note: Optional[str] = None):
+    post_movements(db, [{
+        "ingredient_id": ingredient_id,
+        "quantity": quantity,
+        "kind": StockMovementKind.adjustment,
+        "note": note,
+    }])
+
+
+# Portions of every dish that can still be cooked from the stock on hand: one query over the
+# balances (one row per ingredient), never the movement history
+def cookable_dishes(db: Session) -> list:
+    portion = func.coalesce(dish_ingredient.c.quantity, DEFAULT_PORTION_QUANTITY)
+    on_hand = func.coalesce(StockLevel.on_hand, 0)
+    portions = func.min(func.max(on_hand, 0) / func.nullif(portion, 0))
+    rows = db.execute(
+        select(Dish.id, Dish.name, portions.label("portions"))
+        .join(dish_ingredient, dish_ingredient.c.dish_id == Dish.id)
+        .outerjoin(StockLevel, StockLevel.ingredient_id == dish_ingredient.c.ingredient_id)
+        .group_by(Dish.id, Dish.name)
+        .order_by(Dish.name, Dish.id)
+    )
+    return [{"dish_id": row.id, "name": row.name, "portions": int(row.portions or 0)} for row in rows]
+
+
+# Recompute every on-hand balance from the movement ledger, e.g. after restoring a backup or
+# editing movements by hand. Returns the number of ingredients with a balance.
+def rebuild_stock_levels(db: Session) -> int:
+    db.execute(StockLevel.__table__.delete())
+    totals = db.execute(
+        select(StockMovement.ingredient_id, func.sum(StockMovement.quantity))
+        .group_by(StockMovement.ingredient_id)
+    ).all()
+    if totals:
+        db.execute(StockLevel.__table__.insert(), [
+            {"ingredient_id": ingredient_id, "on_hand": quantity, "updated_at": datetime.now()}
+            for ingredient_id, quantity in totals
+        ])
+    return len(totals)
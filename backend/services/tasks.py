@@ -0,0 +1,46 @@
+# Tasks run by the background jobs, and the periodic ones. Importing this module registers them.
+from datetime import date
+from typing import Optional
+from sqlalchemy.orm import Session
+from backend.services.analytics import date_range, dish_sales, rebuild_sales, sales_series
+from backend.services.idempotency import purge_expired_keys
+from backend.services.jobs import every, purge_finished_jobs, task
+from backend.services.stock import rebuild_stock_levels
+
+
+# Recompute the sales rollups from the orders
+@task("sales.rebuild")
+def rebuild_sales_task(db: Session) -> dict:
+    return {"orders": rebuild_sales(db)}
+
+
+# Sales per day (or hour) and per dish over a date range; the export is the job's result
+@task("sales.export")
+def export_sales_task(db: Session, start: Optional[str] = None, end: Optional[str] = None, by_hour: bool = False) -> dict:
+    days = date_range(start and date.fromisoformat(start), end and date.fromisoformat(end))
+    return {
+        "start": days[0],
+        "end": days[1],
+        "sales": sales_series(db, *days, by_hour=by_hour),
+        "dishes": dish_sales(db, *days, granularity="hour" if by_hour else "day"),
+    }
+
+
+# Recompute the on-hand balances from the stock movement ledger
+@task("stock.rebuild")
+def rebuild_stock_task(db: Session) -> dict:
+    return {"ingredients": rebuild_stock_levels(db)}
+
+
+@task("idempotency.purge")
+def purge_idempotency_keys_task(db: Session) -> dict:
+    return {"deleted": purge_expired_keys(db)}
+
+
+@task("jobs.purge")
+def purge_jobs_task(db: Session) -> dict:
+    return {"deleted": purge_finished_jobs(db)}
+
+
+every(60 * 60, "idempotency.purge")
+every(24 * 60 * 60, "jobs.purge")
@@ -0,0 +1,148 @@
+import os
+import tempfile
+
+# The settings are read at import time: point them at a scratch database before importing the app
+os.environ["RESTAURANT_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["RESTAURANT_JOB_WORKERS"] = "0"
+os.environ.pop("RESTAURANT_LOCATIONS", None)
+
+import datetime  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.core.database import SessionLocal, initialize_database  # noqa: E402
+from backend.main import create_app  # noqa: E402
+from backend.models import (  # noqa: E402
+    AddressHistory,
+    Client,
+    Deliver,
+    Delivery,
+    Dish,
+    EmploymentContract,
+    Ingredient,
+    Order,
+    Person,
+    Reservation,
+    RestaurantEmployee,
+    Table,
+)
+from backend.models.delivery import DeliveryStatus  # noqa: E402
+from backend.models.employment_contract import Position  # noqa: E402
+from backend.models.ingredient import Metric  # noqa: E402
+from backend.models.order import OrderStatus, OrderType, PaymentType  # noqa: E402
+from backend.models.reservation import ReservationStatus  # noqa: E402
+from backend.models.restaurant_employee import Role  # noqa: E402
+
+
+# A small restaurant with one record of every kind; returns the IDs by model name
+def seed(db) -> dict:
+    client_person = Person(name="Jan", surname="Kowalski", email="jan@example.com", phone_number="600100200")
+    db.add(client_person)
+    db.flush()
+    client = Client(person_id=client_person.id, registration_date=datetime.datetime(2026, 1, 1))
+    db.add(client)
+    db.flush()
+    address = AddressHistory(street="Długa", city="Kraków", post_code="30-001", building_number="1", client_id=client.id)
+    db.add(address)
+    ingredients = [Ingredient(name=f"Ingredient {number}", amount=100, metric=Metric.grams) for number in range(3)]
+    db.add_all(ingredients)
+    db.flush()
+
+    dishes = [
+        Dish(name="Pierogi", description="Ruskie", price=20.0, discount=0.1, ingredients=ingredients[:2]),
+        Dish(name="Żurek", description="Soup", price=15.0, ingredients=ingredients[1:]),
+    ]
+    db.add_all(dishes)
+    employees = []
+    for number in range(2):
+        person = Person(name=f"Employee {number}", surname="Nowak", email=f"employee{number}@example.com", phone_number="1")
+        db.add(person)
+        db.flush()
+        employees.append(RestaurantEmployee(employee_identificator=f"EMP{number}", role=Role.cook, person_id=person.id))
+    db.add_all(employees)
+    db.flush()
+    contract = EmploymentContract(
+        start_date=datetime.date(2026, 1, 1), salary=5000, position=Position.cook, employee_id=employees[0].id,
+    )
+    db.add(contract)
+
+    order = Order(
+        status=OrderStatus.new, number="A1", payment=PaymentType.cash, takeaway_or_onsite=OrderType.onsite,
+        client_id=client.id, address_history_id=address.id, dishes=dishes, restaurant_employee=employees,
+    )
+    tables = [Table(number="T1", number_of_seats=4), Table(number="T2", number_of_seats=2)]
+    reservation = Reservation(
+        date=datetime.date(2026, 10, 20), hour="18:00", number_of_people=3,
+        status=ReservationStatus.placed, client_id=client.id, tables=tables[:1],
+    )
+    db.add_all([order, reservation, *tables])
+
+    deliver_person = Person(name="Adam", surname="Dostawca", email="deliver@example.com", phone_number="2")
+    db.add(deliver_person)
+    db.flush()
+    deliver = Deliver(company_name="Dostawa", person_id=deliver_person.id)
+    db.add(deliver)
+    db.flush()
+    delivery = Delivery(status=DeliveryStatus.pending, date=datetime.date(2026, 10, 18), deliver_id=deliver.id, ingredients=ingredients)
+    db.add(delivery)
+    db.commit()
+    return {
+        "person": client_person.id,
+        "client": client.id,
+        "address_history": address.id,
+        "ingredient": ingredients[0].id,
+        "dish": dishes[0].id,
+        "restaurant_employee": employees[0].id,
+        "restaurant_employees": [employee.id for employee in employees],
+        "employment_contract": contract.id,
+        "order": order.id,
+        "table": tables[0].id,
+        "reservation": reservation.id,
+        "deliver": deliver.id,
+        "delivery": delivery.id,
+    }
+
+
+@pytest.fixture(scope="session")
+def ids():
+    initialize_database()
+    db = SessionLocal()
+    try:
+        return seed(db)
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def sync_client(ids):
+    with TestClient(create_app(async_routes=False)) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def async_client(ids):
+    with TestClient(create_app(async_routes=True)) as client:
+        yield client
+
+
+# Builds a valid order creation payload, with overrides
+@pytest.fixture
+def order_payload(ids):
+    def payload(**values) -> dict:
+        return {
+            "status": "new",
+            "payment": "cash",
+            "takeaway_or_onsite": "onsite",
+            "client_id": ids["client"],
+            "address_history_id": ids["address_history"],
+            "dish_ids": [ids["dish"]],
+            "restaurant_employee_ids": ids["restaurant_employees"],
+            **values,
+        }
+
+    return payload
+
+
+# Both route variants
+@pytest.fixture(params=["sync", "async"])
+def client(request):
+    return request.getfixturevalue(f"{request.param}_client")
@@ -0,0 +1,72 @@
+import asyncio
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+from backend.core.admission import (
+    NEW_ORDER,
+    STATUS_UPDATE,
+    WRITE,
+    AdmissionControl,
+    AdmissionController,
+    AdmissionMiddleware,
+    write_priority,
+)
+
+
+def test_write_priority():
+    assert write_priority("POST", "/order/") == NEW_ORDER
+    assert write_priority("PATCH", "/order/7") == STATUS_UPDATE
+    assert write_priority("DELETE", "/order/7") == WRITE
+    assert write_priority("POST", "/reservation/") == WRITE
+
+
+# Waiting writes are admitted by priority, then in arrival order
+def test_queue_order():
+    async def run():
+        controller = AdmissionController(limit=1, queue_size=10, timeout=5)
+        assert await controller.acquire(WRITE)
+        admitted = []
+
+        async def write(name, priority):
+            assert await controller.acquire(priority)
+            admitted.append(name)
+            controller.release()
+
+        tasks = [
+            asyncio.create_task(write(name, priority))
+            for name, priority in [("order", NEW_ORDER), ("dish", WRITE), ("status", STATUS_UPDATE), ("table", WRITE)]
+        ]
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 4
+        controller.release()
+        await asyncio.gather(*tasks)
+        assert admitted == ["status", "dish", "table", "order"]
+        assert (controller.active, controller.queue_depth) == (0, 0)
+
+    asyncio.run(run())
+
+
+def test_shed_when_queue_full_or_timed_out():
+    async def run():
+        controller = AdmissionController(limit=1, queue_size=1, timeout=0.01)
+        assert await controller.acquire(WRITE)
+        waiter = asyncio.create_task(controller.acquire(WRITE))
+        await asyncio.sleep(0)
+        assert not await controller.acquire(NEW_ORDER)
+        assert not await waiter
+        assert controller.rejected[(NEW_ORDER, "queue_full")] == 1
+        assert controller.rejected[(WRITE, "timeout")] == 1
+        assert controller.queue_depth == 0
+        controller.release()
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+# Shed writes get a 503 with Retry-After; reads are never queued
+def test_middleware_sheds_writes():
+    app = AdmissionMiddleware(PlainTextResponse("ok"), AdmissionControl(limit=0, queue_size=0, timeout=2))
+    client = TestClient(app)
+    assert client.get("/order/").status_code == 200
+    response = client.post("/order/")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,33 @@
+# The availability index must agree with the reservations stored in the database
+SEARCH = {"reservation_date": "2026-10-20", "start": "18:00", "number_of_people": 2}
+
+
+def free_table_ids(client) -> set:
+    response = client.get("/reservation/availability", params=SEARCH)
+    assert response.status_code == 200, response.text
+    return {table_id for candidate in response.json()["candidates"] for table_id in candidate["table_ids"]}
+
+
+def test_replaced_reservation_holds_its_tables(client, ids):
+    reservation = f"/reservation/{ids['reservation']}"
+    assert ids["table"] not in free_table_ids(client)
+    try:
+        assert client.patch(reservation, json={"status": "canceled"}).status_code == 200
+        assert ids["table"] in free_table_ids(client)
+    finally:
+        assert client.patch(reservation, json={"status": "placed"}).status_code == 200
+    assert ids["table"] not in free_table_ids(client)
+
+
+def test_table_holds_several_reservations(client, ids):
+    response = client.post("/reservation/", json={
+        "reservation_date": "2026-10-20", "reservation_hour": "12:00", "number_of_people": 2,
+        "status": "placed", "client_id": ids["client"], "table_ids": [ids["table"]],
+    })
+    assert response.status_code == 201, response.text
+    try:
+        tables = client.get(f"/reservation/{ids['reservation']}/with-relations").json()["tables"]
+        assert [table["id"] for table in tables] == [ids["table"]]
+        assert ids["table"] not in free_table_ids(client)
+    finally:
+        assert client.delete(f"/reservation/{response.json()['id']}").status_code == 204
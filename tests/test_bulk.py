@@ -0,0 +1,99 @@
+# Bulk create endpoints report every row: invalid rows are rejected with a reason and the
+# valid ones are still inserted
+import uuid
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+def test_bulk_ingredients_reject_malformed_rows(client):
+    response = client.post("/ingredient/bulk", json=[
+        {"name": unique("Salt"), "amount": 10, "metric": "grams"},
+        {"name": unique("Pepper"), "amount": "bad", "metric": "grams"},
+        {"name": unique("Oil"), "amount": 1, "metric": "buckets"},
+        {"amount": 1, "metric": "grams"},
+    ])
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert [row["index"] for row in report["created"]] == [0]
+    assert [error["index"] for error in report["errors"]] == [1, 2, 3]
+    assert report["errors"][0]["detail"].startswith("amount:")
+    assert report["errors"][2]["detail"].startswith("name:")
+    assert client.get(f"/ingredient/{report['created'][0]['id']}").status_code == 200
+
+
+def test_bulk_people_reject_taken_emails(client):
+    email = f"{unique('guest')}@example.com"
+    response = client.post("/person/bulk", json=[
+        {"name": "Ewa", "surname": "Lis", "email": email, "phone_number": "1"},
+        {"name": "Ewa", "surname": "Lis", "email": email, "phone_number": "1"},
+        {"name": "Jan", "surname": "Kowalski", "email": "jan@example.com", "phone_number": "1"},
+        {"name": "Ola", "surname": "Lis", "email": f"{unique('guest')}@example.com", "phone_number": "1"},
+    ])
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert [row["index"] for row in report["created"]] == [3]
+    assert [error["index"] for error in report["errors"]] == [0, 1, 2]
+
+
+def test_bulk_dishes_resolve_ingredients(client, ids):
+    ingredients = client.get("/ingredient/").json()
+    valid = [ingredient["id"] for ingredient in ingredients[:2]]
+    response = client.post("/dish/bulk", json=[
+        {"name": unique("Bigos"), "description": "Stew", "price": 30.0, "ingredient_ids": valid},
+        {"name": unique("Barszcz"), "description": "Soup", "price": 12.0, "ingredient_ids": [valid[0], 999999]},
+        {"name": unique("Kompot"), "description": "Drink", "price": 5.0, "ingredient_ids": valid[:1]},
+        {"name": unique("Placki"), "description": "Pancakes", "price": "free", "ingredient_ids": valid},
+    ])
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert [row["index"] for row in report["created"]] == [0]
+    assert [error["index"] for error in report["errors"]] == [1, 2, 3]
+    dish = client.get(f"/dish/{report['created'][0]['id']}/with-relations").json()
+    assert sorted(ingredient["id"] for ingredient in dish["ingredients"]) == sorted(valid)
+
+
+def test_bulk_tables_reject_taken_numbers(client):
+    number = unique("T")
+    response = client.post("/table/bulk", json=[
+        {"number": number, "number_of_seats": 4},
+        {"number": "T1", "number_of_seats": 4},
+        {"number": unique("T"), "number_of_seats": 2, "reservation_id": 999999},
+        {"number": unique("T"), "number_of_seats": "many"},
+    ])
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert [row["index"] for row in report["created"]] == [0]
+    assert [error["index"] for error in report["errors"]] == [1, 2, 3]
+
+
+# Bulk deletes take filters and report the deleted IDs; the in-memory services forget them
+def test_bulk_delete_orders(client, ids, order_payload):
+    created = [client.post("/order/", json=order_payload()).json()["id"] for _ in range(2)]
+    response = client.post("/order/bulk-delete", json={"ids": created + [999999]})
+    assert response.status_code == 200, response.text
+    assert sorted(response.json()["deleted"]) == created
+    assert all(client.get(f"/order/{order_id}").status_code == 404 for order_id in created)
+    kitchen = client.get("/order/kitchen").json()
+    assert not {order["id"] for orders in kitchen.values() for order in orders} & set(created)
+    assert client.get(f"/order/{ids['order']}").status_code == 200
+
+
+def test_bulk_delete_reservations_before(client, ids):
+    created = [
+        client.post("/reservation/", json={
+            "reservation_date": "2001-01-01", "reservation_hour": hour, "number_of_people": 2,
+            "status": "placed", "client_id": ids["client"], "table_ids": [ids["table"]],
+        }).json()["id"]
+        for hour in ("12:00", "15:00")
+    ]
+    response = client.post("/reservation/bulk-delete", json={"before": "2001-01-02"})
+    assert response.status_code == 200, response.text
+    assert sorted(response.json()["deleted"]) == created
+    assert client.get(f"/reservation/{ids['reservation']}").status_code == 200
+
+
+def test_bulk_delete_needs_a_filter(client):
+    assert client.post("/order/bulk-delete", json={}).status_code == 400
+    assert client.post("/reservation/bulk-delete", json={}).status_code == 400
@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import text
+from backend.core.config import PROD_PROFILE, Settings
+from backend.core.database import engine
+
+
+def test_profile_from_env(monkeypatch):
+    monkeypatch.setenv("RESTAURANT_PROFILE", "prod")
+    settings = Settings.from_env()
+    assert settings.profile is PROD_PROFILE
+    assert settings.engine_options("sqlite:///restaurant.db")["pool_size"] == PROD_PROFILE.pool_size
+    assert settings.engine_options("sqlite:///restaurant.db", read=True)["pool_size"] == PROD_PROFILE.read_pool_size
+    # An in-memory database lives on one connection: no pool sizing
+    assert "pool_size" not in settings.engine_options("sqlite://")
+
+
+def test_unknown_profile(monkeypatch):
+    monkeypatch.setenv("RESTAURANT_PROFILE", "fast")
+    with pytest.raises(ValueError):
+        Settings.from_env()
+
+
+# Every new connection gets the profile's PRAGMAs
+def test_connection_pragmas():
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
@@ -0,0 +1,35 @@
+# The async CRUD routers answer like the sync routes they replace: the same records, status
+# codes and side effects on the in-memory services
+
+
+def menu_names(client) -> set:
+    return {dish["name"] for dish in client.get("/menu/").json()["dishes"]}
+
+
+def test_dish_lifecycle(client):
+    ingredient_ids = [ingredient["id"] for ingredient in client.get("/ingredient/", params={"limit": 3}).json()]
+    response = client.post("/dish/", json={"name": "Żurek", "price": 12.5, "ingredient_ids": ingredient_ids[:2]})
+    assert response.status_code == 201, response.text
+    dish = response.json()
+    assert "Żurek" in menu_names(client)
+
+    response = client.put(f"/dish/{dish['id']}", json={"name": "Żurek staropolski", "ingredient_ids": ingredient_ids[1:]})
+    assert response.status_code == 200, response.text
+    details = client.get(f"/dish/{dish['id']}/with-relations").json()
+    assert details["name"] == "Żurek staropolski"
+    assert sorted(ingredient["id"] for ingredient in details["ingredients"]) == ingredient_ids[1:]
+    assert "Żurek staropolski" in menu_names(client)
+
+    assert client.delete(f"/dish/{dish['id']}").status_code == 204
+    assert client.get(f"/dish/{dish['id']}").status_code == 404
+    assert "Żurek staropolski" not in menu_names(client)
+
+
+def test_invalid_related_ids(client):
+    response = client.post("/dish/", json={"name": "Bigos", "price": 20, "ingredient_ids": [999999]})
+    assert response.status_code == 400
+
+
+def test_same_records_on_both_paths(sync_client, async_client, ids):
+    for path in (f"/order/{ids['order']}", f"/reservation/{ids['reservation']}", "/person/?limit=5"):
+        assert sync_client.get(path).json() == async_client.get(path).json()
@@ -0,0 +1,53 @@
+import pytest
+from backend.core import etag
+from backend.core.etag import TableVersions
+
+
+# Keep the time bucket from changing the tags during a test
+@pytest.fixture(autouse=True)
+def fixed_bucket(monkeypatch):
+    monkeypatch.setattr(etag, "ETAG_TTL_SECONDS", 10 ** 9)
+
+
+def test_not_modified(client, ids):
+    path = f"/table/{ids['table']}"
+    tag = client.get(path).headers["ETag"]
+    response = client.get(path, headers={"If-None-Match": tag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == tag
+    assert response.content == b""
+    # Weak comparison: the tag without its W/ prefix matches too
+    assert client.get(path, headers={"If-None-Match": tag[2:]}).status_code == 304
+    assert client.get("/table/", headers={"If-None-Match": tag}).status_code == 200
+
+
+def test_write_changes_tag(client, ids):
+    path = f"/table/{ids['table']}"
+    tag = client.get(path).headers["ETag"]
+    seats = client.get(path).json()["number_of_seats"]
+    try:
+        assert client.patch(path, json={"number_of_seats": seats + 1}).status_code == 200
+        response = client.get(path, headers={"If-None-Match": tag})
+        assert response.status_code == 200
+        assert response.json()["number_of_seats"] == seats + 1
+    finally:
+        client.patch(path, json={"number_of_seats": seats})
+
+
+# A rejected write is rolled back and leaves the tags alone
+def test_rolled_back_write_keeps_tag(client, ids):
+    tables = client.get("/table/").json()
+    path = f"/table/{tables[0]['id']}"
+    tag = client.get(path).headers["ETag"]
+    assert client.patch(path, json={"number": tables[1]["number"]}).status_code == 409
+    assert client.get(path, headers={"If-None-Match": tag}).status_code == 304
+
+
+# Tables rewritten through ON DELETE actions change with the table they reference
+def test_cascading_tables_bumped():
+    versions = TableVersions()
+    versions.bump("client")
+    assert versions.version("client") == 1
+    assert versions.version("address_history") == 1
+    assert versions.version("order") == 1
+    assert versions.version("dish") == 0
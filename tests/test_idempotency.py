@@ -0,0 +1,60 @@
+import uuid
+from backend.core import idempotency
+from backend.core.tenancy import PerLocation
+from backend.services.idempotency import IdempotencyStore
+
+# POST /order/ and /reservation/ with an Idempotency-Key run once; retries get the stored response
+
+
+def post(client, path: str, payload: dict, key: str):
+    return client.post(path, json=payload, headers={"Idempotency-Key": key})
+
+
+def test_retry_replays_response(client, order_payload):
+    key = uuid.uuid4().hex
+    first = post(client, "/order/", order_payload(), key)
+    assert first.status_code == 201, first.text
+    assert "Idempotent-Replayed" not in first.headers
+    retry = post(client, "/order/", order_payload(), key)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert client.get("/order/", params={"after": first.json()["id"]}).json() == []
+
+
+# Another worker process has no copy in memory and replays from the table
+def test_replay_from_database(client, ids, monkeypatch):
+    key = uuid.uuid4().hex
+    payload = {
+        "reservation_date": "2026-10-21", "reservation_hour": "13:00", "number_of_people": 2,
+        "status": "placed", "client_id": ids["client"], "table_ids": [ids["table"]],
+    }
+    first = post(client, "/reservation/", payload, key)
+    assert first.status_code == 201, first.text
+    monkeypatch.setattr(idempotency, "idempotency_store", PerLocation(IdempotencyStore))
+    retry = post(client, "/reservation/", payload, key)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+    assert client.delete(f"/reservation/{first.json()['id']}").status_code == 204
+
+
+# Client errors are stored too: the retry of a rejected request is rejected the same way
+def test_rejection_replayed(client, order_payload):
+    key = uuid.uuid4().hex
+    assert post(client, "/order/", order_payload(client_id=999999), key).status_code == 400
+    retry = post(client, "/order/", order_payload(client_id=999999), key)
+    assert retry.status_code == 400
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+
+def test_key_reused_for_other_request(client, order_payload):
+    key = uuid.uuid4().hex
+    assert post(client, "/order/", order_payload(), key).status_code == 201
+    response = post(client, "/order/", order_payload(note="other"), key)
+    assert response.status_code == 422
+    assert "different request" in response.json()["detail"]
+
+
+def test_key_length(client, order_payload):
+    assert post(client, "/order/", order_payload(), "k" * 256).status_code == 400
@@ -0,0 +1,114 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from backend.core.database import SessionLocal
+from backend.models.job import Job, JobStatus
+from backend.services.jobs import JobRunner, claim_job, enqueue, run_job, task
+
+# The rebuilds run as background jobs; the tests run the queue on the test thread
+runner = JobRunner(workers=0)
+
+
+def run_queued_jobs():
+    for _ in range(100):
+        if not runner.run_next():
+            return
+
+
+def test_rebuilds_are_enqueued(client):
+    for path, name, result in [("/analytics/rebuild", "sales.rebuild", "orders"), ("/stock/rebuild", "stock.rebuild", "ingredients")]:
+        response = client.post(path)
+        assert response.status_code == 202, response.text
+        job = response.json()
+        assert (job["name"], job["status"]) == (name, "queued")
+        run_queued_jobs()
+        job = client.get(f"/jobs/{job['id']}").json()
+        assert job["status"] == "succeeded", job["last_error"]
+        assert result in job["result"]
+
+
+def test_job_etag(client):
+    job_id = client.post("/jobs/", json={"name": "jobs.purge"}).json()["id"]
+    response = client.get(f"/jobs/{job_id}")
+    etag = response.headers["ETag"]
+    assert client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag}).status_code == 304
+    run_queued_jobs()
+    response = client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == "succeeded"
+
+
+failures = {"left": 0}
+
+
+# Fails while failures["left"] is positive
+@task("tests.flaky")
+def flaky_task(db) -> dict:
+    if failures["left"] > 0:
+        failures["left"] -= 1
+        raise RuntimeError("flaky")
+    return {"ok": True}
+
+
+@pytest.fixture
+def db():
+    run_queued_jobs()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def job_state(db, job_id: int) -> Job:
+    db.expire_all()
+    return db.get(Job, job_id)
+
+
+# A failed job goes back to the queue with a delay until its attempts run out
+def test_failed_job_retried(db):
+    failures["left"] = 1
+    job_id = enqueue(db, "tests.flaky", max_attempts=2)
+    db.commit()
+    run_job(db, claim_job(db))
+    job = job_state(db, job_id)
+    assert (job.status, job.attempts) == (JobStatus.queued, 1)
+    assert "flaky" in job.last_error
+    assert job.run_at > datetime.now()
+    assert claim_job(db) is None
+
+    db.execute(update(Job).where(Job.id == job_id).values(run_at=datetime.now()))
+    db.commit()
+    run_job(db, claim_job(db))
+    job = job_state(db, job_id)
+    assert (job.status, job.attempts, job.result) == (JobStatus.succeeded, 2, '{"ok": true}')
+
+
+def test_job_fails_after_last_attempt(db):
+    failures["left"] = 1
+    job_id = enqueue(db, "tests.flaky", max_attempts=1)
+    db.commit()
+    run_job(db, claim_job(db))
+    job = job_state(db, job_id)
+    assert job.status == JobStatus.failed
+    assert job.finished_at is not None
+
+
+# A job whose worker died is taken over once its lease expires
+def test_expired_lease_taken_over(db):
+    failures["left"] = 0
+    job_id = enqueue(db, "tests.flaky")
+    db.commit()
+    assert claim_job(db, lease_seconds=-1).id == job_id
+    job = claim_job(db)
+    assert (job.id, job.attempts) == (job_id, 2)
+    run_job(db, job)
+    assert job_state(db, job_id).status == JobStatus.succeeded
+
+
+def test_keyed_jobs_enqueued_once(db):
+    assert enqueue(db, "tests.flaky", key="tests.flaky@1") is not None
+    assert enqueue(db, "tests.flaky", key="tests.flaky@1") is None
+    db.commit()
+
+
+def test_unknown_task(client):
+    assert client.post("/jobs/", json={"name": "no.such.task"}).status_code == 400
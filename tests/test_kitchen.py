@@ -0,0 +1,39 @@
+import asyncio
+from backend.core.database import SessionLocal
+from backend.models import Order
+from backend.models.order import OrderStatus
+from backend.services import kitchen
+from backend.services.kitchen import KitchenQueue
+
+
+def queued_ids(queue) -> set:
+    return {order["id"] for orders in queue.snapshot().values() for order in orders}
+
+
+# An order completed by another worker does not reach publish(); the queue drops it once it
+# is reloaded, and pushes the transition to the subscribers
+def test_queue_reloads_after_ttl(ids, monkeypatch):
+    queue = KitchenQueue()
+    db = SessionLocal()
+
+    async def reload():
+        subscriber = queue.subscribe()
+        queue.ensure_loaded(db)
+        await asyncio.sleep(0)
+        return subscriber.get_nowait()
+
+    try:
+        queue.ensure_loaded(db)
+        assert ids["order"] in queued_ids(queue)
+        db.get(Order, ids["order"]).status = OrderStatus.completed
+        db.commit()
+        queue.ensure_loaded(db)
+        assert ids["order"] in queued_ids(queue)
+        monkeypatch.setattr(kitchen, "KITCHEN_TTL_SECONDS", 0)
+        event = asyncio.run(reload())
+        assert (event["order"]["id"], event["from"], event["to"]) == (ids["order"], "new", None)
+        assert ids["order"] not in queued_ids(queue)
+    finally:
+        db.get(Order, ids["order"]).status = OrderStatus.new
+        db.commit()
+        db.close()
@@ -0,0 +1,27 @@
+import json
+from backend.core.database import SessionLocal
+from backend.models import Dish
+from backend.services import menu
+from backend.services.menu import MenuSnapshot
+
+
+def dish_names(snapshot, db) -> set:
+    return {dish["name"] for dish in json.loads(snapshot.get(db))["dishes"]}
+
+
+# A write made by another worker does not reach invalidate(); the stored document is rebuilt
+# once it is older than the TTL
+def test_snapshot_expires(ids, monkeypatch):
+    snapshot = MenuSnapshot()
+    db = SessionLocal()
+    try:
+        assert "Pierogi" in dish_names(snapshot, db)
+        db.get(Dish, ids["dish"]).name = "Pierogi ruskie"
+        db.commit()
+        assert "Pierogi" in dish_names(snapshot, db)
+        monkeypatch.setattr(menu, "MENU_TTL_SECONDS", 0)
+        assert "Pierogi ruskie" in dish_names(snapshot, db)
+    finally:
+        db.get(Dish, ids["dish"]).name = "Pierogi"
+        db.commit()
+        db.close()
@@ -0,0 +1,40 @@
+import re
+
+# /table/{table_id} on the sync routes, /table/{record_id} on the async ones
+TABLE_ROUTE = r"/table/\{\w+\}"
+
+
+# Sum of the samples of a metric whose labels match the pattern
+def sample(client, name: str, labels: str) -> float:
+    pattern = re.compile(rf"^{name}\{{{labels}\}} (\S+)$", re.MULTILINE)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return sum(float(value) for value in pattern.findall(response.text))
+
+
+def test_requests_counted_by_route(client, ids):
+    labels = f'method="GET",route="{TABLE_ROUTE}",status="200"'
+    before = sample(client, "http_requests_total", labels)
+    for _ in range(3):
+        assert client.get(f"/table/{ids['table']}").status_code == 200
+    assert sample(client, "http_requests_total", labels) == before + 3
+
+
+def test_database_work_recorded(client, ids):
+    labels = f'method="GET",route="{TABLE_ROUTE}"'
+    requests = sample(client, "http_request_db_queries_count", labels)
+    statements = sample(client, "http_request_db_queries_sum", labels)
+    rows = sample(client, "http_request_db_rows_total", labels)
+    client.get(f"/table/{ids['table']}")
+    assert sample(client, "http_request_db_queries_count", labels) == requests + 1
+    assert sample(client, "http_request_db_queries_sum", labels) >= statements + 1
+    assert sample(client, "http_request_db_rows_total", labels) >= rows + 1
+
+
+# Unknown paths share one label instead of adding a series per path
+def test_unmatched_paths_share_a_label(client):
+    labels = 'method="GET",route="<unmatched>",status="404"'
+    before = sample(client, "http_requests_total", labels)
+    assert client.get("/no-such-page/1").status_code == 404
+    assert client.get("/no-such-page/2").status_code == 404
+    assert sample(client, "http_requests_total", labels) == before + 2
@@ -0,0 +1,40 @@
+from sqlalchemy import create_engine, inspect
+from backend.core.database import engine, initialize_database
+from backend.core.migrations import MIGRATIONS, applied_versions, run_migrations
+
+
+def test_every_migration_recorded(ids):
+    with engine.connect() as connection:
+        assert applied_versions(connection) == {version for version, _, _ in MIGRATIONS}
+
+
+# Migrations are idempotent: applying them to the current schema again changes nothing
+def test_migrations_rerun(ids):
+    with engine.begin() as connection:
+        for _, _, upgrade in MIGRATIONS:
+            upgrade(connection)
+    run_migrations(engine)
+
+
+# A database missing a migration gets it at startup
+def test_missing_migration_applied(tmp_path):
+    database = create_engine(f"sqlite:///{tmp_path}/old.db")
+    initialize_database(database)
+    with database.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_order_status")
+        connection.exec_driver_sql("DELETE FROM schema_migration WHERE version = 1")
+    run_migrations(database)
+    assert "ix_order_status" in {index["name"] for index in inspect(database).get_indexes("order")}
+    with database.connect() as connection:
+        assert 1 in applied_versions(connection)
+    database.dispose()
+
+
+# Every foreign key column leads an index, so joins and ON DELETE actions do not scan the table
+def test_foreign_keys_indexed(ids):
+    inspector = inspect(engine)
+    for table in inspector.get_table_names():
+        leading = {index["column_names"][0] for index in inspector.get_indexes(table)}
+        leading.update(inspector.get_pk_constraint(table)["constrained_columns"][:1])
+        for key in inspector.get_foreign_keys(table):
+            assert key["constrained_columns"][0] in leading, (table, key["constrained_columns"])
@@ -0,0 +1,42 @@
+from datetime import date
+from backend.core.database import SessionLocal
+from backend.models import Table
+from backend.services.order_numbers import is_server_number, reserve_block
+
+
+def test_server_allocates_number(client, order_payload):
+    response = client.post("/order/", json=order_payload())
+    assert response.status_code == 201, response.text
+    assert is_server_number(response.json()["number"])
+
+
+def test_client_number_in_server_format(client, ids, order_payload):
+    response = client.post("/order/", json=order_payload(number="20261018-0001"))
+    assert response.status_code == 422
+    assert client.patch(f"/order/{ids['order']}", json={"number": "20261018-0001"}).status_code == 422
+    assert client.put(f"/order/{ids['order']}", json={"number": "20261018-0001"}).status_code == 422
+
+
+def test_taken_client_number(client, order_payload):
+    response = client.post("/order/", json=order_payload(number="A1"))
+    assert response.status_code == 409
+
+
+def test_rejected_order_keeps_numbers(client, order_payload):
+    first = client.post("/order/", json=order_payload()).json()
+    assert client.post("/order/", json=order_payload(dish_ids=[999999])).status_code == 400
+    assert client.post("/order/", json=order_payload(client_id=999999)).status_code == 400
+    second = client.post("/order/", json=order_payload()).json()
+    assert int(second["number"].split("-")[1]) == int(first["number"].split("-")[1]) + 1
+
+
+# The block is committed on its own connection, not with the work of the caller's session
+def test_reserve_block_leaves_session_alone(ids):
+    db = SessionLocal()
+    try:
+        db.add(Table(number="99", number_of_seats=4))
+        reserve_block(db, date(2000, 1, 1))
+        db.rollback()
+        assert db.query(Table).filter(Table.number == "99").first() is None
+    finally:
+        db.close()
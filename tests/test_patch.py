@@ -0,0 +1,37 @@
+def test_patch_schema_with_non_column_fields(client, ids):
+    response = client.patch(f"/address-history/{ids['address_history']}", json={"floor": 3})
+    assert response.status_code == 200, response.text
+    assert response.json()["floor"] == 3
+    assert response.json()["order_id"] is None
+
+
+def test_patch_invalid_enum_value(client, ids):
+    response = client.patch(f"/order/{ids['order']}", json={"status": "bogus"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "status"]
+
+
+def test_patch_enum_value(client, ids):
+    response = client.patch(f"/order/{ids['order']}", json={"status": "ready"})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "ready"
+
+
+def test_patch_missing_record(client):
+    assert client.patch("/address-history/999999", json={"floor": 1}).status_code == 404
+
+
+def test_patch_with_missing_reference(client, ids):
+    response = client.patch(f"/clients/{ids['client']}", json={"person_id": 999999})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid person ID"
+    response = client.patch(f"/order/{ids['order']}", json={"client_id": 999999})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid client ID"
+
+
+def test_patch_null_on_required_column(client, ids):
+    response = client.patch(f"/order/{ids['order']}", json={"client_id": None})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "client_id"]
+    assert client.get(f"/order/{ids['order']}").json()["client_id"] == ids["client"]
@@ -0,0 +1,37 @@
+# Every with-relations/details endpoint must serialize its response within the statement
+# budget of its schema's loading plan: no lazy loads (N+1) while building the response
+import pytest
+from backend.core import database
+from backend.core.loading import query_budget
+from backend.core.profiling import assert_max_queries
+from backend.main import sync_routers
+
+RELATIONS_ROUTES = [
+    route
+    for router in sync_routers
+    for route in router.routes
+    if route.path.endswith(("/with-relations", "/details"))
+]
+
+
+# /clients/{client_id}/details -> "client", /address-history/{...}/details -> "address_history"
+def resource(route) -> str:
+    return route.path.strip("/").split("/")[0].replace("-", "_").removesuffix("s")
+
+
+@pytest.mark.parametrize("route", RELATIONS_ROUTES, ids=lambda route: route.path)
+def test_relations_within_query_budget(sync_client, ids, route):
+    path = route.path.replace(route.path.split("/")[2], str(ids[resource(route)]))
+    with assert_max_queries(database.read_engine, query_budget(route.response_model)):
+        response = sync_client.get(path)
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] == ids[resource(route)]
+
+
+@pytest.mark.parametrize("route", RELATIONS_ROUTES, ids=lambda route: route.path)
+def test_relations_within_query_budget_async(async_client, ids, route):
+    path = route.path.replace(route.path.split("/")[2], str(ids[resource(route)]))
+    with assert_max_queries(database.async_read_engine.sync_engine, query_budget(route.response_model)):
+        response = async_client.get(path)
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] == ids[resource(route)]
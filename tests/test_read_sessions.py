@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from backend.core.database import ReadSessionLocal, create_read_engine, read_engine, read_only_url
+from backend.models import Table
+
+
+def test_read_only_url():
+    url = make_url(read_only_url("sqlite:///data/restaurant.db"))
+    assert url.database == "file:data/restaurant.db"
+    assert dict(url.query) == {"mode": "ro", "uri": "true"}
+
+
+# Read connections open the file read-only with query_only set, so they cannot write
+def test_read_session_cannot_write(ids):
+    with read_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA query_only")).scalar() == 1
+    db = ReadSessionLocal()
+    try:
+        assert db.get(Table, ids["table"]) is not None
+        db.add(Table(number="R1", number_of_seats=2))
+        with pytest.raises(OperationalError):
+            db.flush()
+    finally:
+        db.rollback()
+        db.close()
+
+
+# An in-memory database exists on one connection, so it is read through the write engine
+def test_memory_database_shares_engine():
+    memory = create_engine("sqlite://")
+    assert create_read_engine("sqlite://", memory) is memory
@@ -0,0 +1,47 @@
+# Foreign keys are enforced, so create and update payloads naming a missing record are
+# rejected with a 400 before anything is written
+
+MISSING = 999999
+
+
+def test_create_order_with_missing_client(client, order_payload):
+    response = client.post("/order/", json=order_payload(client_id=MISSING))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid client ID"
+
+
+def test_create_order_with_missing_address(client, order_payload):
+    response = client.post("/order/", json=order_payload(address_history_id=MISSING))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid address history ID"
+
+
+def test_update_order_with_missing_address(client, ids):
+    response = client.put(f"/order/{ids['order']}", json={"address_history_id": MISSING})
+    assert response.status_code == 400
+    assert client.get(f"/order/{ids['order']}").json()["address_history_id"] == ids["address_history"]
+
+
+def test_create_address_with_missing_client(client, ids):
+    response = client.post(
+        "/address-history/",
+        json={"street": "Krótka", "city": "Kraków", "post_code": "30-002", "building_number": "2", "client_id": MISSING},
+    )
+    assert response.status_code == 400
+
+
+def test_update_client_with_missing_person(client, ids):
+    assert client.put(f"/clients/{ids['client']}", json={"person_id": MISSING}).status_code == 400
+
+
+def test_create_delivery_with_missing_deliver(client, ids):
+    response = client.post(
+        "/delivery/",
+        json={
+            "delivery_status": "pending",
+            "delivery_date": "2026-10-18",
+            "deliver_id": MISSING,
+            "ingredient_ids": [ids["ingredient"]],
+        },
+    )
+    assert response.status_code == 400
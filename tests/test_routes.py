@@ -0,0 +1,36 @@
+# Static routes next to /{id} routes must be reachable with both route variants: in async mode
+# the async CRUD routers are mounted alongside the sync-only routes
+
+
+def test_kitchen_queue(client, ids):
+    response = client.get("/order/kitchen")
+    assert response.status_code == 200
+    assert any(order["id"] == ids["order"] for orders in response.json().values() for order in orders)
+
+
+def test_availability(client, ids):
+    response = client.get(
+        "/reservation/availability",
+        params={"reservation_date": "2026-10-20", "start": "12:00", "number_of_people": 2},
+    )
+    assert response.status_code == 200
+    assert response.json()["candidates"]
+
+
+def test_record_by_id(client, ids):
+    assert client.get(f"/order/{ids['order']}").status_code == 200
+    assert client.get("/order/not-a-number").status_code == 422
+
+
+def test_delete_address_with_orders(client, ids, order_payload):
+    address = client.post(
+        "/address-history/",
+        json={"street": "Krótka", "city": "Kraków", "post_code": "30-002", "building_number": "2", "client_id": ids["client"]},
+    ).json()
+    order = client.post("/order/", json=order_payload(address_history_id=address["id"])).json()
+    assert client.delete(f"/address-history/{address['id']}").status_code == 204
+    assert client.get(f"/address-history/{address['id']}").status_code == 404
+    assert client.get(f"/order/{order['id']}").status_code == 404
+    kitchen = client.get("/order/kitchen").json()
+    assert all(entry["id"] != order["id"] for orders in kitchen.values() for entry in orders)
+    assert client.delete(f"/address-history/{address['id']}").status_code == 404
@@ -0,0 +1,39 @@
+# Sales are priced at the time of the sale: editing a paid order never reprices the dishes
+# it already sold
+from backend.core.database import SessionLocal
+from backend.services.analytics import recorded_sale
+
+
+def sale_revenue(order_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        sale, dish_rows = recorded_sale(db, order_id)
+    finally:
+        db.close()
+    return {row["dish_id"]: row["revenue"] for row in dish_rows}
+
+
+def test_put_keeps_sale_prices(client, ids, order_payload):
+    response = client.post("/order/", json=order_payload(status="paid"))
+    assert response.status_code == 201, response.text
+    order_id = response.json()["id"]
+    sold = sale_revenue(order_id)
+    assert sold == {ids["dish"]: 18.0}
+
+    price = client.get(f"/dish/{ids['dish']}").json()["price"]
+    assert client.patch(f"/dish/{ids['dish']}", json={"price": price * 2}).status_code == 200
+    try:
+        assert client.put(f"/order/{order_id}", json={"note": "Table by the window"}).status_code == 200
+        assert sale_revenue(order_id) == sold
+        assert client.put(f"/order/{order_id}", json={"status": "completed"}).status_code == 200
+        assert sale_revenue(order_id) == sold
+
+        # A dish added later is priced from the current menu
+        dishes = client.get(f"/order/{order_id}/with-relations").json()["dishes"]
+        other = next(dish for dish in client.get("/dish/").json() if dish["id"] != ids["dish"])
+        response = client.put(f"/order/{order_id}", json={"dish_ids": [dish["id"] for dish in dishes] + [other["id"]]})
+        assert response.status_code == 200, response.text
+        assert sale_revenue(order_id)[ids["dish"]] == sold[ids["dish"]]
+        assert other["id"] in sale_revenue(order_id)
+    finally:
+        client.patch(f"/dish/{ids['dish']}", json={"price": price})
@@ -0,0 +1,43 @@
+# Full-text search over people and dishes; every word of the query matches as a prefix
+
+
+def search(client, q: str, **params) -> dict:
+    response = client.get("/search/", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_prefix_words(client, ids):
+    people = search(client, "jan kow")["people"]
+    assert [(person["id"], person["client_id"]) for person in people] == [(ids["person"], ids["client"])]
+
+
+def test_diacritics_ignored(client):
+    assert "Żurek" in [dish["name"] for dish in search(client, "zurek", scope="dishes")["dishes"]]
+
+
+def test_scopes(client):
+    assert len(search(client, "nowak", scope="people")["people"]) >= 2
+    assert search(client, "nowak", scope="clients")["people"] == []
+    assert search(client, "nowak", scope="dishes")["people"] == []
+
+
+# The index follows inserts, updates and deletes of the rows
+def test_index_follows_writes(client):
+    response = client.post(
+        "/person/", json={"name": "Grzegorz", "surname": "Brzęczyszczykiewicz", "email": "g@example.com", "phone_number": "2"},
+    )
+    assert response.status_code == 201, response.text
+    person = f"/person/{response.json()['id']}"
+    assert len(search(client, "brzeczy")["people"]) == 1
+    assert client.patch(person, json={"surname": "Chrząszcz"}).status_code == 200
+    assert search(client, "brzeczy")["people"] == []
+    assert len(search(client, "chrzaszcz")["people"]) == 1
+    assert client.delete(person).status_code == 204
+    assert search(client, "chrzaszcz")["people"] == []
+
+
+# FTS5 syntax typed by the user is matched as text, not run as a query
+def test_query_syntax_is_text(client):
+    assert search(client, 'jan" OR name:*')["people"] == []
+    assert client.get("/search/", params={"q": "j"}).status_code == 422
@@ -0,0 +1,69 @@
+import pytest
+from backend.core.database import SessionLocal
+from backend.services.stock import rebuild_stock_levels
+
+# On-hand balances follow the ledger: adjustments, completed deliveries and placed orders
+
+
+def on_hand(client, ingredient_id: int) -> int:
+    levels = client.get("/stock/", params={"limit": 1000}).json()
+    return next(level["on_hand"] for level in levels if level["ingredient_id"] == ingredient_id)
+
+
+@pytest.fixture
+def ingredient(client):
+    response = client.post("/ingredient/", json={"name": "Koperek", "amount": 10, "metric": "grams"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_adjustment(client, ingredient):
+    assert on_hand(client, ingredient) == 0
+    response = client.post("/stock/adjustments", json={"ingredient_id": ingredient, "quantity": 50, "note": "count"})
+    assert response.status_code == 201, response.text
+    assert response.json()["on_hand"] == 50
+    movements = client.get(f"/stock/{ingredient}/movements").json()
+    assert [(movement["quantity"], movement["kind"]) for movement in movements] == [(50, "adjustment")]
+    assert client.post("/stock/adjustments", json={"ingredient_id": 999999, "quantity": 1}).status_code == 404
+
+
+def test_delivery_status_moves_stock(client, ids, ingredient):
+    response = client.post("/delivery/", json={
+        "delivery_status": "completed", "delivery_date": "2026-10-18", "deliver_id": ids["deliver"],
+        "ingredient_ids": [ingredient], "ingredient_quantities": {str(ingredient): 30},
+    })
+    assert response.status_code == 201, response.text
+    assert on_hand(client, ingredient) == 30
+    delivery = f"/delivery/{response.json()['id']}"
+    assert client.patch(delivery, json={"delivery_status": "pending"}).status_code == 200
+    assert on_hand(client, ingredient) == 0
+    assert client.patch(delivery, json={"delivery_status": "completed"}).status_code == 200
+    assert on_hand(client, ingredient) == 30
+
+
+def test_order_consumes_portions(client, ids, ingredient, order_payload):
+    response = client.post("/dish/", json={
+        "name": "Mizeria", "price": 9, "ingredient_ids": [ids["ingredient"], ingredient],
+        "ingredient_quantities": {str(ingredient): 4},
+    })
+    assert response.status_code == 201, response.text
+    dish = response.json()["id"]
+    response = client.post("/order/", json=order_payload(dish_ids=[dish]))
+    assert response.status_code == 201, response.text
+    assert on_hand(client, ingredient) == -4
+    assert client.put(f"/order/{response.json()['id']}", json={"dish_ids": [ids["dish"]]}).status_code == 200
+    assert on_hand(client, ingredient) == 0
+
+
+# The balances kept up to date by the postings equal the ones recomputed from the ledger
+def test_rebuild_matches_balances(client, ingredient):
+    client.post("/stock/adjustments", json={"ingredient_id": ingredient, "quantity": 7})
+    before = {level["ingredient_id"]: level["on_hand"] for level in client.get("/stock/", params={"limit": 1000}).json()}
+    db = SessionLocal()
+    try:
+        rebuild_stock_levels(db)
+        db.commit()
+    finally:
+        db.close()
+    after = {level["ingredient_id"]: level["on_hand"] for level in client.get("/stock/", params={"limit": 1000}).json()}
+    assert after == before
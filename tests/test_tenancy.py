@@ -0,0 +1,26 @@
+import asyncio
+from backend.core.metrics import MetricsMiddleware, MetricsRegistry
+from backend.core.tenancy import LocationMiddleware
+
+
+# Stands in for the router: records the matched route in the scope, as FastAPI does
+async def routed_app(scope, receive, send):
+    scope["route"] = type("Route", (), {"path": "/order/{order_id}"})()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def test_metrics_see_route_of_location_requests():
+    registry = MetricsRegistry()
+    app = MetricsMiddleware(LocationMiddleware(routed_app, locations=["krakow"]), metrics=registry)
+    scope = {"type": "http", "method": "GET", "path": "/locations/krakow/order/1", "root_path": "", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    asyncio.run(app(scope, receive, send))
+    assert scope["root_path"] == "/locations/krakow"
+    assert 'route="/order/{order_id}"' in registry.render()
@@ -0,0 +1,16 @@
+# Business rules checked at flush time answer 400 with the rule's message (database
+# constraint violations stay 409, see test_order_numbers)
+
+
+def test_order_without_dishes(client, order_payload):
+    response = client.post("/order/", json=order_payload(dish_ids=[]))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "An order must include at least one dish."
+
+
+def test_person_with_second_role(client, ids):
+    employee = client.get(f"/restaurant_employee/{ids['restaurant_employee']}").json()
+    response = client.post("/clients/", json={"person_id": employee["person_id"], "registration_date": "2026-10-18T12:00:00"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("A person can only be associated with one role")
+